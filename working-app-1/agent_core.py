@@ -1,29 +1,34 @@
+import json
 import uuid
 import re
 
+from template_engine import load_template
+
 
 class Planner:
     def __init__(self, llm_client, prompt_template_path: str):
         self.llm_client = llm_client
         self.prompt_template_path = prompt_template_path
 
-    def read_prompt_template(self) -> str:
-        """Read and return the prompt template"""
+    def read_prompt_template(self):
+        """Return the compiled prompt template (cached until the file changes)"""
         try:
-            with open(self.prompt_template_path, "r") as f:
-                return f.read()
+            return load_template(self.prompt_template_path)
         except FileNotFoundError:
-            return "No valid prompt template found."
+            return None
 
     def _sanitize_step(self, step: str) -> str:
         """Make step safe for use as node ID (LangGraph restriction)"""
         safe = re.sub(r"[^a-zA-Z0-9_]+", "_", step.strip())
         return safe[:50]  # limit node ID length
 
-    def plan(self, goal: str):
+    def plan(self, goal: str, context: dict = None):
         """Generate plan steps using LLM"""
         prompt_template = self.read_prompt_template()
-        prompt = prompt_template.replace("{goal}", goal)
+        if prompt_template is None:
+            prompt = "No valid prompt template found."
+        else:
+            prompt = prompt_template.render(goal=goal, context=json.dumps(context or {}))
         response = self.llm_client.generate(prompt)
 
         # Split into lines, clean up formatting, and sanitize
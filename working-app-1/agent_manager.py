@@ -1,11 +1,11 @@
 import yaml
-from llm_client import LLMClient
+from llm_client import get_llm_client
 from agent_core import Agent
 
 class AgentManager:
     def __init__(self):
         self.agents = {}
-        self.llm_client = LLMClient(model="phi4-mini")
+        self.llm_client = get_llm_client(model="phi4-mini")
 
     def load_agents(self, yaml_files):
         for file in yaml_files:
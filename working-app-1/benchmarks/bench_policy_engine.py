@@ -0,0 +1,75 @@
+"""
+Pre-screen a bulk payment file: per-row PolicyEngine.violations versus one
+evaluate_batch call over the same rows, given as row dicts and as columns
+(the shape a parsed CSV/Parquet payment file is already in), and versus
+violation_masks on typed columns. evaluate_batch is about as fast as the
+per-row loop; only the masks are substantially faster.
+
+    python -m benchmarks.bench_policy_engine --rows 100000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from policy_engine import PolicyEngine
+
+POLICY_FILE = "orchestrator/policies/policies.json"
+
+
+def make_rows(n):
+    rng = random.Random(7)
+    return [
+        {
+            "amount": round(rng.uniform(1, 2000), 2),
+            "currency": rng.choice(["GBP", "GBP", "EUR", "USD", "JPY"]),
+            "approved": rng.random() < 0.9,
+        }
+        for _ in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    engine = PolicyEngine([POLICY_FILE])
+    rows = make_rows(args.rows)
+
+    start = time.perf_counter()
+    per_row = [engine.violations("make_payment", r) for r in rows]
+    row_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    batch = engine.evaluate_batch("make_payment", rows)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    columns = {key: [r[key] for r in rows] for key in rows[0]}
+    start = time.perf_counter()
+    columnar = engine.evaluate_batch("make_payment", columns)
+    columnar_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    engine.evaluate_batch("make_payment", columns, messages=False)
+    codes_ms = (time.perf_counter() - start) * 1000
+
+    arrays = {key: np.asarray(values) for key, values in columns.items()}
+    start = time.perf_counter()
+    masks = engine.violation_masks("make_payment", arrays)
+    flagged_rows = np.logical_or.reduce(list(masks.values()))
+    masks_ms = (time.perf_counter() - start) * 1000
+
+    assert batch == per_row == columnar
+    assert int(flagged_rows.sum()) == sum(1 for v in batch if v)
+    flagged = sum(1 for v in batch if v)
+    print(f"rows: {args.rows}  flagged: {flagged}")
+    for label, ms in (("per row", row_ms), ("batch (row dicts)", batch_ms),
+                      ("batch (columns)", columnar_ms), ("batch (columns, codes)", codes_ms),
+                      ("masks (numpy columns)", masks_ms)):
+        print(f"{label:>23}: {ms:8.1f} ms  ({args.rows / ms * 1000:10.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
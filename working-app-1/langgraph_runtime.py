@@ -1,46 +1,96 @@
 # langgraph_runtime.py
+from collections import OrderedDict
+
 from langgraph.graph import StateGraph, START, END
 from agent_core import ExecutionNode
 
 
+def make_node_fn(index):
+    """Node body depends only on the step position; the step itself comes from state."""
+    def node_fn(state):
+        step = state["steps"][index]
+        executor = ExecutionNode(step["action"])
+        result = executor.execute()
+        state[step["id"]] = result  # merge into shared state under the plan's step id
+        return state
+    return node_fn
+
+
+class PlanGraph:
+    """A cached compiled graph bound to the steps of one plan."""
+
+    def __init__(self, compiled_graph, steps):
+        self.compiled_graph = compiled_graph
+        self.steps = steps
+
+    def invoke(self, state, config=None):
+        return self.compiled_graph.invoke({**state, "steps": self.steps}, config=config)
+
+
 class LangGraphRuntime:
-    def __init__(self):
-        # The state will be a dictionary shared across nodes
-        self.graph = StateGraph(dict)
+    def __init__(self, max_cached_graphs: int = 64):
+        # Compiled graphs keyed by plan structure, least recently used first
+        self.graph_cache = OrderedDict()
+        self.max_cached_graphs = max_cached_graphs
+        self.hits = 0
+        self.misses = 0
 
-    def build_from_plan(self, plan):
+    @staticmethod
+    def plan_signature(plan):
         """
-        Dynamically builds a LangGraph execution flow from plan steps.
-        Each step is a node that runs its associated tool or action.
+        Structural key for a plan: positional node ids and the edges between
+        them. Step wording is left out so reworded plans of the same shape
+        share a graph.
         """
-        prev_node = None
+        node_ids = tuple(f"step_{i}" for i in range(len(plan.get("steps", []))))
+        edges = tuple(zip(node_ids, node_ids[1:]))
+        return node_ids, edges
+
+    def compile_graph(self, node_ids, edges):
+        # A fresh StateGraph per shape, so nodes never accumulate across plans
+        graph = StateGraph(dict)
 
-        for step in plan.get("steps", []):
-            node_id = step["id"]
-            action_text = step["action"]
+        for index, node_id in enumerate(node_ids):
+            graph.add_node(node_id, make_node_fn(index))
 
-            def make_node_fn(action=action_text, node=node_id):
-                def node_fn(state):
-                    executor = ExecutionNode(action)
-                    result = executor.execute()
-                    state[node] = result  # merge into shared state
-                    return state
-                return node_fn
+        if node_ids:
+            graph.add_edge(START, node_ids[0])
+            for source, target in edges:
+                graph.add_edge(source, target)
+            graph.add_edge(node_ids[-1], END)
 
-            self.graph.add_node(node_id, make_node_fn())
+        return graph.compile()
 
-            if prev_node is None:
-                self.graph.add_edge(START, node_id)
-            else:
-                self.graph.add_edge(prev_node, node_id)
+    def build_from_plan(self, plan):
+        """
+        Returns a runnable LangGraph execution flow for the plan steps.
+        Plans with the same shape reuse one compiled graph; each step's
+        action is passed in through state at run time.
+        """
+        signature = self.plan_signature(plan)
 
-            prev_node = node_id
+        compiled = self.graph_cache.get(signature)
+        if compiled is not None:
+            self.hits += 1
+            self.graph_cache.move_to_end(signature)
+        else:
+            self.misses += 1
+            compiled = self.compile_graph(*signature)
+            self.graph_cache[signature] = compiled
+            if len(self.graph_cache) > self.max_cached_graphs:
+                self.graph_cache.popitem(last=False)
 
-        if prev_node is not None:
-            self.graph.add_edge(prev_node, END)
+        steps = [{"id": step["id"], "action": step["action"]} for step in plan.get("steps", [])]
+        return PlanGraph(compiled, steps)
 
-        # ✅ Return the compiled graph runner (NOT a dict)
-        return self.graph.compile()
+    def cache_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "cached_graphs": len(self.graph_cache),
+        }
 
     
     def run(self, compiled_graph, initial_state=None):
@@ -1,9 +1,10 @@
 from langchain_community.llms import Ollama
 
 class LLMClient:
-    def __init__(self, model: str = "phi4-mini"):
+    def __init__(self, model: str = "phi4-mini", **params):
         """Initialize Ollama model client"""
-        self.llm = Ollama(model=model)
+        self.model = model
+        self.llm = Ollama(model=model, **params)
 
     def generate(self, prompt: str) -> str:
         """Generate text using Ollama"""
@@ -13,3 +14,14 @@ class LLMClient:
         except Exception as e:
             print(f"[LLM ERROR]: {e}")
             return "LLM call failed."
+
+
+# Shared clients, one per (model, params), reused by every AgentManager
+_CLIENTS = {}
+
+
+def get_llm_client(model: str = "phi4-mini", **params) -> LLMClient:
+    key = (model, tuple(sorted(params.items())))
+    if key not in _CLIENTS:
+        _CLIENTS[key] = LLMClient(model=model, **params)
+    return _CLIENTS[key]
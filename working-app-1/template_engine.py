@@ -0,0 +1,68 @@
+import os
+import re
+import threading
+
+# {{var}} (prompt files) and {var} (planner templates). Anything else that
+# uses braces, such as JSON examples inside a prompt, is left as literal text.
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_]\w*)\s*\}\}|\{([A-Za-z_]\w*)\}")
+
+
+class PromptTemplateError(Exception):
+    pass
+
+
+class CompiledTemplate:
+    """A template parsed once into alternating literal/placeholder segments."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.literals = []
+        self.names = []
+
+        pos = 0
+        for match in PLACEHOLDER.finditer(source):
+            self.literals.append(source[pos:match.start()])
+            self.names.append(match.group(1) or match.group(2))
+            pos = match.end()
+        self.literals.append(source[pos:])
+
+        self.variables = frozenset(self.names)
+
+    def render(self, variables: dict = None, **kwargs) -> str:
+        values = {**(variables or {}), **kwargs}
+
+        missing = self.variables.difference(values)
+        if missing:
+            raise PromptTemplateError(f"Missing template variables: {', '.join(sorted(missing))}")
+
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            parts.append(str(values[name]))
+            parts.append(literal)
+        return "".join(parts)
+
+
+# path -> (mtime_ns, size, CompiledTemplate)
+_CACHE = {}
+_LOCK = threading.Lock()
+
+
+def load_template(path) -> CompiledTemplate:
+    """Return the compiled template for `path`, re-parsing only when the file changes."""
+    path = os.fspath(path)
+    stat = os.stat(path)
+
+    cached = _CACHE.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    with open(path, "r") as f:
+        template = CompiledTemplate(f.read())
+
+    with _LOCK:
+        _CACHE[path] = (stat.st_mtime_ns, stat.st_size, template)
+    return template
+
+
+def render_template(path, variables: dict = None, **kwargs) -> str:
+    return load_template(path).render(variables, **kwargs)
@@ -0,0 +1,60 @@
+# tests/test_langgraph_runtime.py
+import pytest
+
+pytest.importorskip("langgraph")
+
+import langgraph_runtime
+from langgraph_runtime import LangGraphRuntime
+
+
+def plan(*actions):
+    return {"steps": [{"id": action.replace(" ", "_"), "action": action} for action in actions]}
+
+
+def test_reworded_plans_of_the_same_shape_share_one_graph():
+    runtime = LangGraphRuntime()
+
+    first = runtime.build_from_plan(plan("Verify payee", "Send payment"))
+    second = runtime.build_from_plan(plan("Check balance", "Confirm transfer"))
+    runtime.build_from_plan(plan("Check balance", "Confirm transfer", "Notify user"))
+
+    assert first.compiled_graph is second.compiled_graph
+    stats = runtime.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["cached_graphs"]) == (1, 2, 2)
+
+    result = runtime.run(second, {"goal": "Make a payment"})
+    assert result["Check_balance"] == "✅ Completed: Check balance"
+    assert result["Confirm_transfer"] == "✅ Completed: Confirm transfer"
+    assert "Verify_payee" not in result
+
+
+def test_repeated_step_text_runs_every_step_in_order(monkeypatch):
+    executed = []
+
+    class RecordingNode:
+        def __init__(self, action):
+            self.action = action
+
+        def execute(self):
+            executed.append(self.action)
+            return f"✅ Completed: {self.action}"
+
+    monkeypatch.setattr(langgraph_runtime, "ExecutionNode", RecordingNode)
+    runtime = LangGraphRuntime()
+
+    first = runtime.build_from_plan(plan("Retry", "Retry", "Done"))
+    result = runtime.run(first)
+    assert executed == ["Retry", "Retry", "Done"]
+    assert result["Retry"] == "✅ Completed: Retry"
+    assert result["Done"] == "✅ Completed: Done"
+
+    # Same shape, different (and again repeated) wording: the compiled graph is reused
+    executed.clear()
+    second = runtime.build_from_plan(plan("Send", "Check", "Check"))
+    assert second.compiled_graph is first.compiled_graph
+    assert (runtime.cache_stats()["hits"], runtime.cache_stats()["misses"]) == (1, 1)
+
+    result = runtime.run(second)
+    assert executed == ["Send", "Check", "Check"]
+    assert result["Send"] == "✅ Completed: Send"
+    assert "Retry" not in result
@@ -0,0 +1,40 @@
+# tests/test_policy_engine.py
+import pytest
+
+from policy_engine import PolicyEngine, PolicyViolation
+
+RULES = [
+    {"tool": "make_payment", "max_amount": 1000, "requires_approval": True, "allowed_currencies": ["GBP", "USD", "EUR"]},
+    {"tool": "make_payment", "max_without_2fa": 100},
+    {"tool": "get_statement", "max_months": 6},
+]
+
+
+def test_enforce_checks_only_the_rules_for_that_tool():
+    engine = PolicyEngine(rules=RULES)
+
+    engine.enforce("get_statement", {"account_id": "A-123", "months": 3})
+    engine.enforce("unknown_tool", {"amount": 10 ** 9})
+
+    with pytest.raises(PolicyViolation, match="exceeds policy max of 6"):
+        engine.enforce("get_statement", {"months": 12})
+    with pytest.raises(PolicyViolation, match="Approval required"):
+        engine.enforce("make_payment", {"amount": 10, "currency": "GBP"})
+
+
+def test_batch_matches_per_row_evaluation():
+    engine = PolicyEngine(rules=RULES)
+    rows = [
+        {"amount": 50, "currency": "GBP", "approved": True},
+        {"amount": 1500, "currency": "JPY", "approved": True, "two_factor_verified": True},
+        {"amount": 500, "currency": "EUR"},
+        {"amount": 500, "currency": "EUR", "approved": True, "two_factor_verified": True},
+    ]
+
+    batch = engine.evaluate_batch("make_payment", rows)
+    assert batch == [engine.violations("make_payment", r) for r in rows]
+    assert batch[0] == [] and batch[3] == []
+    assert len(batch[1]) == 2 and len(batch[2]) == 2
+
+    columns = {key: [r.get(key) for r in rows] for key in ("amount", "currency", "approved", "two_factor_verified")}
+    assert engine.evaluate_batch("make_payment", columns) == batch
@@ -0,0 +1,232 @@
+"""
+Async scheduler for running many (agent_id, goal) jobs at once.
+
+Jobs run on a pool of `workers` slots. A job only starts while its agent
+and its model are both under their concurrency limits: Ollama serves each
+model with a fixed number of parallel requests, so sending it more only
+queues them inside the server. Lower priority numbers run first, and within
+a priority the agents take turns, so one agent with a long backlog cannot
+starve the others. An agent's jobs are queued per model, so a saturated
+model only holds back that agent's jobs for that model.
+"""
+import asyncio
+import itertools
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional
+
+
+@dataclass
+class Job:
+    agent_id: str
+    goal: Any
+    model: str = ""
+    priority: int = 0                      # lower runs first
+    id: int = 0
+    submitted_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    future: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    @property
+    def wait_s(self) -> Optional[float]:
+        return None if self.started_at is None else self.started_at - self.submitted_at
+
+
+def _percentiles_ms(values) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p95": None, "max": None}
+    ordered = sorted(values)
+    at = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+    return {"p50": at(0.5), "p95": at(0.95), "max": round(ordered[-1] * 1000, 2)}
+
+
+class AgentScheduler:
+    """
+    `run(job)` is the coroutine that does the work, e.g.
+    AgenticOrchestrator.arun_agent. Limits left as None are only bounded by
+    the pool size.
+    """
+    def __init__(
+        self,
+        run: Callable[[Job], Awaitable[Any]],
+        workers: int = 4,
+        agent_limits: Optional[Dict[str, int]] = None,
+        model_limits: Optional[Dict[str, int]] = None,
+        default_agent_limit: Optional[int] = None,
+        default_model_limit: Optional[int] = None,
+        history: int = 10000,
+    ):
+        self.run = run
+        self.workers = workers
+        self.agent_limits = dict(agent_limits or {})
+        self.model_limits = dict(model_limits or {})
+        self.default_agent_limit = default_agent_limit
+        self.default_model_limit = default_model_limit
+
+        # priority -> agent_id (in turn order) -> model -> that agent's queued jobs for the model
+        self._queues: Dict[int, "OrderedDict[str, Dict[str, Deque[Job]]]"] = {}
+        self._queued = 0
+        self._running: Dict[int, Job] = {}
+        self._running_by_agent: Dict[str, int] = {}
+        self._running_by_model: Dict[str, int] = {}
+        self._tasks = set()
+        self._ids = itertools.count(1)
+        self._idle: Optional[asyncio.Event] = None
+
+        self._waits: Deque[float] = deque(maxlen=history)
+        self._run_times: Deque[float] = deque(maxlen=history)
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "max_queue_depth": 0}
+        self._first_submit: Optional[float] = None
+        self._last_finish: Optional[float] = None
+
+    # -------------------------
+    # Submitting
+    # -------------------------
+    def submit(self, agent_id: str, goal: Any, model: str = "", priority: int = 0) -> Job:
+        """Queue a job; await `job.future` for its result. Must be called from the event loop."""
+        loop = asyncio.get_running_loop()
+        now = time.perf_counter()
+        job = Job(agent_id, goal, model, priority, next(self._ids), now, future=loop.create_future())
+
+        agents = self._queues.setdefault(priority, OrderedDict())
+        agents.setdefault(agent_id, {}).setdefault(model, deque()).append(job)
+        self._queued += 1
+
+        self.stats["submitted"] += 1
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self._queued)
+        if self._first_submit is None:
+            self._first_submit = now
+        self._idle_event().clear()
+
+        self._dispatch()
+        return job
+
+    async def run_all(self, jobs: Iterable[Dict[str, Any]]) -> List[Any]:
+        """Submit every job (submit() keyword arguments) and wait for all of them; failures come back as exceptions."""
+        submitted = [self.submit(**job) for job in jobs]
+        return await asyncio.gather(*(job.future for job in submitted), return_exceptions=True)
+
+    async def join(self):
+        """Wait until nothing is queued or running."""
+        await self._idle_event().wait()
+
+    def _idle_event(self) -> asyncio.Event:
+        # Created lazily so the scheduler can be built outside the event loop
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            if not self._queued and not self._running:
+                self._idle.set()
+        return self._idle
+
+    # -------------------------
+    # Dispatching
+    # -------------------------
+    def _agent_has_capacity(self, agent_id: str) -> bool:
+        agent_limit = self.agent_limits.get(agent_id, self.default_agent_limit)
+        return agent_limit is None or self._running_by_agent.get(agent_id, 0) < agent_limit
+
+    def _model_has_capacity(self, model: str) -> bool:
+        model_limit = self.model_limits.get(model, self.default_model_limit)
+        return model_limit is None or self._running_by_model.get(model, 0) < model_limit
+
+    def _pick(self) -> Optional[Job]:
+        """Next job to start: highest priority first, agents taking turns within a priority."""
+        for priority in sorted(self._queues):
+            agents = self._queues[priority]
+            for agent_id, models in agents.items():
+                if not self._agent_has_capacity(agent_id):
+                    continue
+                # The agent's oldest job among the models that still have room
+                ready = [queue for model, queue in models.items() if self._model_has_capacity(model)]
+                if not ready:
+                    continue
+                queue = min(ready, key=lambda q: q[0].id)
+                job = queue.popleft()
+                if not queue:
+                    del models[job.model]
+                if models:
+                    agents.move_to_end(agent_id)   # back of the line for its next job
+                else:
+                    del agents[agent_id]
+                if not agents:
+                    del self._queues[priority]
+                return job
+        return None
+
+    def _dispatch(self):
+        while len(self._running) < self.workers:
+            job = self._pick()
+            if job is None:
+                return
+            self._queued -= 1
+            job.started_at = time.perf_counter()
+            self._waits.append(job.wait_s)
+            self._running[job.id] = job
+            self._running_by_agent[job.agent_id] = self._running_by_agent.get(job.agent_id, 0) + 1
+            self._running_by_model[job.model] = self._running_by_model.get(job.model, 0) + 1
+
+            task = asyncio.ensure_future(self._execute(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, job: Job):
+        try:
+            result = await self.run(job)
+        except asyncio.CancelledError:
+            # Resolve the future before propagating, or whoever awaits it hangs
+            self.stats["cancelled"] += 1
+            job.future.cancel()
+            raise
+        except Exception as e:
+            self.stats["failed"] += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+        except BaseException as e:
+            self.stats["failed"] += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+            raise
+        else:
+            self.stats["completed"] += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            job.finished_at = self._last_finish = time.perf_counter()
+            self._run_times.append(job.finished_at - job.started_at)
+            del self._running[job.id]
+            self._running_by_agent[job.agent_id] -= 1
+            self._running_by_model[job.model] -= 1
+
+            self._dispatch()
+            if not self._queued and not self._running:
+                self._idle_event().set()
+
+    # -------------------------
+    # Metrics
+    # -------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        queued_by_agent: Dict[str, int] = {}
+        queued_by_priority: Dict[int, int] = {}
+        for priority, agents in sorted(self._queues.items()):
+            for agent_id, models in agents.items():
+                queued = sum(len(queue) for queue in models.values())
+                queued_by_agent[agent_id] = queued_by_agent.get(agent_id, 0) + queued
+                queued_by_priority[priority] = queued_by_priority.get(priority, 0) + queued
+
+        finished = self.stats["completed"] + self.stats["failed"] + self.stats["cancelled"]
+        elapsed = (self._last_finish - self._first_submit) if self._last_finish and self._first_submit else 0
+        return {
+            **self.stats,
+            "workers": self.workers,
+            "running": len(self._running),
+            "queue_depth": self._queued,
+            "queued_by_priority": queued_by_priority,
+            "queued_by_agent": queued_by_agent,
+            "running_by_agent": {a: n for a, n in self._running_by_agent.items() if n},
+            "running_by_model": {m: n for m, n in self._running_by_model.items() if n},
+            "wait_ms": _percentiles_ms(self._waits),
+            "run_ms": _percentiles_ms(self._run_times),
+            "jobs_per_s": round(finished / elapsed, 2) if elapsed else None,
+        }
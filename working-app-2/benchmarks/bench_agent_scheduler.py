@@ -0,0 +1,102 @@
+"""
+AgentScheduler throughput and queueing against a simulated Ollama server:
+each model answers --parallel requests at a time with --llm-ms latency
+(+-30%), and anything over that waits inside the server.
+
+Part 1 scales the worker pool; workers=1 is the old one-agent-at-a-time
+loop. Part 2 floods the queue with a bulk agent's jobs and shows that
+interactive agents (round-robin) and priority-0 jobs still start quickly.
+
+    python -m benchmarks.bench_agent_scheduler --jobs 200 --llm-ms 100 --parallel 8
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from agent_scheduler import AgentScheduler
+
+AGENTS = {
+    "payments-agent": "phi4-mini",
+    "statement-agent": "phi4-mini",
+    "balance-agent": "phi4-mini",
+    "fraud-agent": "llama3",
+    "support-agent": "llama3",
+}
+
+
+class SimulatedOllama:
+    def __init__(self, llm_ms, parallel, seed=7):
+        self.llm_ms = llm_ms
+        self.slots = {model: asyncio.Semaphore(parallel) for model in set(AGENTS.values())}
+        self.rng = random.Random(seed)
+
+    async def run(self, job):
+        async with self.slots[job.model]:
+            await asyncio.sleep(self.llm_ms * self.rng.uniform(0.7, 1.3) / 1000)
+        return {"agent": job.agent_id, "goal": job.goal}
+
+
+async def scaling(args, workers):
+    server = SimulatedOllama(args.llm_ms, args.parallel)
+    scheduler = AgentScheduler(
+        server.run,
+        workers=workers,
+        default_agent_limit=args.agent_limit,
+        default_model_limit=args.parallel,
+    )
+    agent_ids = list(AGENTS)
+    jobs = [{"agent_id": agent_ids[i % len(agent_ids)], "goal": f"goal {i}",
+             "model": AGENTS[agent_ids[i % len(agent_ids)]]} for i in range(args.jobs)]
+
+    started = time.perf_counter()
+    await scheduler.run_all(jobs)
+    elapsed = time.perf_counter() - started
+    stats = scheduler.snapshot()
+    print(f"{workers:>7} {args.jobs / elapsed:>8.1f} {elapsed:>7.2f} {stats['max_queue_depth']:>9}"
+          f" {stats['wait_ms']['p50']:>9.0f} {stats['wait_ms']['p95']:>9.0f}")
+
+
+async def fairness(args):
+    server = SimulatedOllama(args.llm_ms, args.parallel)
+    scheduler = AgentScheduler(server.run, workers=args.parallel * 2,
+                               default_agent_limit=args.agent_limit, default_model_limit=args.parallel)
+
+    bulk = [scheduler.submit("statement-agent", f"backfill {i}", AGENTS["statement-agent"], priority=1)
+            for i in range(args.jobs)]
+    interactive = [scheduler.submit(agent_id, f"request {i}", model, priority=1)
+                   for i in range(5) for agent_id, model in AGENTS.items() if agent_id != "statement-agent"]
+    urgent = [scheduler.submit("payments-agent", f"urgent {i}", AGENTS["payments-agent"], priority=0)
+              for i in range(5)]
+    depth = scheduler.snapshot()["queue_depth"]
+    await scheduler.join()
+
+    mean_wait = lambda jobs: statistics.mean(job.wait_s for job in jobs) * 1000
+    print(f"queue depth after submitting: {depth}")
+    print(f"  bulk statement-agent ({len(bulk)} jobs)  mean wait {mean_wait(bulk):8.0f} ms")
+    print(f"  other agents ({len(interactive)} jobs)          mean wait {mean_wait(interactive):8.0f} ms")
+    print(f"  priority 0 ({len(urgent)} jobs)              mean wait {mean_wait(urgent):8.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--llm-ms", type=float, default=100)
+    parser.add_argument("--parallel", type=int, default=8, help="concurrent requests per model in the server")
+    parser.add_argument("--agent-limit", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    print(f"{args.jobs} jobs over {len(AGENTS)} agents / {len(set(AGENTS.values()))} models, "
+          f"{args.llm_ms:.0f} ms per call, {args.parallel} parallel per model, agent limit {args.agent_limit}\n")
+    print(f"{'workers':>7} {'jobs/s':>8} {'total s':>7} {'max queue':>9} {'wait p50':>9} {'wait p95':>9}")
+    for workers in args.workers:
+        asyncio.run(scaling(args, workers))
+
+    print()
+    asyncio.run(fairness(args))
+
+
+if __name__ == "__main__":
+    main()
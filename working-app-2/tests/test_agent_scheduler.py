@@ -0,0 +1,110 @@
+# tests/test_agent_scheduler.py
+import asyncio
+
+from agent_scheduler import AgentScheduler
+
+
+class Recorder:
+    """run() for the scheduler: records start order and peak concurrency per agent / model."""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.started = []
+        self.running = {}
+        self.peak = {}
+
+    async def run(self, job):
+        self.started.append(job.goal)
+        for key in (job.agent_id, job.model):
+            self.running[key] = self.running.get(key, 0) + 1
+            self.peak[key] = max(self.peak.get(key, 0), self.running[key])
+        await asyncio.sleep(self.delay)
+        for key in (job.agent_id, job.model):
+            self.running[key] -= 1
+        return job.goal
+
+
+def test_agent_and_model_limits_are_never_exceeded():
+    recorder = Recorder()
+
+    async def main():
+        scheduler = AgentScheduler(recorder.run, workers=10, agent_limits={"a": 2}, model_limits={"llama3": 3})
+        jobs = [{"agent_id": agent, "goal": f"{agent}{i}", "model": "llama3" if agent != "c" else "phi4"}
+                for i in range(6) for agent in ("a", "b", "c")]
+        return await scheduler.run_all(jobs), scheduler.snapshot()
+
+    results, stats = asyncio.run(main())
+    assert len(results) == 18 and stats["completed"] == 18
+    assert recorder.peak["a"] == 2
+    assert recorder.peak["llama3"] == 3
+    assert recorder.peak["phi4"] == 6
+
+
+def test_lower_priority_numbers_start_first():
+    recorder = Recorder()
+
+    async def main():
+        scheduler = AgentScheduler(recorder.run, workers=1)
+        # Fills the only worker, so everything below is queued before dispatch
+        first = scheduler.submit("a", "blocker")
+        jobs = [scheduler.submit("a", f"p{priority}-{i}", priority=priority)
+                for i in range(2) for priority in (2, 0, 1)]
+        await asyncio.gather(first.future, *(job.future for job in jobs))
+
+    asyncio.run(main())
+    assert recorder.started == ["blocker", "p0-0", "p0-1", "p1-0", "p1-1", "p2-0", "p2-1"]
+
+
+def test_agents_take_turns_within_a_priority():
+    recorder = Recorder()
+
+    async def main():
+        scheduler = AgentScheduler(recorder.run, workers=1)
+        first = scheduler.submit("bulk", "blocker")
+        bulk = [scheduler.submit("bulk", f"bulk{i}") for i in range(4)]
+        other = [scheduler.submit("other", f"other{i}") for i in range(2)]
+        await asyncio.gather(first.future, *(job.future for job in bulk + other))
+
+    asyncio.run(main())
+    assert recorder.started == ["blocker", "bulk0", "other0", "bulk1", "other1", "bulk2", "bulk3"]
+
+
+def test_saturated_model_does_not_hold_back_the_agents_other_models():
+    recorder = Recorder(delay=0.05)
+
+    async def main():
+        scheduler = AgentScheduler(recorder.run, workers=4, model_limits={"slow": 1})
+        jobs = [scheduler.submit("a", "slow0", "slow"), scheduler.submit("a", "slow1", "slow"),
+                scheduler.submit("a", "fast0", "fast")]
+        await asyncio.sleep(0.01)
+        started = list(recorder.started)
+        await asyncio.gather(*(job.future for job in jobs))
+        return started
+
+    assert asyncio.run(main()) == ["slow0", "fast0"]
+
+
+def test_cancelled_job_resolves_its_future_and_run_all_returns():
+    async def run(job):
+        if job.goal == "cancel":
+            raise asyncio.CancelledError()
+        if job.goal == "interrupt":
+            await asyncio.sleep(10)
+        return job.goal
+
+    async def main():
+        scheduler = AgentScheduler(run, workers=4)
+        pending = asyncio.ensure_future(scheduler.run_all(
+            [{"agent_id": "a", "goal": goal} for goal in ("ok", "cancel", "interrupt")]
+        ))
+        await asyncio.sleep(0.01)
+        for task in list(scheduler._tasks):
+            task.cancel()
+        results = await asyncio.wait_for(pending, 1)
+        await scheduler.join()
+        return results, scheduler.snapshot()
+
+    results, stats = asyncio.run(main())
+    assert results[0] == "ok"
+    assert all(isinstance(r, asyncio.CancelledError) for r in results[1:])
+    assert stats["cancelled"] == 2 and stats["running"] == 0
@@ -0,0 +1,134 @@
+# tests/test_execution_node.py
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("ollama")
+
+# The module's file name has a hyphen, so it is loaded by path
+_spec = importlib.util.spec_from_file_location("working_agent", Path(__file__).parents[1] / "working-agent.py")
+agent = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(agent)
+
+Plan, Step = agent.Plan, agent.Step
+
+
+class Tools:
+    """Async tools that record start/end events and peak concurrency per action."""
+
+    def __init__(self, delay=0.02, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.events = []
+        self.running = {}
+        self.peak = {}
+
+    def tool(self, action):
+        async def run(name):
+            self.events.append(("start", name))
+            self.running[action] = self.running.get(action, 0) + 1
+            self.peak[action] = max(self.peak.get(action, 0), self.running[action])
+            await asyncio.sleep(self.delay)
+            self.running[action] -= 1
+            self.events.append(("end", name))
+            return {"status": "failed" if name in self.failing else "success", "name": name}
+        return run
+
+    def node(self, max_concurrency=8, limits=None):
+        node = agent.ExecutionNode(max_concurrency=max_concurrency)
+        for action in ("fetch", "pay"):
+            node.register_tool(action, self.tool(action), (limits or {}).get(action))
+        return node
+
+    def position(self, kind, name):
+        return self.events.index((kind, name))
+
+
+def step(id, depends_on=(), action="fetch"):
+    return Step(id=id, action=action, params={"name": id}, depends_on=list(depends_on))
+
+
+def test_parse_depends_on_defaults_to_a_chain():
+    assert agent.parse_depends_on([{"id": 1}, {"id": 2}, {"id": 3}]) == [[], ["1"], ["2"]]
+    assert agent.parse_depends_on([{"id": "a"}, {"id": "b", "depends_on": ["a"]}, {"id": "c", "depends_on": None}]) == [
+        [], ["a"], []]
+
+
+def test_steps_run_in_dependency_order_and_siblings_overlap():
+    tools = Tools()
+    plan = Plan("goal", [step("d", ["b", "c"]), step("b", ["a"]), step("c", ["a"]), step("a")])
+    failed = asyncio.run(tools.node().execute_plan(plan))
+
+    assert failed == []
+    assert all(s.status == "success" for s in plan.steps)
+    assert tools.position("end", "a") < tools.position("start", "b")
+    assert tools.position("end", "a") < tools.position("start", "c")
+    # b and c only need a, so they run side by side; d waits for both
+    assert tools.position("start", "c") < tools.position("end", "b")
+    assert tools.position("start", "d") > max(tools.position("end", "b"), tools.position("end", "c"))
+
+
+def test_per_tool_and_global_limits_cap_concurrency():
+    tools = Tools()
+    steps = [step(f"pay{i}", action="pay") for i in range(6)] + [step(f"fetch{i}") for i in range(6)]
+    asyncio.run(tools.node(max_concurrency=5, limits={"pay": 2}).execute_plan(Plan("goal", steps)))
+
+    assert tools.peak["pay"] == 2
+    assert tools.peak["pay"] + tools.peak["fetch"] <= 5
+    assert tools.peak["fetch"] == 3
+
+
+def test_dependents_of_a_failed_step_are_cancelled_and_the_rest_still_run():
+    tools = Tools(failing={"a"})
+    observed = []
+
+    async def on_step(s):
+        observed.append((s.id, s.status))
+
+    plan = Plan("goal", [step("a"), step("b", ["a"]), step("c", ["b"]), step("x"),
+                         step("y", ["missing"]), step("z", ["y"])])
+    failed = asyncio.run(tools.node().execute_plan(plan, on_step=on_step))
+
+    assert [s.id for s in failed] == ["y", "a"]
+    status = {s.id: s.status for s in plan.steps}
+    assert status == {"a": "failed", "b": "cancelled", "c": "cancelled", "x": "success",
+                      "y": "failed", "z": "cancelled"}
+    assert plan.steps[1].result == {"status": "cancelled", "reason": "dependency_failed:a"}
+    assert plan.steps[4].result["reason"] == "unknown_dependency:missing"
+    assert ("start", "b") not in tools.events and ("start", "y") not in tools.events
+    assert sorted(observed) == sorted(status.items())
+
+
+def test_a_dependency_cycle_fails_instead_of_hanging():
+    plan = Plan("goal", [step("a", ["b"]), step("b", ["a"])])
+    failed = asyncio.run(asyncio.wait_for(Tools().node().execute_plan(plan), 1))
+    assert {s.result["reason"] for s in failed} == {"dependency_cycle"}
+
+
+def test_apply_patch_keeps_completed_steps_and_renames_clashing_ids():
+    tools = Tools(failing={"pay"})
+    plan = Plan("goal", [step("fetch"), step("pay", ["fetch"], action="pay"), step("notify", ["pay"])])
+    asyncio.run(tools.node().execute_plan(plan))
+    fetched = plan.steps[0].result
+
+    patch = Plan("goal", [
+        step("fetch"),  # the model repeated a completed step
+        Step(id="fetch", action="fetch", params={"name": "fetch-again"}),
+        Step(id="pay", action="pay", params={"name": "pay-smaller"}, depends_on=["fetch"]),
+        step("notify", ["pay"]),
+    ], metadata={"llm_raw": "{...}"})
+    patched = plan.apply_patch(patch)
+
+    assert [(s.id, s.status) for s in patched.steps] == [
+        ("fetch", "success"), ("fetch-r1", "pending"), ("pay", "pending"), ("notify", "pending")]
+    assert patched.steps[0].result is fetched
+    # "fetch" in a patch step's depends_on now means the patch's own fetch
+    assert patched.steps[2].depends_on == ["fetch-r1"]
+    assert patched.metadata == {"replans": 1, "llm_raw": "{...}"}
+
+    tools.failing.clear()
+    tools.events.clear()
+    assert asyncio.run(tools.node().execute_plan(patched)) == []
+    assert [name for kind, name in tools.events if kind == "start"] == ["fetch-again", "pay-smaller", "notify"]
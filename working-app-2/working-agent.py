@@ -12,6 +12,8 @@ This demo uses the Ollama Python client for LLM calls.
 
 import asyncio
 import json
+import time
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Callable
 import re
@@ -59,6 +61,13 @@ def extract_json(raw_text: str) -> dict:
             return {"goal": "", "steps": []}
     else:
         return {"goal": "", "steps": []}
+
+def parse_depends_on(steps_raw: List[Dict[str, Any]]) -> List[List[str]]:
+    """depends_on for each raw step. Plans that never mention it keep the old one-after-another order."""
+    if any("depends_on" in s for s in steps_raw):
+        return [[str(d) for d in (s.get("depends_on") or [])] for s in steps_raw]
+    ids = [str(s.get("id", "")) for s in steps_raw]
+    return [[]] + [[prev] for prev in ids[:-1]]
 # -------------------------
 # Core Node & Agent Types
 # -------------------------
@@ -70,6 +79,7 @@ class Step:
     params: Dict[str, Any]
     status: str = "pending"
     result: Optional[Dict[str, Any]] = None
+    depends_on: List[str] = field(default_factory=list)   # ids of steps that must succeed first
 
 @dataclass
 class Plan:
@@ -77,16 +87,75 @@ class Plan:
     steps: List[Step] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    def completed(self) -> List[Step]:
+        return [s for s in self.steps if s.status == "success"]
+
+    def apply_patch(self, patch: "Plan") -> "Plan":
+        """
+        Keep the steps that already succeeded (with their results) and replace
+        everything else with the replanner's steps. Patch steps may depend on
+        completed steps; ids that clash with a completed step are renamed.
+        """
+        done = self.completed()
+        done_by_id = {s.id: s for s in done}
+        renamed = {}
+        steps = []
+        for step in patch.steps:
+            previous = done_by_id.get(step.id)
+            if previous and (previous.action, previous.params) == (step.action, step.params):
+                continue  # the model repeated a completed step; keep its result
+            steps.append(step)
+            if previous:
+                new_id = f"{step.id}-r{self.metadata.get('replans', 0) + 1}"
+                renamed[step.id] = new_id
+                step.id = new_id
+
+        for step in steps:
+            step.status, step.result = "pending", None
+            # A clashing id in depends_on means the patch's own step, not the completed one
+            step.depends_on = [renamed.get(d, d) for d in step.depends_on]
+
+        metadata = {**self.metadata, "replans": self.metadata.get("replans", 0) + 1, "llm_raw": patch.metadata.get("llm_raw")}
+        return Plan(goal=self.goal, steps=done + steps, metadata=metadata)
+
 
 class ExecutionNode:
-    """Executes steps by calling registered tool functions."""
-    def __init__(self):
+    """
+    Executes steps by calling registered tool functions.
+
+    `execute_plan` runs a plan as a DAG over `Step.depends_on`: every step
+    whose dependencies have succeeded starts immediately, bounded by
+    `max_concurrency` overall and by each tool's own limit.
+    """
+    def __init__(self, max_concurrency: int = 8):
         self.tools: Dict[str, Callable[..., Any]] = {}
-        self.register_tool("make_payment", mock_make_payment)
+        self.tool_limits: Dict[str, asyncio.Semaphore] = {}
+        self.concurrency = asyncio.Semaphore(max_concurrency)
+        self.register_tool("make_payment", mock_make_payment, max_concurrency=2)
         self.register_tool("get_statement", mock_get_statement)
 
-    def register_tool(self, name: str, fn: Callable[..., Any]):
+    def register_tool(self, name: str, fn: Callable[..., Any], max_concurrency: Optional[int] = None):
         self.tools[name] = fn
+        if max_concurrency:
+            self.tool_limits[name] = asyncio.Semaphore(max_concurrency)
+        else:
+            self.tool_limits.pop(name, None)
+
+    async def _call(self, name: str, tool: Callable[..., Any], params: Dict[str, Any]):
+        # Take the tool's slot before the global one, so a step queued behind
+        # a busy tool does not hold a global slot other tools could use.
+        limit = self.tool_limits.get(name)
+        if limit:
+            async with limit:
+                return await self._call_unlimited(tool, params)
+        return await self._call_unlimited(tool, params)
+
+    async def _call_unlimited(self, tool: Callable[..., Any], params: Dict[str, Any]):
+        async with self.concurrency:
+            if asyncio.iscoroutinefunction(tool):
+                return await tool(**params)
+            # Sync tools (blocking HTTP clients etc.) must not stall the event loop
+            return await asyncio.to_thread(tool, **params)
 
     async def execute_step(self, step: Step) -> Step:
         step.status = "running"
@@ -96,7 +165,7 @@ class ExecutionNode:
             step.result = {"status": "failed", "reason": f"unknown_tool:{step.action}"}
             return step
         try:
-            res = await tool(**step.params) if asyncio.iscoroutinefunction(tool) else tool(**step.params)
+            res = await self._call(step.action, tool, step.params)
             step.result = res
             step.status = "success" if res.get("status") == "success" else "failed"
         except Exception as e:
@@ -104,6 +173,97 @@ class ExecutionNode:
             step.result = {"status": "failed", "reason": str(e)}
         return step
 
+    async def execute_plan(self, plan: Plan, on_step: Optional[Callable[[Step], Any]] = None) -> List[Step]:
+        """
+        Run all steps of `plan`, in parallel where dependencies allow.
+        Dependents of a failed step are not run and end up "cancelled".
+        Returns the failed steps in the order they failed.
+        """
+        steps = plan.steps
+        skipped = sum(1 for s in steps if s.status == "success")
+        started = time.perf_counter()
+
+        # Steps are tracked by index: LLM plans do not always have unique ids
+        by_id: Dict[str, List[int]] = defaultdict(list)
+        for i, step in enumerate(steps):
+            by_id[step.id].append(i)
+
+        waiting: Dict[int, set] = {}
+        dependents: Dict[int, List[int]] = defaultdict(list)
+        failed: List[Step] = []
+        finished: List[Step] = []
+
+        def cancel_dependents(i: int):
+            stack = list(dependents[i])
+            while stack:
+                j = stack.pop()
+                if j in waiting:
+                    del waiting[j]
+                    steps[j].status = "cancelled"
+                    steps[j].result = {"status": "cancelled", "reason": f"dependency_failed:{steps[i].id}"}
+                    finished.append(steps[j])
+                    stack.extend(dependents[j])
+
+        for i, step in enumerate(steps):
+            # Steps kept from before a replan are already done
+            if step.status == "success":
+                continue
+            missing = [d for d in step.depends_on if d not in by_id]
+            deps = {j for d in step.depends_on for j in by_id.get(d, []) if j != i and steps[j].status != "success"}
+            waiting[i] = deps
+            for j in deps:
+                dependents[j].append(i)
+            if missing:
+                step.status = "failed"
+                step.result = {"status": "failed", "reason": f"unknown_dependency:{','.join(missing)}"}
+
+        for i, step in enumerate(steps):
+            if step.status == "failed" and i in waiting:
+                del waiting[i]
+                finished.append(step)
+                failed.append(step)
+                cancel_dependents(i)
+
+        running: Dict[asyncio.Task, int] = {}
+
+        def start_ready():
+            for i in [i for i, deps in waiting.items() if not deps]:
+                del waiting[i]
+                running[asyncio.create_task(self.execute_step(steps[i]))] = i
+
+        start_ready()
+        while running or finished:
+            for step in finished:
+                if on_step:
+                    await on_step(step)
+            finished.clear()
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                i = running.pop(task)
+                finished.append(steps[i])
+                if steps[i].status == "success":
+                    for j in dependents[i]:
+                        if j in waiting:
+                            waiting[j].discard(i)
+                else:
+                    failed.append(steps[i])
+                    cancel_dependents(i)
+            start_ready()
+
+        # Anything still waiting is part of a dependency cycle
+        for i in waiting:
+            steps[i].status = "failed"
+            steps[i].result = {"status": "failed", "reason": "dependency_cycle"}
+            failed.append(steps[i])
+            if on_step:
+                await on_step(steps[i])
+
+        print(f"[ExecutionNode] ran {len(steps) - skipped} steps in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return failed
+
 
 class MonitorNode:
     """Watches steps and emits events/metrics. Could push to observability pipeline."""
@@ -133,7 +293,8 @@ You are an agentic planner. Create a minimal step-by-step plan (as strict JSON)
 Goal: {goal}
 Context: {json.dumps(ctx)}
 Return ONLY JSON with top-level object containing "goal" and "steps" 
-(each step has id, action, params).
+(each step has id, action, params, and depends_on: the ids of steps it needs results from; [] if none).
+Steps with no dependency between them run in parallel.
 """
         # Call your LLM; for demo, you can mock this:
         if self.client:
@@ -172,11 +333,12 @@ Return ONLY JSON with top-level object containing "goal" and "steps"
             steps_raw = [{"id": "step-1", "action": "noop", "params": {}}]
 
         steps = []
-        for s in steps_raw:
+        for s, depends_on in zip(steps_raw, parse_depends_on(steps_raw)):
             steps.append(Step(
                 id=str(s.get("id", "step-1")),
                 action=s.get("action", "noop"),
-                params=s.get("params", {})
+                params=s.get("params", {}),
+                depends_on=depends_on
             ))
 
         return Plan(goal=payload.get("goal", goal), steps=steps, metadata={"llm_raw": raw})
@@ -192,12 +354,23 @@ class Replanner:
 
 
     async def replan(self, failed_step: Step, current_plan: Plan, context: Dict[str, Any] = None) -> Plan:
+        """
+        Returns a patch: replacement steps for the failed step and everything
+        after it. Completed steps and their results are passed in so the
+        model can build on them instead of redoing them.
+        """
         ctx = context or {}
+        completed = [{'id': s.id, 'action': s.action, 'params': s.params, 'result': s.result} for s in current_plan.completed()]
+        remaining = [{'id': s.id, 'action': s.action, 'params': s.params, 'depends_on': s.depends_on, 'status': s.status}
+                     for s in current_plan.steps if s.status != "success"]
         prompt = f"""
     You are a replanner. One step failed. Goal: {current_plan.goal}
+    Context: {json.dumps(ctx)}
+    Completed steps (already done, do NOT repeat them): {json.dumps(completed, default=str)}
     Failed step: {json.dumps({'id': failed_step.id, 'action': failed_step.action, 'params': failed_step.params, 'result': failed_step.result})}
-    Current plan steps: {json.dumps([{'id':s.id,'action':s.action,'params':s.params,'status':s.status} for s in current_plan.steps])}
-    Suggest a revised plan (JSON) to complete the goal. Return JSON with "goal" and "steps".
+    Remaining steps (not run yet): {json.dumps(remaining)}
+    Return JSON with "goal" and "steps": ONLY the steps that replace the failed and remaining steps
+    (each step has id, action, params, depends_on; depends_on may name completed steps). Return [] steps to give up.
     """
         response = self.client.generate(self.model, prompt)
         raw = response.text if hasattr(response, "text") else str(response)
@@ -221,9 +394,11 @@ class Replanner:
             else:
                 payload = {"goal": current_plan.goal, "steps": []}
 
+        steps_raw = payload.get("steps") or []
         steps = [
-            Step(id=s.get("id", f"step{idx}"), action=s.get("action", "noop"), params=s.get("params", {}))
-            for idx, s in enumerate(payload.get("steps", []))
+            Step(id=str(s.get("id", f"step{idx}")), action=s.get("action", "noop"), params=s.get("params", {}),
+                 depends_on=depends_on)
+            for idx, (s, depends_on) in enumerate(zip(steps_raw, parse_depends_on(steps_raw)))
         ]
         return Plan(goal=payload.get("goal", current_plan.goal), steps=steps, metadata={"llm_raw": raw})
 
@@ -241,34 +416,31 @@ class Agent:
     async def run_goal(self, goal: str, context: Dict[str, Any] = None, depth=0, max_replans=3) -> Plan:
         # 1. Make plan
         print(f"[{self.name}] creating plan for goal: {goal}")
-        if depth > max_replans:
-            print(f"[{self.name}] max replans reached for goal: {goal}")
-            return Plan(goal=goal, steps=[])
-        
         plan = await self.planner.create_plan(goal, context or {})
-        # 2. Execute steps sequentially, monitor, and call replanner if failure occurs
-        for step in plan.steps:
-            step = await self.exec_node.execute_step(step)
-            await self.monitor.observe(step)
-
-            if step.status != "success":
-                print(f"[{self.name}] step {step.id} failed. Asking replanner...")
-                plan = await self.replanner.replan(step, plan, context or {})
-                return await self.run_goal(plan.goal, context, depth + 1)
-        # for idx, step in enumerate(plan.steps):
-        #     print(f"[{self.name}] executing step {step.id} -> {step.action}")
-        #     step = await self.exec_node.execute_step(step)
-        #     await self.monitor.observe(step)
-
-        #     if step.status != "success":
-        #         # ask replanner for a new plan
-        #         print(f"[{self.name}] step {step.id} failed. Asking replanner...")
-        #         plan = await self.replanner.replan(step, plan, context or {})
-        #         # restart execution from the top of new plan
-        #         print(f"[{self.name}] replaced plan with {len(plan.steps)} steps from replanner")
-        #         # simple strategy: re-run newly created plan from start
-        #         return await self.run_goal(plan.goal, context)
-        # print(f"[{self.name}] plan completed successfully")
+
+        # 2. Execute steps as a dependency DAG, monitor, and patch the plan on failure.
+        # Completed steps keep their results and are not run again.
+        for replans in range(depth, max_replans + 1):
+            failed = await self.exec_node.execute_plan(plan, on_step=self.monitor.observe)
+            if not failed:
+                print(f"[{self.name}] plan completed successfully")
+                return plan
+
+            step = failed[0]
+            if replans == max_replans:
+                break
+
+            print(f"[{self.name}] step {step.id} failed. Asking replanner...")
+            patch = await self.replanner.replan(step, plan, context or {})
+            if not patch.steps:
+                print(f"[{self.name}] replanner gave up on goal: {goal}")
+                return plan
+
+            plan = plan.apply_patch(patch)
+            print(f"[{self.name}] resuming with {len(plan.steps) - len(plan.completed())} replanned steps "
+                  f"({len(plan.completed())} completed steps kept)")
+
+        print(f"[{self.name}] max replans reached for goal: {goal}")
         return plan
 
 
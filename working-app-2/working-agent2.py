@@ -1,9 +1,13 @@
+import asyncio
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional
 import ollama  # assuming ollama-py client
 import networkx as nx
 
+from agent_scheduler import AgentScheduler
+from template_engine import load_template
+
 # -----------------------------
 # Load agent definitions
 # -----------------------------
@@ -24,15 +28,24 @@ def load_all_agents(agent_dir: str) -> Dict[str, Dict[str, Any]]:
 class ExecutionNode:
     def __init__(self, agent):
         self.agent = agent
+        self.async_client = None
 
     def run(self, input_data):
         print(f"[ExecutionNode] Running agent {self.agent['name']} with input: {input_data}")
         # Here you would call the agent's LLM via Ollama
         # client = ollama()
-        prompt_file = Path(self.agent["prompt_template"]).read_text()
+        prompt_file = load_template(self.agent["prompt_template"]).source
         response = ollama.chat(model=self.agent["llm"], messages=[{"role": "user", "content": prompt_file}])
         return response
 
+    async def arun(self, input_data):
+        """run() without blocking the event loop, so many agents can wait on Ollama at once."""
+        print(f"[ExecutionNode] Running agent {self.agent['name']} with input: {input_data}")
+        if self.async_client is None:
+            self.async_client = ollama.AsyncClient()
+        prompt_file = load_template(self.agent["prompt_template"]).source
+        return await self.async_client.chat(model=self.agent["llm"], messages=[{"role": "user", "content": prompt_file}])
+
 class MonitorNode:
     def monitor(self, output):
         print(f"[MonitorNode] Monitoring output: {output}")
@@ -86,6 +99,45 @@ class AgenticOrchestrator:
                     replanned = replanner.replan(goal, "execution_failed")
                     print(f"[Orchestrator] Replanned steps: {replanned}")
 
+    async def arun_agent(self, agent_id, goal):
+        planner: PlannerNode = self.graph.nodes[f"{agent_id}_planner"]["obj"]
+        execution: ExecutionNode = self.graph.nodes[f"{agent_id}_execution"]["obj"]
+        monitor: MonitorNode = self.graph.nodes[f"{agent_id}_monitor"]["obj"]
+        replanner: ReplannerNode = self.graph.nodes[f"{agent_id}_replanner"]["obj"]
+
+        output = None
+        plan = planner.plan(goal)
+        for step in plan["steps"]:
+            if step == "execute_agent":
+                output = await execution.arun(goal)
+            elif step == "monitor_result":
+                success = monitor.monitor(output)
+                if not success:
+                    replanned = replanner.replan(goal, "execution_failed")
+                    print(f"[Orchestrator] Replanned steps: {replanned}")
+        return output
+
+    async def run_agents(
+        self,
+        jobs: Iterable[Dict[str, Any]],
+        workers: int = 4,
+        agent_limit: Optional[int] = 2,
+        model_limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Run many {"agent_id", "goal", optional "priority"} jobs concurrently
+        through an AgentScheduler. Returns (outputs in job order, scheduler metrics).
+        """
+        scheduler = AgentScheduler(
+            lambda job: self.arun_agent(job.agent_id, job.goal),
+            workers=workers,
+            default_agent_limit=agent_limit,
+            model_limits=model_limits,
+        )
+        jobs = [{**job, "model": self.agents[job["agent_id"]]["llm"]} for job in jobs]
+        results = await scheduler.run_all(jobs)
+        return results, scheduler.snapshot()
+
 # -----------------------------
 # Main
 # -----------------------------
@@ -94,13 +146,13 @@ if __name__ == "__main__":
     orchestrator = AgenticOrchestrator(agents)
     orchestrator.build_graph()
 
-    # Run multiple agents
-    goals = {
-        "payments-agent": "Make payment to John Doe 500 USD",
-        "statement-agent": "Get last 3 months statement"
-    }
-    for agent_id, goal in goals.items():
-        orchestrator.run_agent(agent_id, goal)
+    # Run multiple agents concurrently
+    jobs = [
+        {"agent_id": "payments-agent", "goal": "Make payment to John Doe 500 USD", "priority": 0},
+        {"agent_id": "statement-agent", "goal": "Get last 3 months statement", "priority": 1},
+    ]
+    results, metrics = asyncio.run(orchestrator.run_agents(jobs, model_limits={"phi4-mini": 2}))
+    print(f"[Orchestrator] Scheduler metrics: {metrics}")
 
 
 # Observations
@@ -0,0 +1,81 @@
+"""
+Session throughput as worker processes are added. Each worker plays the
+orchestrator's post_message traffic (read a session, append the user turn,
+append the reply) against the shared SQLite backend. `--work-ms` stands in
+for the tool call and decision made between the two appends.
+
+The work is a time.sleep, which uses no CPU, so with --work-ms > 0 the
+workers overlap even on a single core and messages/s grows with workers
+whatever the core count. That shows the backend does not serialise the
+workers; it is not a measure of CPU scaling. Run with --work-ms 0 to time
+the backend alone, and watch "db ms/message" for lock contention.
+
+    python -m benchmarks.bench_sessions --workers 1 2 4 8 --sessions 200 --turns 20 --work-ms 5
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from multiprocessing import Pool
+
+from orchestrator.sessions import SQLiteSessionBackend
+
+
+def worker(args):
+    path, session_ids, turns, work_ms = args
+    backend = SQLiteSessionBackend(path)
+    ops = 0
+    db_seconds = 0.0
+    for turn in range(turns):
+        for session_id in session_ids:
+            start = time.perf_counter()
+            backend.get(session_id)
+            backend.append(session_id, {"role": "user", "text": f"pay 10 GBP ({turn})"})
+            db_seconds += time.perf_counter() - start
+
+            time.sleep(work_ms / 1000)
+
+            start = time.perf_counter()
+            backend.append(session_id, {"role": "assistant", "text": "Payment result: success"})
+            db_seconds += time.perf_counter() - start
+            ops += 1
+    return ops, db_seconds
+
+
+def run(workers, sessions, turns, work_ms):
+    path = os.path.join(tempfile.mkdtemp(), "bench_sessions.sqlite3")
+    backend = SQLiteSessionBackend(path)
+    session_ids = [str(uuid.uuid4()) for _ in range(sessions)]
+    for session_id in session_ids:
+        backend.create(session_id, "payments-agent")
+
+    # Workers share sessions, so follow-ups land on different processes
+    jobs = [(path, session_ids[n::workers] + session_ids[:sessions // 10], turns, work_ms) for n in range(workers)]
+
+    start = time.perf_counter()
+    with Pool(workers) as pool:
+        results = pool.map(worker, jobs)
+    elapsed = time.perf_counter() - start
+
+    ops = sum(n for n, _ in results)
+    db_seconds = sum(seconds for _, seconds in results)
+    return ops / elapsed, db_seconds / ops * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--work-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPU(s), {args.work_ms:g} ms of sleep per message")
+    for workers in args.workers:
+        rate, db_ms = run(workers, args.sessions, args.turns, args.work_ms)
+        print(f"workers={workers:>2}: {rate:8.0f} messages/s  db ms/message {db_ms:6.2f}")
+
+
+if __name__ == "__main__":
+    main()
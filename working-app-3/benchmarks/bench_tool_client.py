@@ -0,0 +1,100 @@
+"""
+Latency and requests/s for create_payment calls against a local
+payments_service: a new httpx.Client per call on a thread pool (the old
+sync post_message path) versus the pooled async ToolClient.
+
+    python -m benchmarks.bench_tool_client --requests 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from orchestrator.tool_client import ToolClient
+
+PORT = 8765
+URL = f"http://127.0.0.1:{PORT}/create_payment"
+
+
+def payload():
+    return {
+        "amount": 10.0,
+        "currency": "GBP",
+        "recipient": {"name": "John", "account_number": "12345678", "sort_code": "12-34-56"},
+        "idempotency_key": str(uuid.uuid4()),
+    }
+
+
+def start_service():
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "tools.payments_service:app", "--port", str(PORT), "--log-level", "warning"]
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/docs")
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("payments_service did not start")
+
+
+def report(label, latencies, elapsed):
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:>16}: p50={statistics.median(latencies):6.2f} ms  p95={p95:6.2f} ms  {len(latencies) / elapsed:7.0f} req/s")
+
+
+def client_per_call(n, concurrency):
+    def call(_):
+        start = time.perf_counter()
+        with httpx.Client(timeout=10.0) as client:
+            client.post(URL, json=payload()).raise_for_status()
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(call, range(n)))
+    report("client per call", latencies, time.perf_counter() - start)
+
+
+async def pooled(n, concurrency):
+    tools = ToolClient({"create_payment": URL}, concurrency=concurrency, max_keepalive=concurrency)
+
+    latencies = []
+
+    async def worker(count):
+        for _ in range(count):
+            start = time.perf_counter()
+            await tools.call("create_payment", payload())
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await tools.call("create_payment", payload())  # open the pool
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(len(range(i, n, concurrency))) for i in range(concurrency)))
+    report("pooled async", latencies, time.perf_counter() - start)
+    await tools.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    proc = start_service()
+    try:
+        client_per_call(args.requests, args.concurrency)
+        asyncio.run(pooled(args.requests, args.concurrency))
+    finally:
+        proc.terminate()
+
+
+if __name__ == "__main__":
+    main()
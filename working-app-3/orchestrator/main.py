@@ -1,16 +1,21 @@
 # orchestrator/main.py
+import asyncio
 import uuid
 import json
 from typing import Dict, Any
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-import httpx
 import pathlib
 
+from orchestrator.sessions import get_session_backend
+from orchestrator.slot_extractor import extract_slots
+from orchestrator.template_engine import load_template
+from orchestrator.tool_client import get_tool_client
+
 app = FastAPI(title="Agentic Orchestrator (starter)")
 
-# Simple in-memory session store (for demo only)
-SESSIONS: Dict[str, Dict[str, Any]] = {}
+# Shared by every uvicorn worker on the host (see orchestrator/sessions.py)
+SESSIONS = get_session_backend()
 
 # Load policy
 POLICY_FILE = pathlib.Path(__file__).resolve().parents[1] / "policy" / "policies.json"
@@ -21,7 +26,7 @@ with open(POLICY_FILE) as f:
 AGENT_DEFS = {
     "payments-agent": {
         "id": "payments-agent",
-        "prompt_template": (pathlib.Path(__file__).resolve().parents[0] / "prompt_templates" / "payments_prompt.txt").read_text(),
+        "prompt_template": pathlib.Path(__file__).resolve().parents[0] / "prompt_templates" / "payments_prompt.txt",
         "tools": ["create_payment"]
     }
 }
@@ -31,6 +36,13 @@ TOOL_URLS = {
     "create_payment": "http://127.0.0.1:8001/create_payment"
 }
 
+# Per-tool overrides for the pooled client (concurrency, timeout, max_connections, max_keepalive)
+TOOL_LIMITS = {
+    "create_payment": {"concurrency": 32, "timeout": 10.0}
+}
+
+TOOL_CLIENT = get_tool_client(TOOL_URLS, TOOL_LIMITS)
+
 class StartSessionRequest(BaseModel):
     agent_id: str
 
@@ -42,24 +54,26 @@ def start_session(body: StartSessionRequest):
     if body.agent_id not in AGENT_DEFS:
         raise HTTPException(status_code=404, detail="Agent not found")
     session_id = str(uuid.uuid4())
-    SESSIONS[session_id] = {
-        "agent_id": body.agent_id,
-        "messages": []
-    }
+    SESSIONS.create(session_id, body.agent_id)
     return {"session_id": session_id, "agent_id": body.agent_id}
 
+@app.on_event("shutdown")
+async def close_tool_client():
+    await TOOL_CLIENT.aclose()
+
 @app.post("/sessions/{session_id}/message")
-def post_message(session_id: str, msg: MessageRequest):
-    if session_id not in SESSIONS:
+async def post_message(session_id: str, msg: MessageRequest):
+    # SQLite session calls block (busy timeout + retry with time.sleep); keep them off the event loop
+    session = await asyncio.to_thread(SESSIONS.get, session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    session = SESSIONS[session_id]
     text = msg.text
-    session["messages"].append({"role": "user", "text": text})
+    await asyncio.to_thread(SESSIONS.append, session_id, {"role": "user", "text": text})
 
     # build prompt (very simple)
     agent = AGENT_DEFS[session["agent_id"]]
-    prompt = agent["prompt_template"].replace("{{user_input}}", text)
+    prompt = load_template(agent["prompt_template"]).render(user_input=text)
 
     # call mock LLM to decide action
     decision = mock_llm_decide(prompt, text)
@@ -67,7 +81,7 @@ def post_message(session_id: str, msg: MessageRequest):
     # Decision has either type 'final' or 'tool'
     if decision["type"] == "final":
         ai_text = decision["text"]
-        session["messages"].append({"role": "assistant", "text": ai_text})
+        await asyncio.to_thread(SESSIONS.append, session_id, {"role": "assistant", "text": ai_text})
         return {"type": "final", "response": ai_text}
     elif decision["type"] == "tool":
         tool_name = decision["tool"]
@@ -79,25 +93,24 @@ def post_message(session_id: str, msg: MessageRequest):
             if not ok:
                 return {"type": "error", "reason": msg}
 
-        # call the tool (HTTP)
-        tool_url = TOOL_URLS.get(tool_name)
-        if not tool_url:
+        # call the tool (HTTP, pooled keep-alive connection)
+        if tool_name not in TOOL_URLS:
             raise HTTPException(status_code=500, detail="Tool not registered")
 
         try:
-            with httpx.Client(timeout=10.0) as client:
-                r = client.post(tool_url, json=tool_input)
-                r.raise_for_status()
-                tool_result = r.json()
+            tool_result = await TOOL_CLIENT.call(tool_name, tool_input)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Tool call failed: {e}")
 
         # append tool result to session and ask LLM to finalize
-        session["messages"].append({"role": "tool", "tool": tool_name, "result": tool_result})
-
         # For demo: after tool call, mock LLM returns a final answer summarizing result
         final_text = f"Payment result: {tool_result.get('status')}. Payment ID: {tool_result.get('payment_id')}"
-        session["messages"].append({"role": "assistant", "text": final_text})
+        await asyncio.to_thread(
+            SESSIONS.append,
+            session_id,
+            {"role": "tool", "tool": tool_name, "result": tool_result},
+            {"role": "assistant", "text": final_text},
+        )
         return {"type": "final", "response": final_text, "tool_result": tool_result}
     else:
         raise HTTPException(status_code=500, detail="Unknown decision type")
@@ -110,22 +123,17 @@ def mock_llm_decide(prompt: str, user_text: str) -> Dict[str, Any]:
     """
     lowercase = user_text.lower()
     if "pay " in lowercase or "payment" in lowercase or "transfer" in lowercase:
-        # Attempt to parse amount and account in a naive way (demo only)
-        # Very simple parsing: find first number as amount, find 8-digit account number and a sort code with pattern dd-dd-dd
-        import re
-        amount_match = re.search(r"(\d+(?:\.\d+)?)", user_text)
-        account_match = re.search(r"(\b\d{8}\b)", user_text)
-        sort_code_match = re.search(r"(\b\d{2}-\d{2}-\d{2}\b)", user_text)
-
-        amount = float(amount_match.group(1)) if amount_match else 0.0
-        recipient_account = account_match.group(1) if account_match else ""
-        sort_code = sort_code_match.group(1) if sort_code_match else ""
+        # Amount, currency, account, sort code and payee from one pass over the message
+        slots = extract_slots(user_text)
+        amount = float(slots.get("amount", 0.0))
+        recipient_account = slots.get("account", "")
+        sort_code = slots.get("sort_code", "")
 
         tool_input = {
             "amount": amount,
-            "currency": "GBP",
+            "currency": slots.get("currency", "GBP"),
             "recipient": {
-                "name": "Unknown Recipient",
+                "name": slots.get("beneficiary", "Unknown Recipient"),
                 "account_number": recipient_account,
                 "sort_code": sort_code
             },
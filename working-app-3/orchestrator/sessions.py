@@ -0,0 +1,164 @@
+# orchestrator/sessions.py
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+
+class SessionConflictError(Exception):
+    """Raised when a session keeps changing underneath an append."""
+
+
+def compact_messages(messages: List[Dict[str, Any]], max_messages: int) -> List[Dict[str, Any]]:
+    """
+    Keep the newest `max_messages` entries and fold everything older into a
+    single leading summary record, so a long conversation stays a fixed size.
+    """
+    if len(messages) <= max_messages:
+        return messages
+
+    summary = None
+    if messages and messages[0].get("role") == "summary":
+        summary, messages = messages[0], messages[1:]
+
+    cut = len(messages) - (max_messages - 1)
+    old, recent = messages[:cut], messages[cut:]
+
+    compacted = (summary or {}).get("compacted", 0) + len(old)
+    user_turns = [m["text"] for m in old if m.get("role") == "user" and m.get("text")]
+    tools = sorted({m["tool"] for m in old if m.get("role") == "tool"} | set((summary or {}).get("tools", [])))
+    text = " | ".join(filter(None, [(summary or {}).get("text"), *user_turns]))
+
+    return [{
+        "role": "summary",
+        "compacted": compacted,
+        "tools": tools,
+        # Older turns are only kept as a bounded digest
+        "text": text[-1000:],
+    }] + recent
+
+
+class SessionBackend(ABC):
+    """Session storage used by the orchestrator endpoints."""
+
+    @abstractmethod
+    def create(self, session_id: str, agent_id: str):
+        pass
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def append(self, session_id: str, *messages: Dict[str, Any]) -> int:
+        pass
+
+
+class MemorySessionBackend(SessionBackend):
+    """Process-local sessions. Only correct with a single uvicorn worker."""
+
+    def __init__(self, max_messages=50):
+        self.max_messages = max_messages
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, session_id, agent_id):
+        with self._lock:
+            self._sessions[session_id] = {"agent_id": agent_id, "messages": [], "version": 0}
+
+    def get(self, session_id):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return {**session, "messages": list(session["messages"])} if session else None
+
+    def append(self, session_id, *messages):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise KeyError(session_id)
+            session["messages"] = compact_messages(session["messages"] + list(messages), self.max_messages)
+            session["version"] += 1
+            return session["version"]
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    Sessions in a SQLite file (WAL mode) shared by every worker on the host.
+
+    Appends use optimistic concurrency: the row is read with its version and
+    written back only if the version is unchanged, retrying otherwise, so
+    two workers appending to the same session never lose a message.
+    """
+
+    def __init__(self, path, max_messages=50, max_retries=20):
+        self.path = path
+        self.max_messages = max_messages
+        self.max_retries = max_retries
+        self._local = threading.local()
+        self.conflicts = 0
+        self._connect()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " session_id TEXT PRIMARY KEY,"
+                " agent_id TEXT NOT NULL,"
+                " messages TEXT NOT NULL,"
+                " version INTEGER NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def create(self, session_id, agent_id):
+        self._connect().execute(
+            "INSERT INTO sessions (session_id, agent_id, messages, version, updated_at) VALUES (?, ?, '[]', 0, ?)",
+            (session_id, agent_id, time.time()),
+        )
+
+    def get(self, session_id):
+        row = self._connect().execute(
+            "SELECT agent_id, messages, version FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"agent_id": row[0], "messages": json.loads(row[1]), "version": row[2]}
+
+    def append(self, session_id, *messages):
+        conn = self._connect()
+        for attempt in range(self.max_retries):
+            session = self.get(session_id)
+            if session is None:
+                raise KeyError(session_id)
+
+            updated = compact_messages(session["messages"] + list(messages), self.max_messages)
+            cursor = conn.execute(
+                "UPDATE sessions SET messages = ?, version = version + 1, updated_at = ?"
+                " WHERE session_id = ? AND version = ?",
+                (json.dumps(updated, default=str), time.time(), session_id, session["version"]),
+            )
+            if cursor.rowcount == 1:
+                return session["version"] + 1
+
+            self.conflicts += 1
+            time.sleep(0.001 * (attempt + 1))
+
+        raise SessionConflictError(f"Session {session_id} changed {self.max_retries} times during append")
+
+
+def get_session_backend() -> SessionBackend:
+    max_messages = int(os.getenv("SESSION_MAX_MESSAGES", "50"))
+    if os.getenv("SESSION_BACKEND", "sqlite") == "memory":
+        return MemorySessionBackend(max_messages=max_messages)
+
+    path = os.getenv("SESSION_DB_PATH", os.path.join(tempfile.gettempdir(), "orchestrator_sessions.sqlite3"))
+    return SQLiteSessionBackend(path, max_messages=max_messages)
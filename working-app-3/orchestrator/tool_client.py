@@ -0,0 +1,147 @@
+# orchestrator/tool_client.py
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+class ToolBusyError(Exception):
+    """Raised when a tool's concurrency limit stays saturated past its timeout."""
+
+
+class ToolClient:
+    """
+    Long-lived async HTTP clients for the tools in TOOL_URLS.
+
+    Each tool gets its own keep-alive connection pool, so repeat calls reuse
+    a warm TCP (and TLS) connection, and its own semaphore and timeout, so
+    one slow tool cannot take every connection from the others.
+    """
+
+    def __init__(self, tool_urls: Dict[str, str], tool_limits: Optional[Dict[str, Dict[str, Any]]] = None,
+                 max_connections=100, max_keepalive=20, keepalive_expiry=30.0, http2=False,
+                 timeout=10.0, concurrency=32, transport=None):
+        self.tool_urls = tool_urls
+        self.tool_limits = tool_limits or {}
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.transport = transport
+
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop = None
+        self._closing = set()  # aclose() tasks for pools left behind by an old loop
+
+        self.calls = {name: 0 for name in tool_urls}
+        self.errors = {name: 0 for name in tool_urls}
+        self.in_flight = {name: 0 for name in tool_urls}
+
+    def _limit(self, tool_name, key, default):
+        return self.tool_limits.get(tool_name, {}).get(key, default)
+
+    def _client(self, tool_name) -> httpx.AsyncClient:
+        # Pools belong to the event loop that opened them; a new loop (e.g. a
+        # test client that starts one per request) gets fresh pools.
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._close_stale(list(self._clients.values()), self._loop)
+            self._clients.clear()
+            self._semaphores.clear()
+            self._loop = loop
+
+        client = self._clients.get(tool_name)
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=self._limit(tool_name, "max_connections", self.max_connections),
+                max_keepalive_connections=self._limit(tool_name, "max_keepalive", self.max_keepalive),
+                keepalive_expiry=self.keepalive_expiry,
+            )
+            timeout = self._limit(tool_name, "timeout", self.timeout)
+            try:
+                client = httpx.AsyncClient(limits=limits, timeout=timeout, http2=self.http2, transport=self.transport)
+            except ImportError:
+                print("[ToolClient] HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+                client = httpx.AsyncClient(limits=limits, timeout=timeout, transport=self.transport)
+
+            self._clients[tool_name] = client
+            self._semaphores[tool_name] = asyncio.Semaphore(self._limit(tool_name, "concurrency", self.concurrency))
+        return client
+
+    def _close_stale(self, clients, old_loop):
+        for client in clients:
+            if old_loop is not None and old_loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), old_loop)
+            else:
+                task = asyncio.ensure_future(self._aclose_quietly(client))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _aclose_quietly(client):
+        # Connections opened on a loop that has since closed cannot be shut
+        # down cleanly; dropping them is all that is left to do
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+
+    async def call(self, tool_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        url = self.tool_urls.get(tool_name)
+        if not url:
+            raise KeyError(tool_name)
+
+        client = self._client(tool_name)
+        semaphore = self._semaphores[tool_name]
+        timeout = self._limit(tool_name, "timeout", self.timeout)
+
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.errors[tool_name] = self.errors.get(tool_name, 0) + 1
+            raise ToolBusyError(f"{tool_name} is at its concurrency limit")
+
+        try:
+            self.calls[tool_name] = self.calls.get(tool_name, 0) + 1
+            self.in_flight[tool_name] = self.in_flight.get(tool_name, 0) + 1
+            r = await client.post(url, json=payload)
+            r.raise_for_status()
+            return r.json()
+        except Exception:
+            self.errors[tool_name] = self.errors.get(tool_name, 0) + 1
+            raise
+        finally:
+            self.in_flight[tool_name] -= 1
+            semaphore.release()
+
+    async def aclose(self):
+        clients, self._clients = list(self._clients.values()), {}
+        self._semaphores = {}
+        for client in clients:
+            await client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "calls": self.calls.get(name, 0),
+                "errors": self.errors.get(name, 0),
+                "in_flight": self.in_flight.get(name, 0),
+            }
+            for name in self.tool_urls
+        }
+
+
+def get_tool_client(tool_urls, tool_limits=None) -> ToolClient:
+    return ToolClient(
+        tool_urls,
+        tool_limits,
+        max_connections=int(os.getenv("TOOL_MAX_CONNECTIONS", "100")),
+        max_keepalive=int(os.getenv("TOOL_MAX_KEEPALIVE", "20")),
+        http2=os.getenv("TOOL_HTTP2", "false").lower() in ("1", "true", "yes"),
+        timeout=float(os.getenv("TOOL_TIMEOUT_SECONDS", "10")),
+        concurrency=int(os.getenv("TOOL_CONCURRENCY", "32")),
+    )
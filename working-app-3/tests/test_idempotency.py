@@ -0,0 +1,74 @@
+# tests/test_idempotency.py
+import threading
+import time
+
+import pytest
+
+from tools.idempotency import IdempotencyConflictError, IdempotencyStore
+
+PAYMENT = {"amount": 10.0, "currency": "GBP", "recipient": {"account_number": "12345678"}}
+
+
+def test_duplicate_key_replays_and_different_body_is_rejected(tmp_path):
+    store = IdempotencyStore(str(tmp_path / "idem.sqlite3"))
+    calls = []
+
+    def pay():
+        calls.append(1)
+        return {"status": "success", "payment_id": f"pay_{len(calls)}"}
+
+    first, replayed = store.execute("k1", PAYMENT, pay)
+    assert not replayed
+    second, replayed = store.execute("k1", dict(PAYMENT), pay)
+    assert replayed and second == first
+    assert len(calls) == 1
+
+    with pytest.raises(IdempotencyConflictError):
+        store.execute("k1", {**PAYMENT, "amount": 99.0}, pay)
+
+    # The record survives a restart (new process, empty memory tier)
+    restarted = IdempotencyStore(str(tmp_path / "idem.sqlite3"))
+    assert restarted.execute("k1", PAYMENT, pay) == (first, True)
+    assert len(calls) == 1
+
+
+def test_concurrent_duplicates_execute_once(tmp_path):
+    store = IdempotencyStore(str(tmp_path / "idem.sqlite3"))
+    calls = []
+
+    def pay():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"status": "success", "payment_id": "pay_1"}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.execute("k2", PAYMENT, pay))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r[0]["payment_id"] == "pay_1" for r in results)
+    assert sum(1 for r in results if not r[1]) == 1
+
+
+def test_duplicate_stops_waiting_for_a_stuck_call_after_the_lease(tmp_path):
+    store = IdempotencyStore(str(tmp_path / "idem.sqlite3"), lease_seconds=0.2)
+    release = threading.Event()
+
+    def stuck():
+        release.wait(5)
+        return {"status": "success", "payment_id": "pay_stuck"}
+
+    leader = threading.Thread(target=store.execute, args=("k3", PAYMENT, stuck))
+    leader.start()
+    time.sleep(0.05)
+
+    started = time.time()
+    response, replayed = store.execute("k3", PAYMENT, lambda: {"status": "success", "payment_id": "pay_2"})
+    assert time.time() - started < 2
+    assert (response["payment_id"], replayed) == ("pay_2", False)
+
+    release.set()
+    leader.join()
@@ -0,0 +1,42 @@
+# tests/test_sessions.py
+import threading
+
+from orchestrator.sessions import SQLiteSessionBackend, compact_messages
+
+
+def test_compaction_keeps_recent_messages_and_a_summary():
+    messages = [{"role": "user", "text": f"msg {i}"} for i in range(10)]
+
+    compacted = compact_messages(messages, max_messages=4)
+    assert len(compacted) == 4
+    assert compacted[0]["role"] == "summary"
+    assert compacted[0]["compacted"] == 7
+    assert compacted[-1]["text"] == "msg 9"
+
+    # Compacting again folds into the existing summary
+    compacted = compact_messages(compacted + [{"role": "user", "text": "msg 10"}], max_messages=4)
+    assert compacted[0]["compacted"] == 8
+    assert "msg 0" in compacted[0]["text"] and "msg 7" in compacted[0]["text"]
+
+
+def test_concurrent_appends_are_not_lost(tmp_path):
+    backend = SQLiteSessionBackend(str(tmp_path / "sessions.sqlite3"), max_messages=1000)
+    backend.create("s1", "payments-agent")
+
+    def writer(n):
+        for i in range(25):
+            backend.append("s1", {"role": "user", "text": f"{n}-{i}"})
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    session = backend.get("s1")
+    assert len(session["messages"]) == 100
+    assert session["version"] == 100
+
+    # A second backend on the same file (another worker) sees the same session
+    other = SQLiteSessionBackend(str(tmp_path / "sessions.sqlite3"))
+    assert other.get("s1")["agent_id"] == "payments-agent"
@@ -0,0 +1,44 @@
+# tests/test_slot_extractor.py
+from datetime import date
+
+from orchestrator.slot_extractor import extract_slots, parse_amount
+
+
+def test_payment_message_fills_every_slot_in_one_pass():
+    slots = extract_slots(
+        "Can you send £1,250.50 to British Gas, account 90479377, sort 13-69-51?",
+        payees=["British Gas"],
+    )
+    assert slots == {
+        "amount": "1250.50",
+        "currency": "GBP",
+        "beneficiary": "British Gas",
+        "account": "90479377",
+        "sort_code": "13-69-51",
+    }
+
+
+def test_amount_forms_and_bare_number_fallback():
+    assert parse_amount("$20") == ("20.00", "USD")
+    assert parse_amount("75 quid") == ("75.00", "GBP")
+    assert extract_slots("€2k to Priya")["amount"] == "2000.00"
+    # The account number is never mistaken for the amount
+    assert extract_slots("pay 60 to account 12345678")["amount"] == "60.00"
+    assert "amount" not in extract_slots("sort code 200000")
+
+
+def test_thousands_suffix_without_currency_symbol():
+    assert extract_slots("send 20k to Mum")["amount"] == "20000.00"
+    assert extract_slots("transfer 1.5k to Mum")["amount"] == "1500.00"
+    assert extract_slots("send 20 K please")["amount"] == "20000.00"
+    assert extract_slots("lift 20 kg")["amount"] == "20.00"
+
+
+def test_relative_date_ranges():
+    today = date(2026, 10, 18)
+    slots = extract_slots("statement for the last 3 months", today=today)
+    assert slots["date_range"]["from"] == "2026-07-18"
+    assert slots["months"] == 3
+    assert extract_slots("transactions last month", today=today)["date_range"] == {
+        "from": "2026-09-01", "to": "2026-09-30", "label": "last month", "months": 1,
+    }
@@ -0,0 +1,258 @@
+# tools/idempotency.py
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+
+class IdempotencyConflictError(Exception):
+    """The idempotency key was already used with a different request body."""
+
+
+def request_hash(payload: Dict[str, Any]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _InFlight:
+    __slots__ = ("request_hash", "done", "response", "error")
+
+    def __init__(self, request_hash):
+        self.request_hash = request_hash
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class IdempotencyStore:
+    """
+    Records (key, request hash, response) for side-effecting calls.
+
+    A bounded in-memory LRU with TTL sits over a SQLite file (WAL mode) that
+    every worker process shares. Duplicates of a key that is still executing
+    wait for the first call instead of running again: in-process callers
+    block on an event, and callers in other processes poll the pending row
+    that the first call claimed. A pending row older than `lease_seconds`
+    is assumed abandoned (the worker died) and can be taken over; waiters in
+    the same process likewise stop waiting after `lease_seconds` and try to
+    take the key over rather than blocking on a stuck call forever.
+    """
+
+    def __init__(self, path, ttl_seconds=24 * 3600, max_entries=10000, lease_seconds=30.0, poll_seconds=0.02):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+
+        self._entries = OrderedDict()  # key -> (expires_at, request_hash, response)
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+
+        self.executions = 0
+        self.replays = 0
+        self.coalesced = 0
+        self.conflicts = 0
+
+        self._connect()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # response IS NULL marks a call that is still executing
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS idempotency ("
+                " key TEXT PRIMARY KEY,"
+                " request_hash TEXT NOT NULL,"
+                " response TEXT,"
+                " created_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key, req_hash, response, expires_at):
+        with self._lock:
+            self._entries[key] = (expires_at, req_hash, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup_memory(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _claim(self, key, req_hash):
+        """Insert a pending row. Returns None if claimed, else the existing row."""
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT request_hash, response, created_at, expires_at FROM idempotency WHERE key = ?", (key,)
+            ).fetchone()
+
+            expired = row is not None and row[3] <= now
+            abandoned = row is not None and row[1] is None and now - row[2] > self.lease_seconds
+            if row is None or expired or abandoned:
+                conn.execute(
+                    "INSERT OR REPLACE INTO idempotency (key, request_hash, response, created_at, expires_at)"
+                    " VALUES (?, ?, NULL, ?, ?)",
+                    (key, req_hash, now, now + self.ttl_seconds),
+                )
+                row = None
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def _complete(self, key, response):
+        conn = self._connect()
+        expires_at = time.time() + self.ttl_seconds
+        conn.execute(
+            "UPDATE idempotency SET response = ?, expires_at = ? WHERE key = ?",
+            (json.dumps(response, default=str), expires_at, key),
+        )
+        self._writes += 1
+        if self._writes % 256 == 0:
+            conn.execute("DELETE FROM idempotency WHERE expires_at <= ?", (time.time(),))
+        return expires_at
+
+    def _release(self, key):
+        self._connect().execute("DELETE FROM idempotency WHERE key = ? AND response IS NULL", (key,))
+
+    def _wait_for_other_process(self, key, req_hash):
+        deadline = time.time() + self.lease_seconds
+        while time.time() < deadline:
+            time.sleep(self.poll_seconds)
+            row = self._connect().execute(
+                "SELECT request_hash, response FROM idempotency WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None  # the other call failed and released its claim
+            if row[1] is not None:
+                return json.loads(row[1])
+        return None
+
+    def _check(self, key, stored_hash, req_hash):
+        if stored_hash != req_hash:
+            with self._lock:
+                self.conflicts += 1
+            raise IdempotencyConflictError(f"Idempotency key {key!r} was reused with a different request")
+
+    def execute(self, key: str, payload: Dict[str, Any], fn: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Run `fn` at most once per key. Returns (response, replayed).
+        Raises IdempotencyConflictError if `payload` differs from the first
+        request made with this key. Failed calls are not recorded, so the
+        client can retry them with the same key.
+        """
+        req_hash = request_hash(payload)
+
+        entry = self._lookup_memory(key)
+        if entry:
+            self._check(key, entry[1], req_hash)
+            with self._lock:
+                self.replays += 1
+            return entry[2], True
+
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _InFlight(req_hash)
+
+        if not leader:
+            self._check(key, flight.request_hash, req_hash)
+            # A leader still running after its lease is treated like an
+            # abandoned claim: stop waiting and try to claim the key ourselves
+            if flight.done.wait(self.lease_seconds):
+                with self._lock:
+                    self.coalesced += 1
+                if flight.error:
+                    raise flight.error
+                return flight.response, True
+            return self._claim_and_run(key, req_hash, fn)
+
+        try:
+            response, replayed = self._claim_and_run(key, req_hash, fn)
+            flight.response = response
+            return response, replayed
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.done.set()
+
+    def _claim_and_run(self, key, req_hash, fn):
+        while True:
+            row = self._claim(key, req_hash)
+            if row is None:
+                break
+
+            self._check(key, row[0], req_hash)
+            if row[1] is not None:
+                response = json.loads(row[1])
+                self._remember(key, req_hash, response, row[3])
+                with self._lock:
+                    self.replays += 1
+                return response, True
+
+            response = self._wait_for_other_process(key, req_hash)
+            if response is not None:
+                self._remember(key, req_hash, response, time.time() + self.ttl_seconds)
+                with self._lock:
+                    self.coalesced += 1
+                return response, True
+            # Released or lease expired: try to claim it ourselves
+
+        try:
+            response = fn()
+        except Exception:
+            self._release(key)
+            raise
+
+        expires_at = self._complete(key, response)
+        self._remember(key, req_hash, response, expires_at)
+        with self._lock:
+            self.executions += 1
+        return response, False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "replays": self.replays,
+                "coalesced": self.coalesced,
+                "conflicts": self.conflicts,
+                "in_flight": len(self._in_flight),
+                "entries": len(self._entries),
+            }
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    return IdempotencyStore(
+        os.getenv("IDEMPOTENCY_DB_PATH", os.path.join(tempfile.gettempdir(), "payments_idempotency.sqlite3")),
+        ttl_seconds=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600))),
+        max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000")),
+    )
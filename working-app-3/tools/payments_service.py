@@ -1,11 +1,16 @@
 # tools/payments_service.py
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel
 import uuid
 from typing import Dict, Any
 
+from tools.idempotency import IdempotencyConflictError, get_idempotency_store
+
 app = FastAPI(title="Payments Tool (mock)")
 
+# Replays the stored response for a retried idempotency_key instead of paying twice
+IDEMPOTENCY = get_idempotency_store()
+
 class Recipient(BaseModel):
     name: str
     account_number: str
@@ -18,7 +23,7 @@ class PaymentRequest(BaseModel):
     idempotency_key: str
 
 @app.post("/create_payment")
-def create_payment(req: PaymentRequest):
+def create_payment(req: PaymentRequest, response: Response):
     # Very simple validation
     if req.amount <= 0:
         raise HTTPException(status_code=400, detail="Amount must be > 0")
@@ -26,6 +31,18 @@ def create_payment(req: PaymentRequest):
     if req.currency != "GBP":
         raise HTTPException(status_code=400, detail="Only GBP supported in demo")
 
-    payment_id = "pay_" + uuid.uuid4().hex[:12]
-    # In a real tool, persist, call core banking, return status etc.
-    return {"status": "success", "payment_id": payment_id, "amount": req.amount}
+    def pay() -> Dict[str, Any]:
+        payment_id = "pay_" + uuid.uuid4().hex[:12]
+        # In a real tool, persist, call core banking, return status etc.
+        return {"status": "success", "payment_id": payment_id, "amount": req.amount}
+
+    # model_dump on pydantic v2; requirements.txt still pins v1, which only has .dict()
+    dump = req.model_dump if hasattr(req, "model_dump") else req.dict
+    try:
+        result, replayed = IDEMPOTENCY.execute(req.idempotency_key, dump(exclude={"idempotency_key"}), pay)
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
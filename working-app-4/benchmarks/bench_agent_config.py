@@ -0,0 +1,36 @@
+"""
+Per-request cost of resolving an agent config: reading, parsing and
+validating the YAML on every call versus a registry lookup.
+
+    python -m benchmarks.bench_agent_config --iterations 20000
+"""
+import argparse
+import time
+
+from core.agent_loader import AGENTS_DIR, AgentRegistry, load_agent_file
+
+
+def bench(label, fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    per_call_us = (time.perf_counter() - start) / iterations * 1e6
+    print(f"{label:>16}: {per_call_us:10.2f} us/request")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    path = AGENTS_DIR / "statement_agent.yaml"
+    registry = AgentRegistry()
+
+    disk = bench("yaml per request", lambda: load_agent_file(path), max(1, args.iterations // 20))
+    cached = bench("registry lookup", lambda: registry.get("statement_agent.yaml"), args.iterations)
+    print(f"{'speed-up':>16}: {disk / cached:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
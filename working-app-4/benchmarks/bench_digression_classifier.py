@@ -0,0 +1,121 @@
+"""
+How many payment-journey turns the digression classifier settles without
+the LLM, how accurate those local decisions are, and the per-turn latency
+with an LLM that takes --llm-ms per call. The turn set is replayed
+--repeat times to show the (goal, missing slots, message) cache.
+
+    python -m benchmarks.bench_digression_classifier --llm-ms 400 --thresholds 0.7 0.8 0.9
+"""
+import argparse
+import time
+
+from core.digression_classifier import DigressionClassifier, classify_locally
+
+GOAL = "Send money to a beneficiary"
+REQUIRED = ["beneficiary", "amount", "account"]
+
+# (missing slots, user message, expected label)
+TURNS = [
+    (["beneficiary", "amount", "account"], "I want to send £50 to John", "ALIGNED"),
+    (["beneficiary", "amount", "account"], "Pay 120 pounds to my landlord", "ALIGNED"),
+    (["amount", "account"], "£250", "ALIGNED"),
+    (["amount", "account"], "make it 75 quid", "ALIGNED"),
+    (["amount", "account"], "£40.50 please", "ALIGNED"),
+    (["account"], "it's 12345678", "ALIGNED"),
+    (["account"], "account number 87654321 sort code 20-00-00", "ALIGNED"),
+    (["account"], "12345678", "ALIGNED"),
+    (["beneficiary"], "Sarah Jones", "ALIGNED"),
+    (["beneficiary"], "Payee is Mark", "ALIGNED"),
+    (["beneficiary"], "to my sister", "ALIGNED"),
+    (["beneficiary", "account"], "Send it to Priya, account 11223344", "ALIGNED"),
+    (["amount"], "yes, 300 pounds", "ALIGNED"),
+    (["amount"], "can I send £1,000?", "ALIGNED"),
+    (["account"], "Yes that's right", "ALIGNED"),
+    (["amount"], "about 60", "ALIGNED"),
+    (["beneficiary"], "the electricity company", "ALIGNED"),
+    (["amount", "account"], "What is the maximum amount I can send?", "CLARIFICATION"),
+    (["account"], "Which account number do you need, mine or theirs?", "CLARIFICATION"),
+    (["account"], "where do I find the sort code?", "CLARIFICATION"),
+    (["beneficiary"], "Do I need the payee's full name?", "CLARIFICATION"),
+    (["amount"], "is there a fee for this payment?", "CLARIFICATION"),
+    (["amount"], "how long will the transfer take to arrive?", "CLARIFICATION"),
+    (["beneficiary", "amount", "account"], "What details do you need from me?", "CLARIFICATION"),
+    (["account"], "why do you need the account number?", "CLARIFICATION"),
+    (["amount"], "Is there a daily limit on payments?", "CLARIFICATION"),
+    (["beneficiary"], "can I pay someone abroad?", "CLARIFICATION"),
+    (["amount"], "will they see a reference?", "CLARIFICATION"),
+    (["amount"], "what's my balance?", "DIGRESSION"),
+    (["account"], "I lost my card", "DIGRESSION"),
+    (["beneficiary"], "What's the weather like tomorrow?", "DIGRESSION"),
+    (["amount", "account"], "never mind, show me my statement", "DIGRESSION"),
+    (["beneficiary", "amount", "account"], "Actually I want to ask about a mortgage instead", "DIGRESSION"),
+    (["amount"], "tell me a joke", "DIGRESSION"),
+    (["account"], "cancel this", "DIGRESSION"),
+    (["beneficiary"], "What are your branch opening hours?", "DIGRESSION"),
+    (["amount"], "how do I reset my password", "DIGRESSION"),
+    (["account"], "my card was stolen yesterday", "DIGRESSION"),
+    (["amount"], "what's the interest rate on savings?", "DIGRESSION"),
+    (["beneficiary"], "forget it, I'll do it later", "DIGRESSION"),
+    (["amount"], "I want to make a complaint", "DIGRESSION"),
+    (["amount"], "hmm let me think", "ALIGNED"),
+    (["beneficiary"], "who won the football", "DIGRESSION"),
+]
+
+
+class SimulatedLLM:
+    """Answers with the expected label after a fixed delay."""
+
+    def __init__(self, delay_ms, answers):
+        self.delay_ms = delay_ms
+        self.answers = answers
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        time.sleep(self.delay_ms / 1000)
+        prompt = messages[-1].content
+        message = prompt.split("User message:")[1].split("Classify the user message")[0].strip()
+        return type("Response", (), {"content": self.answers[message]})()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm-ms", type=float, default=400)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.6, 0.7, 0.8, 0.9])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    answers = {message: label for _, message, label in TURNS}
+    print(f"{len(TURNS)} labelled turns, replayed {args.repeat}x, LLM {args.llm_ms:.0f} ms per call\n")
+    print(f"{'threshold':>9} {'local':>6} {'local acc':>9} {'LLM calls':>9} {'cache hits':>10}"
+          f" {'LLM avoided':>11} {'mean ms/turn':>12}")
+
+    for threshold in args.thresholds:
+        llm = SimulatedLLM(args.llm_ms, answers)
+        classifier = DigressionClassifier(threshold=threshold, llm=llm)
+
+        local = local_right = 0
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            for missing, message, expected in TURNS:
+                label, source, _ = classifier.classify(message, GOAL, REQUIRED, missing)
+                if source == "local":
+                    local += 1
+                    local_right += label == expected
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        stats = classifier.snapshot()
+        print(f"{threshold:>9.2f} {local / len(TURNS):>6.1%} {local_right / max(local, 1):>9.1%} {llm.calls:>9}"
+              f" {stats['cache_hits']:>10} {stats['llm_avoided']:>11.1%} {elapsed_ms / stats['turns']:>12.2f}")
+
+    # Local decision cost alone
+    n = 20000
+    started = time.perf_counter()
+    for i in range(n):
+        missing, message, _ = TURNS[i % len(TURNS)]
+        classify_locally(message, missing)
+    print(f"\nlocal classification: {(time.perf_counter() - started) / n * 1e6:.1f} us per turn")
+
+
+if __name__ == "__main__":
+    main()
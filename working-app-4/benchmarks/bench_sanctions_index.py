@@ -0,0 +1,100 @@
+"""
+Sanctions index build time, file size and lookup latency on a synthetic
+watch list: exact names (tokens reordered), names with a typo, names that
+are not listed, and free-text references scanned with the automaton.
+
+    python -m benchmarks.bench_sanctions_index --entries 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from policies.sanctions_index import SanctionsIndex, build_index
+
+ONSETS = ["b", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "r", "s", "t", "v", "w", "y", "z",
+          "br", "ch", "dr", "gh", "kh", "kr", "ph", "sh", "st", "th", "tr", "zh", ""]
+NUCLEI = ["a", "e", "i", "o", "u", "aa", "ai", "ei", "ia", "ou", "y", "ee"]
+CODAS = ["", "", "", "n", "r", "l", "m", "s", "d", "k", "t", "v", "ng", "sh", "ff"]
+
+
+def make_token(rng):
+    return "".join(rng.choice(ONSETS) + rng.choice(NUCLEI) + rng.choice(CODAS) for _ in range(rng.randint(2, 3)))
+
+
+def make_names(rng, n):
+    # Skewed towards the head of each vocabulary: some names are common, most are rare
+    given = [make_token(rng).capitalize() for _ in range(20000)]
+    family = [make_token(rng).capitalize() for _ in range(n // 2)]
+    skewed = lambda vocab: vocab[int(len(vocab) * rng.random() ** 2)]
+    names = []
+    for _ in range(n):
+        parts = [skewed(given)] + [skewed(family) for _ in range(rng.randint(1, 3))]
+        names.append(" ".join(parts))
+    return names
+
+
+def typo(rng, name):
+    i = rng.randrange(1, len(name) - 1)
+    if name[i] == " ":
+        i -= 1
+    return name[:i] + rng.choice("aeiou") + name[i + 1:]
+
+
+def latency(label, index_fn, queries, expected=None):
+    """p50/p99 latency and hit rate; with `expected` names, recall of the listed entry instead."""
+    timings = []
+    hits = 0
+    for i, q in enumerate(queries):
+        start = time.perf_counter()
+        matches = index_fn(q)
+        timings.append((time.perf_counter() - start) * 1000)
+        if expected is None:
+            hits += bool(matches)
+        else:
+            hits += any(m.name == expected[i] for m in matches)
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p99 = timings[int(len(timings) * 0.99)]
+    rate = "recall" if expected is not None else "hit rate"
+    print(f"{label:>22}: p50 {p50:6.3f} ms  p99 {p99:6.3f} ms  {rate} {hits / len(queries):6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--index", help="reuse / write the index at this path")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    names = make_names(rng, args.entries)
+    path = args.index or os.path.join(tempfile.mkdtemp(), "sanctions.idx")
+
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        build_index(((name, "SYNTH") for name in names), path)
+        print(f"{'build':>22}: {time.perf_counter() - start:7.2f} s")
+    print(f"{'index size':>22}: {os.path.getsize(path) / 1e6:,.1f} MB for {len(names):,} entries")
+
+    start = time.perf_counter()
+    index = SanctionsIndex(path)
+    print(f"{'open (mmap)':>22}: {(time.perf_counter() - start) * 1000:7.3f} ms")
+
+    listed = [rng.choice(names) for _ in range(args.queries)]
+    reordered = [" ".join(reversed(name.split())) for name in listed]
+    typos = [typo(rng, name) for name in listed]
+    unlisted = [" ".join(make_token(rng).capitalize() for _ in range(3)) for _ in range(args.queries)]
+    references = [f"Invoice 4471 for {name} services" for name in listed]
+
+    search = lambda q: index.search(q, threshold=args.threshold, limit=5)
+    latency("exact (reordered)", search, reordered, listed)
+    latency("one typo", search, typos, listed)
+    latency("not listed", search, unlisted)
+    latency("reference scan", index.scan, references, listed)
+
+
+if __name__ == "__main__":
+    main()
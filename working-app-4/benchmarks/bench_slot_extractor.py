@@ -0,0 +1,121 @@
+"""
+Slot extraction throughput (messages per second) for the single-pass
+scanner in core.slot_extractor versus the same patterns run as one
+re.search per slot, on generated payment / statement messages. Also checks the
+extracted values against the ones the messages were generated from.
+
+    python -m benchmarks.bench_slot_extractor --messages 200000
+"""
+import argparse
+import random
+import re
+import time
+
+from core.slot_extractor import _PATTERNS, SlotExtractor, parse_amount, parse_date_range
+
+PAYEES = ["John Smith", "British Gas", "Thames Water", "Priya Patel", "Mum", "Landlord Ltd"]
+TEMPLATES = [
+    "Send {amount} to {payee}",
+    "pay {payee} {amount} please",
+    "transfer {amount} to account {account} sort code {sort_code}",
+    "Can you send {amount} to {payee}, account {account}, sort {sort_code}?",
+    "I'd like my statement for the {range}",
+    "show transactions from the {range} on {account}",
+    "{payee} needs {amount} by Friday, their account is {account}",
+    "what's my balance",
+]
+RANGES = ["last 3 months", "past 2 weeks", "last month", "last six months", "past 1 year"]
+
+
+def make_messages(rng, n):
+    messages = []
+    for _ in range(n):
+        whole = rng.randint(1, 5000)
+        symbol, code = rng.choice([("£", "GBP"), ("$", "USD"), ("€", "EUR")])
+        amount_text = rng.choice([f"{symbol}{whole:,}", f"{symbol}{whole}.50", f"{whole} {code}"])
+        expected_amount = f"{whole}.50" if ".50" in amount_text else f"{whole}.00"
+        values = {
+            "amount": amount_text,
+            "payee": rng.choice(PAYEES),
+            "account": f"{rng.randint(10000000, 99999999)}",
+            "sort_code": f"{rng.randint(10, 99)}-{rng.randint(10, 99)}-{rng.randint(10, 99)}",
+            "range": rng.choice(RANGES),
+        }
+        template = rng.choice(TEMPLATES)
+        expected = {}
+        if "{amount}" in template:
+            expected["amount"] = expected_amount
+        for slot, field in (("beneficiary", "payee"), ("account", "account"), ("sort_code", "sort_code")):
+            if "{" + field + "}" in template:
+                expected[slot] = values[field]
+        messages.append((template.format(**values), expected))
+    return messages
+
+
+class PerSlotExtractor:
+    """The same patterns and parsing, but one re.search over the message per slot."""
+
+    def __init__(self, payees):
+        self.payees = {p.lower(): p for p in payees}
+        names = "|".join(re.escape(p) for p in sorted(self.payees, key=len, reverse=True))
+        patterns = dict(_PATTERNS, known_payee=rf"\b(?:{names})\b")
+        self.searches = [(slot, re.compile(pattern, re.IGNORECASE)) for slot, pattern in patterns.items()]
+
+    def extract(self, message, today=None):
+        slots = {}
+        for slot, pattern in self.searches:
+            match = pattern.search(message)
+            if not match:
+                continue
+            text = match.group(0)
+            if slot in ("amount", "number") and "amount" not in slots:
+                parsed = parse_amount(text)
+                if parsed:
+                    slots["amount"], slots["currency"] = parsed
+            elif slot == "sort_code":
+                digits = re.sub(r"\D", "", text)
+                slots["sort_code"] = f"{digits[:2]}-{digits[2:4]}-{digits[4:6]}"
+            elif slot == "account":
+                slots["account"] = text
+            elif slot == "known_payee":
+                slots["beneficiary"] = self.payees[text.lower()]
+            elif slot == "named_payee" and "beneficiary" not in slots:
+                slots["beneficiary"] = text.split(None, 1)[1]
+            elif slot == "date_range":
+                slots["date_range"] = parse_date_range(text, today)
+        return slots
+
+
+def throughput(label, fn, messages, repeat):
+    texts = [m for m, _ in messages]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>24}: {len(texts) * repeat / elapsed:12,.0f} messages/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    messages = make_messages(random.Random(11), args.messages)
+    extractor = SlotExtractor(PAYEES)
+
+    throughput("single-pass scanner", extractor.extract, messages, args.repeat)
+    throughput("re.search per slot", PerSlotExtractor(PAYEES).extract, messages, args.repeat)
+
+    right = total = 0
+    for text, expected in messages:
+        found = extractor.extract(text)
+        for slot, value in expected.items():
+            total += 1
+            right += found.get(slot) == value
+    print(f"{'slot accuracy':>24}: {right / max(total, 1):.2%} of {total:,} expected slots")
+
+
+if __name__ == "__main__":
+    main()
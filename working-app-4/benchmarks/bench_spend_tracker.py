@@ -0,0 +1,80 @@
+"""
+SpendTracker throughput and memory across many accounts: record rate with
+and without the append log, query rate, snapshot size/time and restart
+(snapshot load + log replay) time.
+
+    python -m benchmarks.bench_spend_tracker --accounts 1000000 --events 3000000
+"""
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+
+from policies.spend_tracker import SpendTracker
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def timed(label, n, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>22}: {elapsed:7.2f} s  ({n / elapsed:12,.0f} ops/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, default=1000000)
+    parser.add_argument("--events", type=int, default=3000000)
+    parser.add_argument("--queries", type=int, default=1000000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    accounts = [f"{n:08d}" for n in range(args.accounts)]
+    now = time.time()
+    # Events spread over the last 24h, as they would be in steady state
+    events = [(rng.choice(accounts), rng.randint(1, 50000) / 100, now - rng.uniform(0, 86400 - 600))
+              for _ in range(args.events)]
+    events.sort(key=lambda e: e[2])
+    base_rss = rss_mb()
+
+    memory_only = SpendTracker()
+    timed("record (memory)", args.events, lambda: [memory_only.record(a, amt, ts) for a, amt, ts in events])
+    print(f"{'accounts / memory':>22}: {memory_only.accounts():,} accounts, ~{rss_mb() - base_rss:,.0f} MB")
+
+    picks = [rng.choice(accounts) for _ in range(args.queries)]
+    timed("daily total query", args.queries, lambda: [memory_only.total_pence(a, now) for a in picks])
+    del memory_only
+
+    directory = tempfile.mkdtemp()
+    log_path = os.path.join(directory, "spend.log")
+    snapshot_path = os.path.join(directory, "spend.snapshot.json")
+
+    durable = SpendTracker(log_path=log_path, snapshot_path=snapshot_path, snapshot_every=0)
+    timed("record (append log)", args.events, lambda: [durable.record(a, amt, ts) for a, amt, ts in events])
+
+    expected = {a: durable.total_pence(a, now) for a in picks[:1000]}
+    timed("snapshot", durable.accounts(), durable.snapshot)
+    print(f"{'snapshot size':>22}: {os.path.getsize(snapshot_path) / 1e6:,.1f} MB")
+
+    # A further 10% of traffic after the snapshot is only in the log
+    tail = events[: args.events // 10]
+    for a, amt, _ in tail:
+        durable.record(a, amt, now)
+        if a in expected:
+            expected[a] += round(amt * 100)
+    durable.close()
+
+    restored = []
+    timed("restart (load+replay)", durable.accounts(),
+          lambda: restored.append(SpendTracker(log_path=log_path, snapshot_path=snapshot_path, snapshot_every=0)))
+    assert all(restored[0].total_pence(a, now) == total for a, total in expected.items())
+    print(f"{'restored totals':>22}: match")
+
+
+if __name__ == "__main__":
+    main()
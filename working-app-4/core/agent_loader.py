@@ -1,16 +1,23 @@
+import os
+import threading
+import time
 import yaml
 from pathlib import Path
+from types import MappingProxyType
 
 class AgentConfigError(Exception):
     pass
 
 
-def load_agent_config(agent_name: str) -> dict:
-    base_dir = Path(__file__).resolve().parent.parent
-    config_path = base_dir / "agents" / f"{agent_name}_agent.yaml"
+AGENTS_DIR = Path(__file__).resolve().parent.parent / "agents"
 
-    print("DEBUG loading agent config from:", config_path)
 
+def load_agent_config(agent_name: str):
+    # Served from the pre-validated, immutable registry; no disk access per call
+    return get_agent_registry().get(agent_name)
+
+
+def load_agent_file(config_path: Path) -> dict:
     if not config_path.exists():
         raise AgentConfigError(f"Agent config not found: {config_path}")
 
@@ -24,9 +31,121 @@ def load_agent_config(agent_name: str) -> dict:
 def validate_agent_config(config: dict):
     required_keys = ["agent", "goals", "policies", "prompts"]
 
+    if not isinstance(config, dict):
+        raise AgentConfigError("Agent config must be a mapping")
+
     for key in required_keys:
         if key not in config:
             raise AgentConfigError(f"Missing required key: {key}")
 
     if not config.get("goals"):
         raise AgentConfigError("At least one goal must be defined")
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class AgentRegistry:
+    """
+    Loads and validates every agents/*.yaml once into immutable configs.
+
+    Lookups are a single dict access. A background watcher polls file
+    mtimes and, when something changes, builds a complete new mapping and
+    swaps it in with one assignment, so readers never see a partial reload.
+    """
+
+    def __init__(self, agents_dir: Path = AGENTS_DIR):
+        self.agents_dir = Path(agents_dir)
+        self._configs = {}
+        self._mtimes = {}
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+        self.reload(strict=True)
+
+    @staticmethod
+    def normalize_name(agent_name: str) -> str:
+        # "payment", "payment_agent" and "payment_agent.yaml" all resolve to "payment"
+        name = agent_name[:-5] if agent_name.endswith(".yaml") else agent_name
+        return name[:-6] if name.endswith("_agent") else name
+
+    def reload(self, strict=False) -> bool:
+        with self._lock:
+            paths = {p: p.stat().st_mtime_ns for p in sorted(self.agents_dir.glob("*.yaml"))}
+            if paths == self._mtimes:
+                return False
+
+            configs = {}
+            for path, mtime in paths.items():
+                name = self.normalize_name(path.name)
+                if self._mtimes.get(path) == mtime and name in self._configs:
+                    configs[name] = self._configs[name]
+                    continue
+                try:
+                    configs[name] = freeze(load_agent_file(path))
+                except (AgentConfigError, yaml.YAMLError) as e:
+                    if strict:
+                        raise AgentConfigError(f"{path.name}: {e}") from e
+                    print(f"[AgentRegistry] keeping previous config for {path.name}: {e}")
+                    if name in self._configs:
+                        configs[name] = self._configs[name]
+
+            # Agents are also addressable by their declared agent.name
+            for name, config in list(configs.items()):
+                alias = self.normalize_name(str(config["agent"].get("name", name)))
+                configs.setdefault(alias, config)
+
+            self._configs = configs
+            self._mtimes = paths
+            return True
+
+    def get(self, agent_name: str):
+        config = self._configs.get(self.normalize_name(agent_name))
+        if config is None:
+            raise AgentConfigError(f"Agent config not found: {agent_name}")
+        return config
+
+    def names(self):
+        return sorted(self._configs)
+
+    def start_watching(self, interval: float = 2.0):
+        if self._watcher:
+            return
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                if self.reload():
+                    print(f"[AgentRegistry] reloaded agents: {self.names()}")
+
+        self._watcher = threading.Thread(target=watch, name="agent-config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self, timeout: float = None):
+        """Stop the watcher and wait for it to exit; start_watching() can run it again."""
+        watcher, self._watcher = self._watcher, None
+        self._stop.set()
+        if watcher:
+            watcher.join(timeout)
+
+
+_REGISTRY = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_agent_registry() -> AgentRegistry:
+    global _REGISTRY
+
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = AgentRegistry()
+            interval = float(os.getenv("AGENT_CONFIG_WATCH_SECONDS", "2"))
+            if interval > 0:
+                _REGISTRY.start_watching(interval)
+        return _REGISTRY
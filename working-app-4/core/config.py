@@ -1,7 +1,39 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
 
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 ENABLE_TRACE = os.getenv("ENABLE_EXECUTION_TRACE") == "true"
+
+# Policy execution (nodes/policy_executor.py); per-policy overrides live in policies/registry.py
+POLICY_TIMEOUT_SECONDS = float(os.getenv("POLICY_TIMEOUT_SECONDS", "2"))
+POLICY_FAILURE_MODE = os.getenv("POLICY_FAILURE_MODE", "fail_closed")  # fail_closed | fail_open
+POLICY_EXECUTOR_WORKERS = int(os.getenv("POLICY_EXECUTOR_WORKERS", "32"))  # threads for sync policies
+POLICY_CACHE_TTL_SECONDS = float(os.getenv("POLICY_CACHE_TTL_SECONDS", "300"))
+POLICY_CACHE_MAX_ENTRIES = int(os.getenv("POLICY_CACHE_MAX_ENTRIES", "10000"))
+
+# Rolling 24h spend per account for the daily_limit policy (policies/spend_tracker.py)
+MAX_DAILY_TRANSACTION_AMOUNT = os.getenv("MAX_DAILY_TRANSACTION_AMOUNT", "10000")
+SPEND_TRACKER_DIR = os.getenv("SPEND_TRACKER_DIR", os.path.join(tempfile.gettempdir(), "spend_tracker"))
+SPEND_WINDOW_SECONDS = int(os.getenv("SPEND_WINDOW_SECONDS", str(24 * 3600)))
+SPEND_BUCKET_SECONDS = int(os.getenv("SPEND_BUCKET_SECONDS", "300"))
+SPEND_SNAPSHOT_EVERY = int(os.getenv("SPEND_SNAPSHOT_EVERY", "100000"))
+# How long daily_limit holds an amount if the payment is never committed or released
+SPEND_RESERVATION_SECONDS = float(os.getenv("SPEND_RESERVATION_SECONDS", "300"))
+
+# Sanctions / watch-list screening for the aml_check policy (policies/sanctions_index.py).
+# Build the index with: python -m policies.sanctions_index build <list.txt> <index.idx>
+SANCTIONS_INDEX_PATH = os.getenv("SANCTIONS_INDEX_PATH", "")
+SANCTIONS_MATCH_THRESHOLD = float(os.getenv("SANCTIONS_MATCH_THRESHOLD", "0.85"))
+
+# Digression detection (core/digression_classifier.py): local features decide
+# confident turns, the LLM only the rest
+ENABLE_DIGRESSION_DETECTION = os.getenv("ENABLE_DIGRESSION_DETECTION", "true") == "true"
+DIGRESSION_CONFIDENCE_THRESHOLD = float(os.getenv("DIGRESSION_CONFIDENCE_THRESHOLD", "0.8"))
+DIGRESSION_CACHE_MAX_ENTRIES = int(os.getenv("DIGRESSION_CACHE_MAX_ENTRIES", "10000"))
+
+# Payee names the slot extractor recognises without a "to <Name>" cue
+# (comma separated; agents can add their own under known_payees)
+KNOWN_PAYEES = [p.strip() for p in os.getenv("KNOWN_PAYEES", "").split(",") if p.strip()]
@@ -0,0 +1,187 @@
+"""
+Tiered ALIGNED / CLARIFICATION / DIGRESSION classifier for the digression
+detector.
+
+Local features (values for the missing slots, question form, payment
+vocabulary, off-topic keywords) are scored per label; when the softmax of
+those scores is confident the turn is classified without the LLM. Only
+ambiguous turns go to the LLM with prompts/payment/digression_classifier.txt.
+Every classification is cached by (goal, missing slots, normalized message).
+"""
+import math
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from core import config
+from core.template_engine import CompiledTemplate, load_template
+
+LABELS = ("ALIGNED", "CLARIFICATION", "DIGRESSION")
+
+DEFAULT_PROMPT = Path(__file__).resolve().parent.parent / "prompts" / "payment" / "digression_classifier.txt"
+
+# Values that fill a slot; beneficiary names are matched case-sensitively
+SLOT_PATTERNS = {
+    "amount": re.compile(
+        r"[£$€]\s?\d[\d,]*(?:\.\d{1,2})?|\b\d[\d,]*(?:\.\d{1,2})?\s?(?:pounds?|quid|gbp|eur|euros?|usd|dollars?)\b",
+        re.IGNORECASE,
+    ),
+    "account": re.compile(r"(?<![\d-])\d{8}(?![\d-])"),
+    "sort_code": re.compile(r"(?<!\d)\d{2}-\d{2}-\d{2}(?!\d)"),
+    "beneficiary": re.compile(
+        r"\b(?:[Tt]o|[Ff]or|[Pp]ayee is|[Bb]eneficiary is|[Rr]ecipient is)\s+(?:my\s+)?[A-Z][a-z]+"
+        r"|\b(?:[Tt]o|[Ff]or)\s+my\s+(?:mum|dad|mother|father|sister|brother|wife|husband|partner|landlord|friend)\b"
+    ),
+}
+
+QUESTION_START = re.compile(
+    r"^\s*(?:what|why|how|which|where|when|who|do|does|did|can|could|is|are|will|would|should)\b", re.IGNORECASE
+)
+GOAL_TERMS = re.compile(
+    r"\b(?:amount|account(?: number)?|sort code|beneficiary|payee|recipient|reference|payment|transfer|"
+    r"fee|fees|limit|arrive|take|need|details|send|pay|paying|money)\b",
+    re.IGNORECASE,
+)
+OFF_TOPIC = re.compile(
+    r"\b(?:weather|joke|football|news|mortgage|loan|credit card|card|balance|statement|interest rate|"
+    r"branch|opening hours|password|pin|lost|stolen|complaint|overdraft|savings|isa|insurance)\b",
+    re.IGNORECASE,
+)
+LEAVE_JOURNEY = re.compile(
+    r"\b(?:never ?mind|forget (?:it|that|about)|cancel|something else|instead|stop|different question)\b",
+    re.IGNORECASE,
+)
+AFFIRM = re.compile(r"^\s*(?:yes|yeah|yep|correct|that's right|that is right|confirm(?:ed)?|ok(?:ay)?)\b", re.IGNORECASE)
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    return _SPACES.sub(" ", message.strip().lower())
+
+
+def features(message: str, missing_slots) -> dict:
+    missing = set(missing_slots or [])
+    filled = [slot for slot, pattern in SLOT_PATTERNS.items() if pattern.search(message)]
+    question = "?" in message or bool(QUESTION_START.match(message))
+    words = message.split()
+
+    return {
+        "missing_slot_values": sum(1 for slot in filled if slot in missing),
+        "other_slot_values": sum(1 for slot in filled if slot not in missing),
+        "question": question,
+        "goal_terms": len(GOAL_TERMS.findall(message)),
+        "off_topic": len(OFF_TOPIC.findall(message)),
+        "leave_journey": bool(LEAVE_JOURNEY.search(message)),
+        "affirm": bool(AFFIRM.match(message)),
+        # A bare name-like reply while the beneficiary is still missing
+        "short_answer": "beneficiary" in missing and 0 < len(words) <= 3 and not question
+                        and not any(c.isdigit() for c in message) and message[:1].isupper(),
+    }
+
+
+def scores(f: dict) -> dict:
+    aligned = 3.0 * f["missing_slot_values"] + 1.0 * f["other_slot_values"] + 2.0 * f["short_answer"] + 1.5 * f["affirm"]
+    clarification = (2.0 + 0.8 * min(f["goal_terms"], 3)) if f["question"] else 0.0
+    digression = 2.5 * min(f["off_topic"], 2) + 3.0 * f["leave_journey"] + (0.8 if f["question"] and not f["goal_terms"] else 0.0)
+
+    # A question that carries the missing value ("can I send £50?") is still an answer
+    if f["missing_slot_values"]:
+        clarification *= 0.5
+        digression *= 0.5
+    return {"ALIGNED": aligned, "CLARIFICATION": clarification, "DIGRESSION": digression}
+
+
+def classify_locally(message: str, missing_slots):
+    """(label, confidence) from local features alone."""
+    s = scores(features(message, missing_slots))
+    top = max(s.values())
+    exps = {label: math.exp(value - top) for label, value in s.items()}
+    total = sum(exps.values())
+    label = max(exps, key=exps.get)
+    return label, exps[label] / total
+
+
+def _parse_label(text: str) -> str:
+    upper = str(text).upper()
+    return next((label for label in LABELS if label in upper), "ALIGNED")
+
+
+class DigressionClassifier:
+
+    def __init__(self, threshold=None, max_entries=None, llm=None):
+        self.threshold = config.DIGRESSION_CONFIDENCE_THRESHOLD if threshold is None else threshold
+        self.max_entries = config.DIGRESSION_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self._llm = llm
+        self._cache = OrderedDict()  # (goal, missing slots, message) -> label
+        self._lock = threading.Lock()
+        self.stats = {"turns": 0, "local": 0, "llm": 0, "cache_hits": 0}
+
+    def _ask_llm(self, prompt):
+        if self._llm is None:
+            from core.llm_factory import get_llm
+            self._llm = get_llm()
+
+        from langchain_core.messages import HumanMessage, SystemMessage
+        response = self._llm.invoke([
+            SystemMessage(content="Classify only. No explanation."),
+            HumanMessage(content=prompt),
+        ])
+        return _parse_label(getattr(response, "content", response))
+
+    def classify(self, message, goal_description, required_slots, missing_slots, prompt_template=None):
+        """Returns (label, source, confidence); source is cache | local | llm."""
+        missing = sorted(missing_slots or [])
+        key = (goal_description, tuple(missing), normalize_message(message))
+
+        with self._lock:
+            self.stats["turns"] += 1
+            label = self._cache.get(key)
+            if label is not None:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return label, "cache", 1.0
+
+        label, confidence = classify_locally(message, missing)
+        source = "local"
+        if confidence < self.threshold:
+            template = prompt_template or load_template(str(DEFAULT_PROMPT))
+            label = self._ask_llm(template.render(
+                goal_description=goal_description,
+                required_slots=", ".join(required_slots or []),
+                missing_slots=", ".join(missing),
+                user_message=message,
+            ))
+            source, confidence = "llm", 1.0
+
+        with self._lock:
+            self.stats[source] += 1
+            self._cache[key] = label
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return label, source, confidence
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        stats["llm_avoided"] = round(1 - stats["llm"] / stats["turns"], 4) if stats["turns"] else None
+        return stats
+
+
+def prompt_template(agent_config):
+    """The agent's digression_classifier prompt (a file path or inline text), or the default file."""
+    prompt = (agent_config.get("prompts") or {}).get("digression_classifier")
+    if not prompt:
+        return load_template(str(DEFAULT_PROMPT))
+    if "\n" not in prompt and Path(prompt).is_file():
+        return load_template(prompt)
+    return CompiledTemplate(prompt)
+
+
+CLASSIFIER = DigressionClassifier()
+
+
+def digression_stats() -> dict:
+    return CLASSIFIER.snapshot()
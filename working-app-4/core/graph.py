@@ -7,7 +7,7 @@ from nodes.execution import execution_node
 from nodes.slot_filler import slot_filler_node
 from nodes.digression_detector import digression_detector_node
 from nodes.replanner import replanner_node
-from nodes.policy_executor import policy_executor_node
+from nodes.policy_executor import apolicy_executor_node
 from nodes.tool_executor import tool_executor_node
 from nodes.responder import responder_node
 
@@ -24,7 +24,7 @@ def build_agent_graph():
     graph.add_node("slot_filler", slot_filler_node)
     graph.add_node("digression_detector", digression_detector_node)
     graph.add_node("replanner", replanner_node)
-    graph.add_node("policy_executor", policy_executor_node)
+    graph.add_node("policy_executor", apolicy_executor_node)
     graph.add_node("tool_executor", tool_executor_node)
     graph.add_node("responder", responder_node)
 
@@ -42,32 +42,31 @@ def build_agent_graph():
     # --------------------
     # Execution routing
     # --------------------
+    # Each new message is checked for a digression before it fills any slots
     graph.add_conditional_edges(
         "execution",
         lambda s: s["journey_status"],
         {
-            "collecting_info": "slot_filler",
+            "collecting_info": "digression_detector",
             "awaiting_user_input": "__end__",
             "ready_for_execution": "policy_executor",
         },
     )
 
-    # Slot filling loop
-    graph.add_edge("slot_filler", "execution")
-
-    # Digression detection
-    graph.add_edge("execution", "digression_detector")
-
     graph.add_conditional_edges(
         "digression_detector",
         lambda s: s.get("digression_detected", False),
         {
             True: "replanner",
-            False: "policy_executor",
+            False: "slot_filler",
         },
     )
 
-    graph.add_edge("replanner", "execution")
+    # Slot filling loop
+    graph.add_edge("slot_filler", "execution")
+
+    # A digression resets the journey and ends the turn; the next message starts it again
+    graph.add_edge("replanner", "__end__")
 
     # Final execution path
     graph.add_edge("policy_executor", "tool_executor")
@@ -1,20 +1,82 @@
 import os
+import threading
+
+import httpx
 from langchain_ollama import ChatOllama 
 from langchain_openai import ChatOpenAI
 
-def get_llm():
-    provider = os.getenv("LLM_PROVIDER", "ollama")
+# Process-wide registry: planner, responder and digression_detector all get
+# the same client (and the same keep-alive connection pool) for a given
+# (provider, model, temperature).
+_LLMS = {}
+_HTTP_CLIENTS = {}
+_LOCK = threading.Lock()
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=float(os.getenv("LLM_POOL_KEEPALIVE_SECONDS", "60")),
+    )
 
+
+def _http_clients():
+    if not _HTTP_CLIENTS:
+        _HTTP_CLIENTS["sync"] = httpx.Client(limits=_pool_limits())
+        _HTTP_CLIENTS["async"] = httpx.AsyncClient(limits=_pool_limits())
+    return _HTTP_CLIENTS["sync"], _HTTP_CLIENTS["async"]
+
+
+def _build_llm(provider, model, temperature):
     if provider == "ollama":
         return ChatOllama(
-            model=os.getenv("OLLAMA_MODEL", "llama3.1"),
-            temperature=0,
+            model=model,
+            temperature=temperature,
+            client_kwargs={"limits": _pool_limits()},
         )
 
     if provider == "openai":
+        http_client, http_async_client = _http_clients()
         return ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=0,
+            model=model,
+            temperature=temperature,
+            http_client=http_client,
+            http_async_client=http_async_client,
         )
 
     raise ValueError(f"Unknown LLM_PROVIDER: {provider}")
+
+
+def _warm_up(llm):
+    # Establish the connection before the first real request arrives
+    base_url = getattr(getattr(llm, "root_client", None), "base_url", None)
+    if not base_url:
+        return
+    try:
+        _HTTP_CLIENTS["sync"].head(str(base_url), timeout=5.0)
+    except httpx.HTTPError as e:
+        print(f"[llm_factory] warm-up failed for {base_url}: {e}")
+
+
+def get_llm():
+    provider = os.getenv("LLM_PROVIDER", "ollama")
+
+    if provider == "ollama":
+        model = os.getenv("OLLAMA_MODEL", "llama3.1")
+    elif provider == "openai":
+        model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    else:
+        raise ValueError(f"Unknown LLM_PROVIDER: {provider}")
+
+    temperature = 0
+    key = (provider, model, temperature)
+
+    with _LOCK:
+        llm = _LLMS.get(key)
+        if llm is None:
+            llm = _build_llm(provider, model, temperature)
+            _LLMS[key] = llm
+            if os.getenv("LLM_POOL_WARMUP", "true") == "true":
+                _warm_up(llm)
+        return llm
@@ -1,9 +1,5 @@
-from pathlib import Path
+from core.template_engine import load_template
 
 def load_prompt(path: str, variables: dict) -> str:
-    template = Path(path).read_text()
-
-    for key, value in variables.items():
-        template = template.replace(f"{{{{{key}}}}}", str(value))
-
-    return template
+    # Parsed once per file version; rendered in a single pass
+    return load_template(path).render(variables)
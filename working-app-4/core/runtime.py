@@ -1,4 +1,4 @@
-def handle_user_message(agent, state, user_message: str):
+async def handle_user_message(agent, state, user_message: str):
     state["last_user_message"] = user_message
     state["messages"].append({
         "role": "user",
@@ -6,6 +6,6 @@ def handle_user_message(agent, state, user_message: str):
     })
 
     # Slot filling
-    state = agent.invoke(state, start_at="slot_filler")
+    state = await agent.ainvoke(state, start_at="slot_filler")
 
     return state
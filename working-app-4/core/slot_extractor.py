@@ -0,0 +1,201 @@
+"""
+Single-pass slot extraction for payment and statement messages.
+
+Every slot pattern is one named alternative of a single compiled regex, so a
+message is scanned once with finditer() and each match is dispatched on its
+group name:
+
+    amount       £50, $1,200.50, €20, 75 GBP, 30 quid, £2k (bare numbers as a fallback)
+    sort_code    20-00-00, 20 00 00, "sort code 200000"
+    account      8-digit account numbers
+    beneficiary  names from the known payee list, else "to/pay <Name>"
+    date_range   last 3 months, past 2 weeks, last month, this year, yesterday, ...
+
+Slots found this way are filled directly, with no LLM call.
+"""
+import calendar
+import re
+import threading
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+
+CURRENCIES = {
+    "£": "GBP", "gbp": "GBP", "pound": "GBP", "pounds": "GBP", "quid": "GBP",
+    "$": "USD", "usd": "USD", "dollar": "USD", "dollars": "USD",
+    "€": "EUR", "eur": "EUR", "euro": "EUR", "euros": "EUR",
+}
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}
+
+_NUMBER = r"\d{1,3}(?:,\d{3})+(?:\.\d{1,2})?|\d+(?:\.\d{1,2})?"
+_COUNT = r"\d+|" + "|".join(NUMBER_WORDS)
+_UNIT = r"day|week|month|year"
+
+# Order matters: at any position the first alternative that matches wins
+_PATTERNS = [
+    ("date_range",
+     rf"\b(?:(?:last|past|previous)\s+(?:{_COUNT})\s+(?:{_UNIT})s?"
+     rf"|(?:last|previous|this)\s+(?:{_UNIT})"
+     rf"|today|yesterday)\b"),
+    ("sort_code", r"(?<![\d-])(?:\d{2}-\d{2}-\d{2}|\d{2} \d{2} \d{2})(?![\d-])|\bsort\s*code:?\s*\d{6}(?!\d)"),
+    ("account", r"(?<![\d.,-])\d{8}(?![\d-]|[.,]\d)"),
+    ("amount",
+     rf"(?:[£$€]|\b(?:gbp|usd|eur)\s?)(?:{_NUMBER})(?:\s?k\b)?"
+     rf"|(?<![\d.,])(?:{_NUMBER})(?:\s?k)?\s?(?:gbp|usd|eur|pounds?|quid|dollars?|euros?)\b"),
+    ("known_payee", None),  # filled in per payee list
+    ("named_payee", r"\b(?:to|pay|payee(?:\s+is)?)\s+(?-i:[A-Z][a-zA-Z'\-]+(?:\s+[A-Z][a-zA-Z'\-]+){0,2})"),
+    ("number", rf"(?<![\d.,£$€])(?:{_NUMBER})(?!\d|[.,]\d)(?:\s?k\b)?"),
+]
+
+_DIGITS = re.compile(r"\d+")
+_CURRENCY = re.compile(r"[£$€]|\b(?:gbp|usd|eur|pounds?|quid|dollars?|euros?)\b", re.IGNORECASE)
+_AMOUNT = re.compile(_NUMBER)
+_THOUSANDS = re.compile(r"\d\s?k\b", re.IGNORECASE)
+_NAME_PREFIX = re.compile(r"^(?:to|pay|payee(?:\s+is)?)\s+", re.IGNORECASE)
+
+
+def _months_before(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 - months
+    year, month = divmod(month_index, 12)
+    month += 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def parse_date_range(text: str, today: date = None) -> dict:
+    """'last 3 months' -> {"from", "to", "label", and "months" for month/year ranges}"""
+    today = today or date.today()
+    words = text.lower().split()
+
+    if words == ["today"]:
+        return {"from": today.isoformat(), "to": today.isoformat(), "label": text}
+    if words == ["yesterday"]:
+        day = today - timedelta(days=1)
+        return {"from": day.isoformat(), "to": day.isoformat(), "label": text}
+
+    unit = words[-1].rstrip("s")
+    if len(words) == 3:
+        # Rolling window ending today
+        n = int(words[1]) if words[1].isdigit() else NUMBER_WORDS[words[1]]
+        if unit == "day":
+            start = today - timedelta(days=n)
+        elif unit == "week":
+            start = today - timedelta(weeks=n)
+        else:
+            start = _months_before(today, n * (12 if unit == "year" else 1))
+        result = {"from": start.isoformat(), "to": today.isoformat(), "label": text}
+        if unit in ("month", "year"):
+            result["months"] = n * (12 if unit == "year" else 1)
+        return result
+
+    # "this <unit>" runs to today; "last/previous <unit>" is the previous calendar unit
+    current = words[0] == "this"
+    if unit == "day":
+        start = end = today if current else today - timedelta(days=1)
+    elif unit == "week":
+        start = today - timedelta(days=today.weekday()) - (timedelta(0) if current else timedelta(weeks=1))
+        end = today if current else start + timedelta(days=6)
+    elif unit == "month":
+        start = today.replace(day=1) if current else _months_before(today.replace(day=1), 1)
+        end = today if current else today.replace(day=1) - timedelta(days=1)
+    else:
+        start = date(today.year if current else today.year - 1, 1, 1)
+        end = today if current else date(today.year - 1, 12, 31)
+
+    result = {"from": start.isoformat(), "to": end.isoformat(), "label": text}
+    if unit in ("month", "year"):
+        result["months"] = 12 if unit == "year" else 1
+    return result
+
+
+def parse_amount(text: str, default_currency: str = "GBP"):
+    """'£1,250.50' -> ("1250.50", "GBP"); None if there is no number in it."""
+    marker = _CURRENCY.search(text)
+    currency = CURRENCIES[marker.group(0).lower()] if marker else default_currency
+
+    number = _AMOUNT.search(text)
+    if not number:
+        return None
+    try:
+        value = Decimal(number.group(0).replace(",", ""))
+    except InvalidOperation:
+        return None
+    if _THOUSANDS.search(text):
+        value *= 1000
+    return f"{value:.2f}", currency
+
+
+class SlotExtractor:
+
+    def __init__(self, payees=(), default_currency="GBP"):
+        self.default_currency = default_currency
+        # Lower-cased payee -> the name as listed
+        self.payees = {p.strip().lower(): p.strip() for p in payees if p and p.strip()}
+
+        alternatives = []
+        for name, pattern in _PATTERNS:
+            if name == "known_payee":
+                if not self.payees:
+                    continue
+                names = sorted(self.payees, key=len, reverse=True)
+                pattern = r"\b(?:" + "|".join(re.escape(p) for p in names) + r")\b"
+            alternatives.append(f"(?P<{name}>{pattern})")
+        # Slots only start where a word does (never after a letter or digit);
+        # this one check rejects mid-word positions before any alternative is tried
+        self._scanner = re.compile(r"(?<![^\W_])(?:" + "|".join(alternatives) + ")", re.IGNORECASE)
+
+    def extract(self, message: str, today: date = None) -> dict:
+        """Slots found in one pass over the message; the first value of each slot wins."""
+        slots = {}
+        bare_number = None
+
+        for match in self._scanner.finditer(message or ""):
+            kind, text = match.lastgroup, match.group(0)
+
+            if kind == "amount" and "amount" not in slots:
+                parsed = parse_amount(text, self.default_currency)
+                if parsed:
+                    slots["amount"], slots["currency"] = parsed
+            elif kind == "sort_code" and "sort_code" not in slots:
+                digits = "".join(_DIGITS.findall(text))
+                slots["sort_code"] = f"{digits[:2]}-{digits[2:4]}-{digits[4:6]}"
+            elif kind == "account" and "account" not in slots:
+                slots["account"] = text
+            elif kind == "known_payee" and "beneficiary" not in slots:
+                slots["beneficiary"] = self.payees[text.lower()]
+            elif kind == "named_payee" and "beneficiary" not in slots:
+                name = _NAME_PREFIX.sub("", text)
+                slots["beneficiary"] = self.payees.get(name.lower(), name)
+            elif kind == "date_range" and "date_range" not in slots:
+                slots["date_range"] = parse_date_range(text, today)
+                if "months" in slots["date_range"]:
+                    slots["months"] = slots["date_range"]["months"]
+            elif kind == "number" and bare_number is None:
+                bare_number = text
+
+        # A bare number is only taken as the amount when nothing else claimed one
+        if "amount" not in slots and bare_number is not None:
+            parsed = parse_amount(bare_number, self.default_currency)
+            if parsed:
+                slots["amount"], slots["currency"] = parsed
+        return slots
+
+
+_EXTRACTORS = {}
+_EXTRACTORS_LOCK = threading.Lock()
+
+
+def get_slot_extractor(payees=()) -> SlotExtractor:
+    """One compiled extractor per distinct payee list."""
+    key = tuple(sorted(payees or ()))
+    with _EXTRACTORS_LOCK:
+        extractor = _EXTRACTORS.get(key)
+        if extractor is None:
+            extractor = _EXTRACTORS[key] = SlotExtractor(key)
+        return extractor
+
+
+def extract_slots(message: str, payees=(), today: date = None) -> dict:
+    return get_slot_extractor(payees).extract(message, today)
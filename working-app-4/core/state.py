@@ -2,14 +2,35 @@ from typing import TypedDict, Optional, Dict, Any, List
 
 
 class AgentState(TypedDict, total=False):
-    # ===== runtime state ONLY =====
+    # ===== inputs read by nodes/start.py =====
+    agent_name: str
+    goal_id: str
+
+    # ===== input read by policies/daily_limit.py and tools/aem_payment.py =====
+    # the customer's account being debited (not the payee's "account" slot)
+    customer_account: str
+
+    # ===== runtime state =====
     agent_config: Dict[str, Any]
     goal_config: Dict[str, Any]
 
     plan: Optional[List[str]]
     missing_slots: Optional[List[str]]
+    collected_slots: Dict[str, Any]
+    # last_user_message the slot filler has already scanned
+    slots_filled_for: Optional[str]
 
     last_user_message: Optional[str]
     journey_status: Optional[str]
 
+    # daily_limit's hold on the amount, committed or released by the payment tool
+    spend_reservation: Optional[str]
+
+    # set by nodes/digression_detector.py
+    last_classification: Optional[str]
+    digression_detected: bool
+
     response: Optional[str]
+
+    # events appended by core.trace.append_trace (policy latencies etc.)
+    trace: List[Dict[str, Any]]
@@ -1,3 +1,6 @@
+import asyncio
+
+from core.digression_classifier import digression_stats
 from core.graph import build_agent_graph
 
 agent = build_agent_graph()
@@ -6,11 +9,15 @@ initial_state = {
     # 👇 REQUIRED INPUTS (NOT part of AgentState)
     "agent_name": "payment_agent.yaml",   # or "payment_agent.yaml"
     "goal_id": "make_payment",
+    # the customer's own account, debited by the payment
+    "customer_account": "12345678",
 
     # 👇 first user message
     "last_user_message": "Send £50 to John"
 }
 print("INITIAL STATE:", initial_state)
-result = agent.invoke(initial_state)
+# The policy executor is an async node, so the graph runs with ainvoke
+result = asyncio.run(agent.ainvoke(initial_state))
 
 print("\nFINAL RESULT:\n", result)
+print("\nDIGRESSION CLASSIFIER:", digression_stats())
@@ -1,49 +1,37 @@
-from langchain_community.chat_models import ChatOllama
-from langchain_core.messages import SystemMessage, HumanMessage
+import time
 
+from core import config
+from core.digression_classifier import CLASSIFIER, prompt_template
 from core.state import AgentState
-from core.prompt_loader import load_prompt
-from core.llm_factory import get_llm
-llm = get_llm()
+from core.trace import append_trace
 
 
-# def digression_detector_node(state: AgentState) -> AgentState:
-#     prompt = load_prompt(
-#         state["agent_config"]["prompts"]["digression_classifier"],
-#         {
-#             "goal_description": state["goal_config"]["description"],
-#             "required_slots": state["required_slots"],
-#             "missing_slots": state["missing_slots"],
-#             "user_message": state["last_user_message"],
-#         }
-#     )
+def digression_detector_node(state: AgentState) -> AgentState:
+    message = state.get("last_user_message")
 
-#     response = llm.invoke([
-#         SystemMessage(content="Classify only. No explanation."),
-#         HumanMessage(content=prompt),
-#     ])
-
-#     classification = response.content.strip()
-
-#     if classification == "DIGRESSION":
-#         state["digression_detected"] = True
-#     else:
-#         state["digression_detected"] = False
-
-#     state["last_classification"] = classification
-
-#     return state
-def digression_detector_node(state):
-    prompts = state["agent_config"].get("prompts", {})
-
-    digression_prompt = prompts.get("digression_classifier")
-
-    # ✅ If no digression prompt defined, skip detection
-    if not digression_prompt:
+    if not config.ENABLE_DIGRESSION_DETECTION or not message:
         state["digression_detected"] = False
         return state
 
-    # (Later you can plug LLM logic here)
-    # For now keep it deterministic
-    state["digression_detected"] = False
+    goal = state.get("goal_config") or {}
+    started = time.perf_counter()
+
+    # Confident turns are classified locally; only ambiguous ones reach the LLM
+    classification, source, confidence = CLASSIFIER.classify(
+        message,
+        goal_description=goal.get("description", ""),
+        required_slots=goal.get("required_slots", []),
+        missing_slots=state.get("missing_slots") or [],
+        prompt_template=prompt_template(state["agent_config"]),
+    )
+
+    state["last_classification"] = classification
+    state["digression_detected"] = classification == "DIGRESSION"
+
+    append_trace(state, "digression_check", {
+        "classification": classification,
+        "source": source,
+        "confidence": round(confidence, 3),
+        "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+    })
     return state
@@ -6,15 +6,17 @@ def execution_node(state: AgentState):
         raise RuntimeError("Execution called before planner set goal_config")
 
     required = state["goal_config"]["required_slots"]
-    filled = state.get("slots", {})
+    filled = state.get("collected_slots") or {}
 
     missing = [s for s in required if s not in filled]
 
     if missing:
+        # Once this message has been through the slot filler, ask the user for the rest
+        scanned = "slots_filled_for" in state and state["slots_filled_for"] == state.get("last_user_message")
         return {
             **state,
             "missing_slots": missing,
-            "journey_status": "collecting_info",
+            "journey_status": "awaiting_user_input" if scanned else "collecting_info",
         }
 
     return {
@@ -1,24 +1,171 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+from core import config
 from core.state import AgentState
-from policies.registry import POLICY_REGISTRY
+from core.trace import append_trace
+from policies.registry import POLICY_REGISTRY, POLICY_SETTINGS
+from policies.spend_tracker import get_spend_tracker
 
 class PolicyViolation(Exception):
-    def __init__(self, policy_name: str):
-        super().__init__(f"Policy violation: {policy_name}")
+    def __init__(self, policy_name: str, reason: str = "violated"):
+        super().__init__(f"Policy violation: {policy_name}" + ("" if reason == "violated" else f" ({reason})"))
         self.policy_name = policy_name
+        self.reason = reason
+
+
+class PolicyResultCache:
+    """Results of deterministic policies keyed by request fingerprint (LRU + TTL)."""
+
+    def __init__(self, ttl_seconds, max_entries):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # fingerprint -> (expires_at, passed)
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint):
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[fingerprint]
+                return None
+            self._entries.move_to_end(fingerprint)
+            return entry[1]
+
+    def put(self, fingerprint, passed):
+        with self._lock:
+            self._entries[fingerprint] = (time.monotonic() + self.ttl_seconds, passed)
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+RESULT_CACHE = PolicyResultCache(config.POLICY_CACHE_TTL_SECONDS, config.POLICY_CACHE_MAX_ENTRIES)
+
+# Sync policies run on this long-lived pool, not asyncio's default executor:
+# the event loop joins its default executor on shutdown, which would hold the
+# node until a timed-out or cancelled policy's thread finished anyway
+POLICY_EXECUTOR = ThreadPoolExecutor(max_workers=config.POLICY_EXECUTOR_WORKERS, thread_name_prefix="policy")
+
+
+def enabled_policies(policies) -> list:
+    """Policy names from agent config: a list of names, or a mapping of name -> {enabled: bool}."""
+    if isinstance(policies, Mapping):
+        return [
+            name for name, settings in policies.items()
+            if not isinstance(settings, Mapping) or settings.get("enabled", True)
+        ]
+    return list(policies or [])
 
 
-def policy_executor_node(state: AgentState) -> AgentState:
-    policies = state["agent_config"].get("policies", [])
+def fingerprint(policy_name: str, state: AgentState, inputs=None) -> str:
+    slots = state.get("collected_slots") or {}
+    if inputs is not None:
+        slots = {k: slots.get(k) for k in inputs}
+    payload = json.dumps({"policy": policy_name, "slots": slots}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-    for policy_name in policies:
-        policy_fn = POLICY_REGISTRY.get(policy_name)
 
-        if not policy_fn:
+async def _run_policy(policy_name, policy_fn, state, settings):
+    """Returns (passed, outcome, latency_ms, cached). Never raises except on cancellation."""
+    started = time.perf_counter()
+
+    key = None
+    if settings.get("deterministic"):
+        key = fingerprint(policy_name, state, settings.get("inputs"))
+        cached = RESULT_CACHE.get(key)
+        if cached is not None:
+            return cached, "passed" if cached else "violated", 0.0, True
+
+    timeout = settings.get("timeout", config.POLICY_TIMEOUT_SECONDS)
+    fail_open = settings.get("failure_mode", config.POLICY_FAILURE_MODE) == "fail_open"
+
+    try:
+        if asyncio.iscoroutinefunction(policy_fn):
+            passed = await asyncio.wait_for(policy_fn(state), timeout)
+        else:
+            # Sync policies are blocking I/O calls; keep them off the event loop
+            loop = asyncio.get_running_loop()
+            passed = await asyncio.wait_for(loop.run_in_executor(POLICY_EXECUTOR, policy_fn, state), timeout)
+        passed = bool(passed)
+        outcome = "passed" if passed else "violated"
+        if key is not None:
+            RESULT_CACHE.put(key, passed)
+    except asyncio.TimeoutError:
+        passed, outcome = fail_open, "timeout"
+    except Exception as e:
+        print(f"[PolicyExecutor] {policy_name} failed: {e}")
+        passed, outcome = fail_open, "error"
+
+    return passed, outcome, (time.perf_counter() - started) * 1000, False
+
+
+async def run_policies(state: AgentState) -> AgentState:
+    """
+    Runs every enabled policy concurrently. The first violation (or timeout /
+    error of a fail-closed policy) cancels the others and raises
+    PolicyViolation. Each policy's outcome and latency go into the trace.
+    """
+    names = enabled_policies(state["agent_config"].get("policies", []))
+
+    for policy_name in names:
+        if policy_name not in POLICY_REGISTRY:
             raise ValueError(f"Unknown policy: {policy_name}")
 
-        passed = policy_fn(state)
+    tasks = {
+        asyncio.ensure_future(
+            _run_policy(name, POLICY_REGISTRY[name], state, POLICY_SETTINGS.get(name, {}))
+        ): name
+        for name in names
+    }
+
+    started = time.perf_counter()
+    violation = None
+    try:
+        pending = set(tasks)
+        while pending and violation is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                policy_name = tasks[task]
+                passed, outcome, latency_ms, cached = task.result()
+                append_trace(state, "policy_check", {
+                    "policy": policy_name,
+                    "outcome": outcome,
+                    "passed": passed,
+                    "latency_ms": round(latency_ms, 2),
+                    "cached": cached,
+                })
+                if not passed and violation is None:
+                    violation = PolicyViolation(policy_name, outcome)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+                append_trace(state, "policy_check", {"policy": tasks[task], "outcome": "cancelled"})
 
-        if not passed:
-            raise PolicyViolation(policy_name)
+    append_trace(state, "policies_completed", {
+        "policies": names,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        "violation": violation.policy_name if violation else None,
+    })
 
+    if violation:
+        # The payment will not run, so give back any amount daily_limit held for it
+        if state.get("spend_reservation"):
+            get_spend_tracker().release(state.pop("spend_reservation"))
+        violation.trace = state.get("trace", [])
+        raise violation
     return state
+
+
+async def apolicy_executor_node(state: AgentState) -> AgentState:
+    # Async node: the graph has to be run with ainvoke()
+    return await run_policies(state)
@@ -17,7 +17,7 @@ def replanner_node(state: AgentState) -> AgentState:
             **state,
             "plan": [],
             "collected_slots": {},
-            "missing_slots": state["required_slots"].copy(),
+            "missing_slots": list(state["goal_config"]["required_slots"]),
             "journey_status": "planning",
             "digression_detected": False
         }
@@ -1,5 +1,4 @@
 import json
-from langchain_community.chat_models import ChatOllama
 from langchain_core.messages import SystemMessage, HumanMessage
 
 from core.state import AgentState
@@ -1,15 +1,19 @@
+from core import config
+from core.slot_extractor import extract_slots
 from core.state import AgentState
 
-def slot_filler_node(state):
+def slot_filler_node(state: AgentState) -> AgentState:
+    message = state.get("last_user_message")
+    # Lets execution tell "not scanned yet" from "scanned, still missing"
+    state["slots_filled_for"] = message
+
     # First turn — nothing to fill yet
-    if not state.get("last_user_message"):
+    if not message:
         return state
 
-    user_input = state["last_user_message"].lower()
-
-    # Example slot filling logic (stub)
-    if "amount" in user_input:
-        state["collected_slots"]["amount"] = "parsed_amount"
+    payees = list(state["agent_config"].get("known_payees", [])) + config.KNOWN_PAYEES
+    found = extract_slots(message, payees)
 
+    # Values in the new message replace earlier ones (e.g. a corrected amount)
+    state["collected_slots"] = {**(state.get("collected_slots") or {}), **found}
     return state
-
@@ -1,4 +1,27 @@
+from core import config
 from core.state import AgentState
+from policies.sanctions_index import get_sanctions_index
 
 def aml_check(state: AgentState) -> bool:
+    if not config.SANCTIONS_INDEX_PATH:
+        return True  # no watch list configured
+
+    slots = state.get("collected_slots") or {}
+    index = get_sanctions_index(config.SANCTIONS_INDEX_PATH)
+
+    for field in ("beneficiary", "payee", "payee_name", "recipient"):
+        name = slots.get(field)
+        if name:
+            matches = index.search(str(name), threshold=config.SANCTIONS_MATCH_THRESHOLD, limit=1)
+            if matches:
+                print(f"[aml_check] {field} {name!r} matches watch-list entry {matches[0].to_dict()}")
+                return False
+
+    reference = slots.get("reference")
+    if reference:
+        matches = index.scan(str(reference))
+        if matches:
+            print(f"[aml_check] reference mentions watch-list entry {matches[0].to_dict()}")
+            return False
+
     return True
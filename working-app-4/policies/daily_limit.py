@@ -1,4 +1,30 @@
+from core import config
 from core.state import AgentState
+from policies.spend_tracker import get_spend_tracker
 
 def daily_limit(state: AgentState) -> bool:
-    return True
+    # Keyed on the debited customer account, not the payee's "account" slot,
+    # so splitting a payment across payees does not get round the limit
+    account = state.get("customer_account")
+    amount = (state.get("collected_slots") or {}).get("amount")
+
+    if not account or amount is None:
+        print("[daily_limit] customer account or amount missing; cannot check the daily limit")
+        return False
+
+    tracker = get_spend_tracker()
+    # A retried check replaces its earlier hold rather than adding to it
+    if state.get("spend_reservation"):
+        tracker.release(state["spend_reservation"])
+
+    try:
+        # Check and hold in one step so concurrent payments cannot both pass;
+        # execute_payment commits or releases the hold
+        token = tracker.reserve(str(account), amount, config.MAX_DAILY_TRANSACTION_AMOUNT,
+                                ttl=config.SPEND_RESERVATION_SECONDS)
+    except ValueError as e:
+        print(f"[daily_limit] {e}")
+        return False
+
+    state["spend_reservation"] = token
+    return token is not None
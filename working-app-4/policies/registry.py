@@ -2,8 +2,25 @@ from policies.sufficient_balance import sufficient_balance
 from policies.daily_limit import daily_limit
 from policies.aml import aml_check
 
+# Policies may be plain functions or `async def`; both take the state and return bool
 POLICY_REGISTRY = {
     "sufficient_balance": sufficient_balance,
     "daily_limit": daily_limit,
     "aml_check": aml_check,
 }
+
+# Per-policy execution settings (see nodes/policy_executor.py):
+#   timeout        seconds before the policy counts as timed out (POLICY_TIMEOUT_SECONDS)
+#   failure_mode   "fail_closed" blocks the payment on timeout/error, "fail_open" lets it through
+#   deterministic  same inputs always give the same answer, so the result is cached
+#   inputs         collected_slots that make up the cache fingerprint (all slots if omitted)
+POLICY_SETTINGS = {
+    "sufficient_balance": {"timeout": 1.0, "failure_mode": "fail_closed", "deterministic": False},
+    "daily_limit": {"timeout": 1.0, "failure_mode": "fail_closed", "deterministic": False},
+    "aml_check": {
+        "timeout": 2.0,
+        "failure_mode": "fail_closed",
+        "deterministic": True,
+        "inputs": ["beneficiary", "payee", "payee_name", "recipient", "reference"],
+    },
+}
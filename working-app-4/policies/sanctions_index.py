@@ -0,0 +1,457 @@
+"""
+Sanctions / watch-list screening index.
+
+`build_index` compiles a list of names into one binary file holding:
+  - the entries: original name, source and normalized tokens
+  - each entry's character trigrams (32-bit hashes, sorted) for scoring
+  - the token vocabulary with one-edit deletion keys, so a query token finds
+    the listed tokens within one typo of it, and each token's entries
+  - a token-level Aho-Corasick automaton over every entry's token sequence,
+    for scanning free text such as payment references
+
+Every table is a sorted array searched with bisect, so `SanctionsIndex`
+just mmaps the file: nothing is parsed or copied at load time, and all
+worker processes on a host share the same pages through the OS page cache.
+
+    python -m policies.sanctions_index build sanctions.txt sanctions.idx
+
+The input has one entry per line: `name` or `name<TAB>source`.
+"""
+import gc
+import hashlib
+import json
+import math
+import mmap
+import os
+import re
+import sys
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+MAGIC = b"SANCTIX1"
+MASK64 = (1 << 64) - 1
+TOKEN_BITS = 24  # deletion keys pack a 40-bit hash with a 24-bit token id
+TYPO_PENALTY = 0.05  # score lost per token that only matches within one edit
+
+# Honorifics and joining words carry no identity
+STOPWORDS = frozenset({"mr", "mrs", "ms", "miss", "dr", "the", "of", "and", "al", "el", "bin", "ibn"})
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(name: str) -> str:
+    """'Dr. José  AL-Hassan' -> 'jose hassan'"""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join(t for t in _NON_ALNUM.sub(" ", text).split() if t not in STOPWORDS)
+
+
+def trigrams(normalized: str) -> set:
+    # Per-token padding makes the set independent of token order
+    grams = set()
+    for token in normalized.split():
+        padded = f" {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def deletions(token: str) -> set:
+    """The token and every one-character deletion of it (short tokens match exactly)."""
+    if len(token) < 4:
+        return {token}
+    return {token} | {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    return a == b or not deletions(a).isdisjoint(deletions(b))
+
+
+def token_typos(query_tokens, entry_tokens):
+    """
+    How many query tokens only match an entry token within one edit, when
+    the tokens pair up one to one (exact pairs first); None if they do not.
+    """
+    if len(query_tokens) != len(entry_tokens):
+        return None
+    remaining = list(entry_tokens)
+    typos = 0
+    for token in sorted(query_tokens, key=lambda t: t not in remaining):
+        if token in remaining:
+            remaining.remove(token)
+            continue
+        for i, other in enumerate(remaining):
+            if within_one_edit(token, other):
+                del remaining[i]
+                typos += 1
+                break
+        else:
+            return None
+    return typos
+
+
+def h64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _h32(text: str) -> int:
+    return h64(text) & 0xFFFFFFFF
+
+
+def _ac_key(state: int, token_hash: int) -> int:
+    return (((state + 1) * 0x9E3779B97F4A7C15) & MASK64) ^ token_hash
+
+
+class ScreeningMatch:
+    __slots__ = ("entry_id", "name", "source", "score", "kind")
+
+    def __init__(self, entry_id, name, source, score, kind):
+        self.entry_id = entry_id
+        self.name = name
+        self.source = source
+        self.score = score
+        self.kind = kind  # exact | fuzzy | text
+
+    def to_dict(self):
+        return {"entry_id": self.entry_id, "name": self.name, "source": self.source,
+                "score": round(self.score, 4), "kind": self.kind}
+
+    def __repr__(self):
+        return f"ScreeningMatch({self.name!r}, score={self.score:.3f}, kind={self.kind})"
+
+
+# --------------------
+# Build
+# --------------------
+def build_index(records, path):
+    """records: iterable of name or (name, source). Returns the number of entries written."""
+    enabled = gc.isenabled()
+    gc.disable()  # millions of small, acyclic objects
+    try:
+        return _build(records, path)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _build(records, path):
+    entry_offsets = array("Q", [0])
+    blob = bytearray()
+    gram_offsets = array("Q", [0])
+    grams = array("I")
+    gram_hashes = {}
+
+    vocab = {}           # token -> token id
+    token_entries = []   # token id -> entry ids
+    token_hashes = []    # token id -> h64, reused by the automaton
+
+    goto = {}  # (state, token_hash) -> state
+    outputs = defaultdict(list)
+    states = 1
+
+    entry_id = 0
+    for record in records:
+        name, source = (record, "") if isinstance(record, str) else (record[0], record[1] if len(record) > 1 else "")
+        norm = normalize(name)
+        if not norm:
+            continue
+
+        blob += f"{name}\x1f{source}\x1f{norm}".encode("utf-8")
+        entry_offsets.append(len(blob))
+
+        hashed = []
+        for gram in trigrams(norm):
+            h = gram_hashes.get(gram)
+            if h is None:
+                h = gram_hashes[gram] = _h32(gram)
+            hashed.append(h)
+        grams.extend(sorted(hashed))
+        gram_offsets.append(len(grams))
+
+        state = 0
+        seen = set()
+        for token in norm.split():
+            token_id = vocab.get(token)
+            if token_id is None:
+                token_id = vocab[token] = len(token_entries)
+                token_entries.append([])
+                token_hashes.append(h64(token))
+            if token_id not in seen:
+                token_entries[token_id].append(entry_id)
+                seen.add(token_id)
+
+            h = token_hashes[token_id]
+            nxt = goto.get((state, h))
+            if nxt is None:
+                nxt = goto[(state, h)] = states
+                states += 1
+            state = nxt
+        outputs[state].append(entry_id)
+        entry_id += 1
+    del gram_hashes
+
+    if len(token_entries) >= 1 << TOKEN_BITS:
+        raise ValueError(f"more than {1 << TOKEN_BITS} distinct tokens")
+
+    # Deletion keys: (40-bit hash of a deletion variant, token id), packed and sorted
+    del_keys = array("Q", sorted(
+        (h64(variant) >> TOKEN_BITS) << TOKEN_BITS | token_id
+        for token, token_id in vocab.items()
+        for variant in deletions(token)
+    ))
+    del vocab
+
+    tok_offsets = array("Q", [0])
+    tok_ids = array("I")
+    for ids in token_entries:
+        tok_ids.extend(ids)
+        tok_offsets.append(len(tok_ids))
+    del token_entries
+
+    # Failure links, breadth first so every parent's link is known first
+    children = defaultdict(list)
+    for (state, h), child in goto.items():
+        children[state].append((h, child))
+
+    fail = array("I", bytes(4 * states))
+    queue = [child for _, child in children[0]]
+    head = 0
+    while head < len(queue):
+        state = queue[head]
+        head += 1
+        for h, child in children.get(state, ()):
+            f = fail[state]
+            while f and (f, h) not in goto:
+                f = fail[f]
+            target = goto.get((f, h), 0)
+            fail[child] = target if target != child else 0
+            queue.append(child)
+    del children, queue
+
+    ac_items = sorted((_ac_key(state, h), child) for (state, h), child in goto.items())
+    del goto
+    ac_keys = array("Q", (k for k, _ in ac_items))
+    ac_next = array("I", (c for _, c in ac_items))
+    del ac_items
+
+    out_offsets = array("I", [0])
+    out_ids = array("I")
+    for state in range(states):
+        out_ids.extend(outputs.get(state, ()))
+        out_offsets.append(len(out_ids))
+
+    sections = [
+        ("entry_offsets", entry_offsets), ("entries", array("B", blob)),
+        ("gram_offsets", gram_offsets), ("grams", grams),
+        ("del_keys", del_keys), ("tok_offsets", tok_offsets), ("tok_ids", tok_ids),
+        ("ac_keys", ac_keys), ("ac_next", ac_next), ("ac_fail", fail),
+        ("ac_out_offsets", out_offsets), ("ac_out_ids", out_ids),
+    ]
+
+    header = {"version": 1, "byteorder": sys.byteorder, "entries": entry_id, "states": states, "sections": {}}
+    # Section offsets are known once the header size is: reserve a fixed block for it
+    header_size = 4096
+    position = len(MAGIC) + 8 + header_size
+    for name, data in sections:
+        position += -position % 8
+        header["sections"][name] = [position, len(data), data.typecode]
+        position += len(data) * data.itemsize
+
+    encoded = json.dumps(header).encode("utf-8").ljust(header_size)
+    # Workers may have the current index mmapped: truncating it in place would
+    # SIGBUS them, so write a new file and rename it over the old one
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(encoded).to_bytes(8, "little"))
+        f.write(encoded)
+        for name, data in sections:
+            f.write(b"\0" * (header["sections"][name][0] - f.tell()))
+            data.tofile(f)
+    os.replace(tmp_path, path)
+
+    return entry_id
+
+
+# --------------------
+# Query
+# --------------------
+class SanctionsIndex:
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        stat = os.fstat(self._file.fileno())
+        self.version = (stat.st_ino, stat.st_mtime_ns)
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a sanctions index")
+        header_len = int.from_bytes(self._mm[len(MAGIC):len(MAGIC) + 8], "little")
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(self._mm[start:start + header_len]))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was built on a {header['byteorder']}-endian host")
+
+        self.entries = header["entries"]
+        view = memoryview(self._mm)
+        self._views = [view]
+        for name, (offset, count, typecode) in header["sections"].items():
+            size = array(typecode).itemsize
+            section = view[offset:offset + count * size].cast(typecode)
+            self._views.append(section)
+            setattr(self, "_" + name, section)
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._mm.close()
+        self._file.close()
+
+    def entry(self, entry_id):
+        """(name, source, normalized) for an entry id."""
+        start, end = self._entry_offsets[entry_id], self._entry_offsets[entry_id + 1]
+        return bytes(self._entries[start:end]).decode("utf-8").split("\x1f")
+
+    def _similar_tokens(self, token):
+        """Ids of listed tokens within one edit of `token` (plus rare 40-bit hash collisions)."""
+        keys = self._del_keys
+        found = set()
+        for variant in deletions(token):
+            prefix = h64(variant) >> TOKEN_BITS
+            i = bisect_left(keys, prefix << TOKEN_BITS)
+            while i < len(keys) and keys[i] >> TOKEN_BITS == prefix:
+                found.add(keys[i] & ((1 << TOKEN_BITS) - 1))
+                i += 1
+        return found
+
+    def search(self, name: str, threshold: float = 0.85, limit: int = 10) -> list:
+        """
+        Entries whose name has a Dice score (over token trigrams) of at least
+        `threshold` against `name`, best first. The same tokens in any order
+        are an exact match (score 1.0). Tokens that pair up one to one, each
+        exact or within one edit, score 1 - TYPO_PENALTY per typo instead when
+        that is higher: one typo costs a short name too many trigrams.
+
+        Candidates are the entries holding a token within one edit of a query
+        token. Tokens are probed rarest first, and only until the tokens left
+        hold too few trigrams to reach the threshold on their own, so a common
+        given name next to a rare family name is never expanded.
+        """
+        norm = normalize(name)
+        if not norm:
+            return []
+
+        query_grams = {_h32(g) for g in trigrams(norm)}
+        a = len(query_grams)
+        # Dice(A, B) >= t needs an overlap of t|A|/(2-t) and |B| within [t|A|/(2-t), (2-t)|A|/t]
+        lo = math.ceil(threshold * a / (2 - threshold) - 1e-9)
+
+        tok_offsets, tok_ids = self._tok_offsets, self._tok_ids
+        tokens = []
+        for token in dict.fromkeys(norm.split()):
+            lists = [tok_ids[tok_offsets[t]:tok_offsets[t + 1]] for t in self._similar_tokens(token)]
+            tokens.append((sum(len(ids) for ids in lists), token, lists))
+        tokens.sort(key=lambda item: item[0])
+
+        candidates = set()
+        remaining = sum(len(token) for _, token, _ in tokens)  # a token of n chars has n trigrams
+        for _, token, lists in tokens:
+            if remaining < lo:
+                break
+            for ids in lists:
+                candidates.update(ids)
+            remaining -= len(token)
+
+        # Candidates this far under the threshold on trigrams get no token check
+        floor = max(threshold - 0.35, 0.1)
+        query_tokens = norm.split()
+        gram_offsets, grams = self._gram_offsets, self._grams
+        scores = []
+        for entry_id in candidates:
+            start, end = gram_offsets[entry_id], gram_offsets[entry_id + 1]
+            b = end - start
+            if b < floor * a / (2 - floor) or b > (2 - floor) * a / floor:
+                continue
+            score = 2 * len(query_grams.intersection(grams[start:end])) / (a + b)
+            if floor <= score < threshold:
+                typos = token_typos(query_tokens, self.entry(entry_id)[2].split())
+                if typos is not None:
+                    score = max(score, 1 - TYPO_PENALTY * typos)
+            if score >= threshold:
+                scores.append((score, entry_id))
+
+        matches = []
+        for score, entry_id in sorted(scores, key=lambda item: (-item[0], item[1]))[:limit]:
+            name, source, entry_norm = self.entry(entry_id)
+            if set(entry_norm.split()) == set(query_tokens):
+                matches.append(ScreeningMatch(entry_id, name, source, 1.0, "exact"))
+            else:
+                matches.append(ScreeningMatch(entry_id, name, source, min(score, 0.999), "fuzzy"))
+        matches.sort(key=lambda m: -m.score)
+        return matches
+
+    def scan(self, text: str) -> list:
+        """Entries whose full (normalized) name appears inside free text, e.g. a payment reference."""
+        state = 0
+        found = {}
+        keys, nxt, fail = self._ac_keys, self._ac_next, self._ac_fail
+        out_offsets, out_ids = self._ac_out_offsets, self._ac_out_ids
+
+        for token in normalize(text).split():
+            h = h64(token)
+            while True:
+                key = _ac_key(state, h)
+                i = bisect_left(keys, key)
+                if i < len(keys) and keys[i] == key:
+                    state = nxt[i]
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+
+            s = state
+            while s:
+                for entry_id in out_ids[out_offsets[s]:out_offsets[s + 1]]:
+                    found[entry_id] = None
+                s = fail[s]
+
+        matches = []
+        for entry_id in found:
+            name, source, _ = self.entry(entry_id)
+            matches.append(ScreeningMatch(entry_id, name, source, 1.0, "text"))
+        return matches
+
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_sanctions_index(path):
+    """The index at `path`, reopened once a rebuild has replaced the file."""
+    global _INDEX
+
+    stat = os.stat(path)
+    with _INDEX_LOCK:
+        if _INDEX is None or _INDEX.path != path or _INDEX.version != (stat.st_ino, stat.st_mtime_ns):
+            # The old index is left to the garbage collector: other threads may still be searching it
+            _INDEX = SanctionsIndex(path)
+        return _INDEX
+
+
+def _read_list(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.strip():
+                yield tuple(line.split("\t", 1))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != "build":
+        print("usage: python -m policies.sanctions_index build <list.txt> <index.idx>")
+        sys.exit(2)
+    count = build_index(_read_list(sys.argv[2]), sys.argv[3])
+    print(f"[SanctionsIndex] wrote {count} entries to {sys.argv[3]}")
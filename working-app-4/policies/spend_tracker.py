@@ -0,0 +1,334 @@
+import gc
+import json
+import os
+import threading
+import time
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from core import config
+
+
+def to_pence(amount) -> int:
+    """'£1,250.50', '50', 50.5 -> integer minor units. Raises ValueError if unparsable."""
+    if isinstance(amount, int) and not isinstance(amount, bool):
+        return amount * 100
+    if isinstance(amount, float):
+        return round(amount * 100)
+    text = str(amount).strip().replace(",", "").lstrip("£$€").strip()
+    try:
+        return int((Decimal(text) * 100).to_integral_value())
+    except InvalidOperation:
+        raise ValueError(f"Not an amount: {amount!r}")
+
+
+class _Window:
+    """Spend per time bucket for one account, oldest first. Only buckets with spend are stored."""
+    __slots__ = ("total", "epochs", "amounts")
+
+    def __init__(self):
+        self.total = 0
+        self.epochs = []
+        self.amounts = []
+
+
+class SpendTracker:
+    """
+    Rolling-window spend per account.
+
+    Each account keeps its spend in time buckets of `bucket_seconds` (at
+    most `window_seconds / bucket_seconds` of them, and only the ones it
+    actually spent in) plus a running total. record() and total() are O(1):
+    buckets that fall out of the window are subtracted as it slides.
+
+    Every record is appended to `log_path`. snapshot() rotates the log,
+    copies the windows under the lock and writes them to `snapshot_path`
+    outside it, so recording carries on while a large snapshot is encoded.
+    On start the snapshot is loaded and the logs are replayed; records are
+    sequence-numbered, so a crash at any point never double counts.
+
+    reserve() checks the limit and holds the amount in one step, so two
+    concurrent payments cannot both pass on the same headroom; commit()
+    turns the hold into spend and release() drops it. Holds are in memory
+    only and lapse after their ttl if neither is called.
+    """
+
+    def __init__(self, window_seconds=24 * 3600, bucket_seconds=300, log_path=None, snapshot_path=None,
+                 snapshot_every=100000):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.buckets = max(1, int(window_seconds // bucket_seconds))
+        self.log_path = log_path
+        self.snapshot_path = snapshot_path
+        self.snapshot_every = snapshot_every
+
+        self._accounts = {}
+        self._reservations = {}  # token -> (account, pence, expires_at)
+        self._reserved = {}      # account -> pence held by live reservations
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._since_snapshot = 0
+        self._log = None
+
+        self._without_gc(self._restore)
+        if self.log_path:
+            self._log = open(self.log_path, "a", encoding="utf-8")
+
+    # --------------------
+    # Window maintenance
+    # --------------------
+    def _slide(self, window, epoch):
+        # Drop buckets that are no longer inside (epoch - buckets, epoch]
+        oldest = epoch - self.buckets + 1
+        expired = 0
+        while expired < len(window.epochs) and window.epochs[expired] < oldest:
+            window.total -= window.amounts[expired]
+            expired += 1
+        if expired:
+            del window.epochs[:expired]
+            del window.amounts[:expired]
+
+    def _apply(self, account, pence, ts):
+        epoch = int(ts // self.bucket_seconds)
+        window = self._accounts.get(account)
+        if window is None:
+            window = self._accounts[account] = _Window()
+
+        self._slide(window, epoch)
+        if window.epochs and window.epochs[-1] == epoch:
+            window.amounts[-1] += pence
+        elif not window.epochs or window.epochs[-1] < epoch:
+            window.epochs.append(epoch)
+            window.amounts.append(pence)
+        else:
+            # Late event (e.g. replayed out of order): merge into its bucket
+            for i in range(len(window.epochs) - 1, -1, -1):
+                if window.epochs[i] == epoch:
+                    window.amounts[i] += pence
+                    break
+                if window.epochs[i] < epoch:
+                    window.epochs.insert(i + 1, epoch)
+                    window.amounts.insert(i + 1, pence)
+                    break
+            else:
+                if epoch <= window.epochs[-1] - self.buckets:
+                    return  # already outside the window
+                window.epochs.insert(0, epoch)
+                window.amounts.insert(0, pence)
+        window.total += pence
+
+    # --------------------
+    # Public API
+    # --------------------
+    def _record_locked(self, account, pence, ts):
+        self._apply(account, pence, ts)
+        self._seq += 1
+        if self._log:
+            self._log.write(f"{self._seq}\t{ts:.3f}\t{account}\t{pence}\n")
+            self._log.flush()
+
+        self._since_snapshot += 1
+        due = self.snapshot_every and self._since_snapshot >= self.snapshot_every and self.snapshot_path
+        return self._capture_locked() if due else None
+
+    def record(self, account: str, amount, ts: float = None):
+        pence = to_pence(amount)
+        ts = time.time() if ts is None else ts
+
+        with self._lock:
+            state = self._record_locked(account, pence, ts)
+        if state:
+            self._write_snapshot(state)
+
+    def _total_locked(self, account, ts):
+        window = self._accounts.get(account)
+        if window is None:
+            return 0
+        self._slide(window, int(ts // self.bucket_seconds))
+        if not window.epochs:
+            del self._accounts[account]
+            return 0
+        return window.total
+
+    def total_pence(self, account: str, ts: float = None) -> int:
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            return self._total_locked(account, ts)
+
+    def total(self, account: str, ts: float = None) -> float:
+        return self.total_pence(account, ts) / 100
+
+    def would_exceed(self, account: str, amount, limit, ts: float = None) -> bool:
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self._expire_reservations(ts)
+            held = self._total_locked(account, ts) + self._reserved.get(account, 0)
+        return held + to_pence(amount) > to_pence(limit)
+
+    # --------------------
+    # Reservations
+    # --------------------
+    def _drop_reservation(self, token):
+        entry = self._reservations.pop(token, None)
+        if entry:
+            account, pence, _ = entry
+            left = self._reserved[account] - pence
+            if left:
+                self._reserved[account] = left
+            else:
+                del self._reserved[account]
+        return entry
+
+    def _expire_reservations(self, now):
+        for token in [t for t, (_, _, expires_at) in self._reservations.items() if expires_at <= now]:
+            self._drop_reservation(token)
+
+    def reserve(self, account: str, amount, limit, ttl: float = 300, ts: float = None):
+        """Hold `amount` if spend plus holds stays within `limit`. Returns a token, or None if it would exceed."""
+        pence = to_pence(amount)
+        ts = time.time() if ts is None else ts
+
+        with self._lock:
+            self._expire_reservations(ts)
+            held = self._total_locked(account, ts) + self._reserved.get(account, 0)
+            if held + pence > to_pence(limit):
+                return None
+            token = uuid.uuid4().hex
+            self._reservations[token] = (account, pence, ts + ttl)
+            self._reserved[account] = self._reserved.get(account, 0) + pence
+            return token
+
+    def commit(self, token, account: str, amount, ts: float = None):
+        """Record a completed payment and drop its hold (recorded even if the hold has lapsed)."""
+        pence = to_pence(amount)
+        ts = time.time() if ts is None else ts
+
+        with self._lock:
+            self._drop_reservation(token)
+            state = self._record_locked(account, pence, ts)
+        if state:
+            self._write_snapshot(state)
+
+    def release(self, token):
+        """Drop a hold without recording spend, e.g. when the payment failed."""
+        with self._lock:
+            return self._drop_reservation(token) is not None
+
+    def accounts(self) -> int:
+        return len(self._accounts)
+
+    # --------------------
+    # Persistence
+    # --------------------
+    def snapshot(self):
+        if not self.snapshot_path:
+            with self._lock:
+                self._since_snapshot = 0
+            return
+
+        with self._lock:
+            state = self._capture_locked()
+        self._write_snapshot(state)
+
+    def _without_gc(self, fn):
+        # Copying or loading millions of small lists otherwise triggers
+        # repeated full collections over the whole (acyclic) account table
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return fn()
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _capture_locked(self):
+        return self._without_gc(self._capture)
+
+    def _capture(self):
+        self._since_snapshot = 0
+        if self._log:
+            # Records from here on go to a fresh log; the rotated one is
+            # deleted once the snapshot that covers it is on disk
+            self._log.close()
+            os.replace(self.log_path, self.log_path + ".1")
+            self._log = open(self.log_path, "a", encoding="utf-8")
+
+        epoch = int(time.time() // self.bucket_seconds)
+        accounts = {}
+        for account, window in list(self._accounts.items()):
+            self._slide(window, epoch)
+            if window.epochs:
+                accounts[account] = [window.epochs[:], window.amounts[:]]
+            else:
+                del self._accounts[account]
+        return {"seq": self._seq, "bucket_seconds": self.bucket_seconds, "accounts": accounts}
+
+    def _write_snapshot(self, state):
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(state, separators=(",", ":")))
+        os.replace(tmp, self.snapshot_path)
+
+        if self.log_path and os.path.exists(self.log_path + ".1"):
+            os.remove(self.log_path + ".1")
+
+    def _restore(self):
+        snapshot_seq = 0
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("bucket_seconds") == self.bucket_seconds:
+                snapshot_seq = data["seq"]
+                for account, (epochs, amounts) in data["accounts"].items():
+                    window = self._accounts[account] = _Window()
+                    window.epochs, window.amounts, window.total = epochs, amounts, sum(amounts)
+            else:
+                print("[SpendTracker] snapshot bucket size changed; rebuilding from the log only")
+        self._seq = snapshot_seq
+
+        if not self.log_path:
+            return
+
+        replayed = 0
+        # The rotated log only exists if we stopped before its snapshot was written
+        for path in (self.log_path + ".1", self.log_path):
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) != 4:
+                        continue  # torn last write
+                    seq = int(parts[0])
+                    if seq > snapshot_seq:
+                        self._apply(parts[2], int(parts[3]), float(parts[1]))
+                        replayed += 1
+                    self._seq = max(self._seq, seq)
+        if replayed:
+            print(f"[SpendTracker] replayed {replayed} records from {self.log_path}")
+
+    def close(self):
+        with self._lock:
+            if self._log:
+                self._log.close()
+                self._log = None
+
+
+_TRACKER = None
+_TRACKER_LOCK = threading.Lock()
+
+
+def get_spend_tracker() -> SpendTracker:
+    global _TRACKER
+
+    with _TRACKER_LOCK:
+        if _TRACKER is None:
+            os.makedirs(config.SPEND_TRACKER_DIR, exist_ok=True)
+            _TRACKER = SpendTracker(
+                window_seconds=config.SPEND_WINDOW_SECONDS,
+                bucket_seconds=config.SPEND_BUCKET_SECONDS,
+                log_path=os.path.join(config.SPEND_TRACKER_DIR, "spend.log"),
+                snapshot_path=os.path.join(config.SPEND_TRACKER_DIR, "spend.snapshot.json"),
+                snapshot_every=config.SPEND_SNAPSHOT_EVERY,
+            )
+        return _TRACKER
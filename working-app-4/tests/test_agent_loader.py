@@ -0,0 +1,39 @@
+# tests/test_agent_loader.py
+import time
+
+from core.agent_loader import AgentRegistry
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def agent_yaml(*goals):
+    return "agent:\n  name: teller\ngoals: [" + ", ".join(goals) + "]\npolicies: []\nprompts: {}\n"
+
+
+def test_watcher_reloads_changed_files_and_can_be_stopped_and_restarted(tmp_path):
+    path = tmp_path / "teller_agent.yaml"
+    path.write_text(agent_yaml("balance"))
+    registry = AgentRegistry(tmp_path)
+
+    registry.start_watching(0.01)
+    path.write_text(agent_yaml("balance", "statement"))
+    assert wait_for(lambda: registry.get("teller")["goals"] == ("balance", "statement"))
+
+    watcher = registry._watcher
+    registry.stop_watching()
+    assert not watcher.is_alive()
+    path.write_text(agent_yaml("payment"))
+    time.sleep(0.05)
+    assert registry.get("teller")["goals"] == ("balance", "statement")
+
+    # Restarting after a stop used to exit at once: the stop flag was never cleared
+    registry.start_watching(0.01)
+    assert wait_for(lambda: registry.get("teller")["goals"] == ("payment",))
+    registry.stop_watching()
@@ -0,0 +1,52 @@
+# tests/test_digression_graph.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langgraph")
+pytest.importorskip("langchain_ollama")
+
+
+class FakeLLM:
+    def __init__(self, content):
+        self.content = content
+
+    def invoke(self, *args, **kwargs):
+        return SimpleNamespace(content=self.content)
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setenv("LLM_POOL_WARMUP", "false")
+    import nodes.planner
+    from core.digression_classifier import CLASSIFIER
+    from core.graph import build_agent_graph
+
+    monkeypatch.setattr(nodes.planner, "llm", FakeLLM("1. Collect the payment details"))
+    monkeypatch.setattr(CLASSIFIER, "_llm", FakeLLM("DIGRESSION"))
+    return build_agent_graph()
+
+
+def run_turn(agent, message):
+    state = {"agent_name": "statement_agent.yaml", "goal_id": "make_payment", "last_user_message": message}
+    # Looping back into the journey would hit the recursion limit instead of returning
+    return asyncio.run(agent.ainvoke(state, {"recursion_limit": 25}))
+
+
+@pytest.mark.parametrize("message", ["never mind", "forget it, I lost my card"])
+def test_digression_resets_the_journey_and_ends_the_turn(agent, message):
+    result = run_turn(agent, message)
+
+    assert result["last_classification"] == "DIGRESSION"
+    assert result["collected_slots"] == {}
+    assert result["missing_slots"] == ["beneficiary", "amount", "account"]
+    assert [event["event"] for event in result["trace"]] == ["digression_check"]
+
+
+def test_aligned_message_fills_slots_and_waits_for_the_rest(agent):
+    result = run_turn(agent, "Send £50 to John")
+
+    assert result["journey_status"] == "awaiting_user_input"
+    assert result["collected_slots"]["amount"] == "50.00"
+    assert result["missing_slots"] == ["account"]
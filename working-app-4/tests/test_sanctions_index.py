@@ -0,0 +1,89 @@
+# tests/test_sanctions_index.py
+import pytest
+
+from core import config
+from policies import sanctions_index
+from policies.aml import aml_check
+from policies.sanctions_index import SanctionsIndex, build_index, get_sanctions_index
+
+LISTED = [
+    ("Viktor Petrovich Bout", "OFAC"),
+    ("Dr. José AL-Hassan", "UN"),
+    ("Northern Star Trading", "EU"),
+    "Ivan Petrov",
+]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = str(tmp_path / "sanctions.idx")
+    assert build_index(LISTED, path) == 4
+    return path
+
+
+@pytest.fixture
+def index(index_path):
+    index = SanctionsIndex(index_path)
+    yield index
+    index.close()
+
+
+def test_exact_and_reordered_names_are_exact_matches(index):
+    [match] = index.search("Viktor Petrovich Bout")
+    assert (match.name, match.source, match.score, match.kind) == ("Viktor Petrovich Bout", "OFAC", 1.0, "exact")
+
+    # Token order, case, accents and honorifics do not matter
+    assert [m.name for m in index.search("bout viktor PETROVICH")] == ["Viktor Petrovich Bout"]
+    assert index.search("Jose Hassan")[0].kind == "exact"
+
+
+def test_one_typo_is_a_fuzzy_match(index):
+    [match] = index.search("Ivan Petrob")
+    assert match.name == "Ivan Petrov"
+    assert match.kind == "fuzzy"
+    assert match.score == pytest.approx(1 - sanctions_index.TYPO_PENALTY)
+
+
+def test_unlisted_names_do_not_match(index):
+    assert index.search("John Smith") == []
+    assert index.search("Ivan Smirnov") == []
+    assert index.search("Mr. the") == []
+
+
+def test_scan_finds_listed_names_inside_a_reference(index):
+    matches = index.scan("Invoice 42 - northern star trading ltd, attn Ivan Petrov")
+    assert {m.name for m in matches} == {"Northern Star Trading", "Ivan Petrov"}
+    assert all(m.kind == "text" for m in matches)
+
+    # Every token of the name has to appear, in order
+    assert index.scan("northern trading star") == []
+    assert index.scan("Petrov rent") == []
+
+
+def test_get_sanctions_index_reopens_after_a_rebuild(index_path):
+    first = get_sanctions_index(index_path)
+    assert get_sanctions_index(index_path) is first
+    assert first.search("Jane Doe") == []
+
+    build_index(LISTED + ["Jane Doe"], index_path)
+    second = get_sanctions_index(index_path)
+    assert second is not first
+    assert second.entries == 5
+    assert second.search("Jane Doe")[0].kind == "exact"
+    # The replaced file stays readable for searches already holding it
+    assert first.search("Ivan Petrov")[0].name == "Ivan Petrov"
+
+
+def test_aml_check_blocks_listed_payees_and_references(index_path, monkeypatch):
+    monkeypatch.setattr(config, "SANCTIONS_INDEX_PATH", index_path)
+
+    def state(**slots):
+        return {"collected_slots": {"account": "11112222", "amount": "10", **slots}}
+
+    assert aml_check(state(beneficiary="John Smith"))
+    assert not aml_check(state(beneficiary="Ivan Petrob"))
+    assert not aml_check(state(payee_name="Viktor Bout Petrovich"))
+    assert not aml_check(state(beneficiary="John Smith", reference="for northern star trading"))
+
+    monkeypatch.setattr(config, "SANCTIONS_INDEX_PATH", "")
+    assert aml_check(state(beneficiary="Ivan Petrov"))
@@ -0,0 +1,56 @@
+# tests/test_slot_filler.py
+from datetime import date
+
+from core import config
+from core.slot_extractor import extract_slots
+from nodes.slot_filler import slot_filler_node
+
+
+def test_extract_slots_reads_a_payment_in_one_pass():
+    slots = extract_slots("Please pay £2.5k to Thames Water, 20 00 00, account 41112222", payees=["Thames Water"])
+    assert slots == {
+        "amount": "2500.00",
+        "currency": "GBP",
+        "beneficiary": "Thames Water",
+        "sort_code": "20-00-00",
+        "account": "41112222",
+    }
+
+
+def test_thousands_suffix():
+    assert extract_slots("send 3k to Mum")["amount"] == "3000.00"
+    assert extract_slots("pay 1.25k GBP to Sam")["amount"] == "1250.00"
+    assert extract_slots("$4 k")["amount"] == "4000.00"
+    # Only a standalone k multiplies: kg, km and words starting with k do not
+    assert extract_slots("pay 12 km")["amount"] == "12.00"
+    assert extract_slots("send 30 kindly")["amount"] == "30.00"
+
+
+def test_statement_range():
+    slots = extract_slots("show my statement for the past two weeks", today=date(2026, 10, 18))
+    assert slots["date_range"] == {"from": "2026-10-04", "to": "2026-10-18", "label": "past two weeks"}
+    assert "months" not in slots
+
+
+def test_slot_filler_node_merges_new_values_over_earlier_ones(monkeypatch):
+    monkeypatch.setattr(config, "KNOWN_PAYEES", ["British Gas"])
+    state = {
+        "last_user_message": "actually make it 75 quid to British Gas",
+        "agent_config": {"known_payees": ["Landlord"]},
+        "collected_slots": {"amount": "50.00", "currency": "GBP", "account": "90479377"},
+    }
+
+    state = slot_filler_node(state)
+    assert state["collected_slots"] == {
+        "amount": "75.00", "currency": "GBP", "account": "90479377", "beneficiary": "British Gas",
+    }
+    assert state["slots_filled_for"] == "actually make it 75 quid to British Gas"
+
+    # Payees from the agent config are matched too
+    state["last_user_message"] = "no, the landlord"
+    assert slot_filler_node(state)["collected_slots"]["beneficiary"] == "Landlord"
+
+
+def test_slot_filler_node_first_turn_leaves_slots_alone():
+    state = slot_filler_node({"last_user_message": None, "agent_config": {}})
+    assert state == {"last_user_message": None, "agent_config": {}, "slots_filled_for": None}
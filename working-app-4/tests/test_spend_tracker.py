@@ -0,0 +1,136 @@
+# tests/test_spend_tracker.py
+import threading
+import time
+
+import pytest
+
+import policies.daily_limit
+import tools.aem_payment
+from core import config
+from policies.daily_limit import daily_limit
+from policies.spend_tracker import SpendTracker
+from tools.aem_payment import execute_payment
+
+# Snapshots slide windows to the wall clock, so events are recorded around now
+NOW = float(int(time.time()))
+
+
+def open_tracker(tmp_path, **kwargs):
+    return SpendTracker(log_path=str(tmp_path / "spend.log"), snapshot_path=str(tmp_path / "spend.snapshot.json"),
+                        snapshot_every=0, **kwargs)
+
+
+def test_snapshot_and_log_replay_round_trip(tmp_path):
+    tracker = open_tracker(tmp_path)
+    tracker.record("A", "£1,250.50", ts=NOW)
+    tracker.record("B", 20, ts=NOW)
+    tracker.snapshot()
+    tracker.record("A", 10, ts=NOW + 600)
+    tracker.close()
+
+    restored = open_tracker(tmp_path)
+    assert restored.total_pence("A", ts=NOW + 600) == 126050
+    assert restored.total("B", ts=NOW + 600) == 20.0
+    # The window still slides after a restore: only the later 5-minute bucket is left
+    assert restored.total_pence("A", ts=NOW + 24 * 3600 + 300) == 1000
+
+
+def test_crash_mid_snapshot_neither_loses_nor_double_counts(tmp_path):
+    tracker = open_tracker(tmp_path)
+    tracker.record("A", 100, ts=NOW)
+    tracker.snapshot()
+    tracker.record("A", 50, ts=NOW + 1)
+
+    # The log is rotated but the process dies before the snapshot is written
+    with tracker._lock:
+        tracker._capture_locked()
+    tracker.record("A", 25, ts=NOW + 2)
+    tracker.close()
+    assert (tmp_path / "spend.log.1").exists()
+
+    restored = open_tracker(tmp_path)
+    assert restored.total_pence("A", ts=NOW + 2) == 17500
+
+    # Dying after the snapshot lands but before the rotated log is removed
+    with restored._lock:
+        state = restored._capture_locked()
+    restored._write_snapshot(state)
+    (tmp_path / "spend.log.1").write_text(f"99\t{NOW:.3f}\tA\t100000\n1\t{NOW:.3f}\tA\t10000\n")
+    restored.close()
+
+    again = open_tracker(tmp_path)
+    # seq 1 is already in the snapshot; seq 99 is new
+    assert again.total_pence("A", ts=NOW + 2) == 117500
+
+
+def test_torn_last_write_is_skipped(tmp_path):
+    tracker = open_tracker(tmp_path)
+    tracker.record("A", 5, ts=NOW)
+    tracker.close()
+    with open(tmp_path / "spend.log", "a") as f:
+        f.write(f"2\t{NOW:.3f}\tA")
+
+    assert open_tracker(tmp_path).total_pence("A", ts=NOW) == 500
+
+
+def test_reservations_hold_headroom_until_committed_or_released():
+    tracker = SpendTracker()
+    first = tracker.reserve("A", 60, 100, ts=NOW)
+    assert first
+    assert tracker.reserve("A", 50, 100, ts=NOW) is None
+    assert tracker.would_exceed("A", 50, 100, ts=NOW)
+
+    assert tracker.release(first)
+    second = tracker.reserve("A", 50, 100, ts=NOW)
+    tracker.commit(second, "A", 50, ts=NOW)
+    assert tracker.total_pence("A", ts=NOW) == 5000
+    assert tracker.reserve("A", 51, 100, ts=NOW) is None
+
+    # A hold that is never committed lapses after its ttl
+    tracker.reserve("A", 50, 100, ttl=10, ts=NOW)
+    assert tracker.reserve("A", 50, 100, ts=NOW + 5) is None
+    assert tracker.reserve("A", 50, 100, ts=NOW + 11)
+
+
+def test_concurrent_reservations_never_overshoot_the_limit():
+    tracker = SpendTracker()
+    tokens = []
+    barrier = threading.Barrier(20)
+
+    def pay():
+        barrier.wait()
+        tokens.append(tracker.reserve("A", 30, 100))
+
+    threads = [threading.Thread(target=pay) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len([t for t in tokens if t]) == 3
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = SpendTracker()
+    monkeypatch.setattr(policies.daily_limit, "get_spend_tracker", lambda: tracker)
+    monkeypatch.setattr(tools.aem_payment, "get_spend_tracker", lambda: tracker)
+    monkeypatch.setattr(config, "MAX_DAILY_TRANSACTION_AMOUNT", "100")
+    return tracker
+
+
+def payment_state(payee_account, amount):
+    return {"customer_account": "12345678",
+            "collected_slots": {"beneficiary": "John", "account": payee_account, "amount": amount}}
+
+
+def test_daily_limit_is_per_customer_account_not_per_payee(tracker):
+    first = payment_state("11112222", "60.00")
+    assert daily_limit(first)
+    execute_payment(first)
+    assert tracker.total("12345678") == 60.0
+
+    # Splitting the rest across another payee does not reset the limit
+    assert not daily_limit(payment_state("33334444", "60.00"))
+    assert daily_limit(payment_state("33334444", "40.00"))
+    assert not daily_limit({"collected_slots": {"account": "33334444", "amount": "1"}})
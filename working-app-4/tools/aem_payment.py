@@ -1,9 +1,31 @@
 from core.state import AgentState
+from policies.spend_tracker import get_spend_tracker
 
 def execute_payment(state: AgentState) -> dict:
-    # Simulated AEM call
-    return {
-        "status": "SUCCESS",
-        "transaction_id": "TXN123456",
-        "amount": state["collected_slots"]["amount"],
-    }
+    tracker = get_spend_tracker()
+    reservation = state.get("spend_reservation")
+
+    try:
+        # Simulated AEM call
+        result = {
+            "status": "SUCCESS",
+            "transaction_id": "TXN123456",
+            "amount": state["collected_slots"]["amount"],
+        }
+    except Exception:
+        if reservation:
+            tracker.release(reservation)
+        raise
+
+    # Count the payment towards the customer's rolling daily limit; a failed
+    # payment gives its held amount back
+    account = state.get("customer_account")
+    if result["status"] == "SUCCESS" and account:
+        try:
+            tracker.commit(reservation, str(account), result["amount"])
+        except ValueError as e:
+            print(f"[execute_payment] spend not recorded: {e}")
+    elif reservation:
+        tracker.release(reservation)
+
+    return result
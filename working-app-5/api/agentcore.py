@@ -1,25 +1,53 @@
+import uuid
+
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
+from core.checkpoint import get_checkpointer
 from core.graph_engine import build_graph
+from core.intent_router import get_intent_router
+from core.streaming import stream_graph
 from langchain_core.messages import HumanMessage
 
 app = BedrockAgentCoreApp()
-graph = build_graph() # Memory management handled below
+
+AGENT_CONFIG = {
+    "goal": "Process retail banking inquiry", # You can make this dynamic
+    "tools": ["check_balance", "validate_customer"]
+}
+# Train the intent router now rather than on the first request
+get_intent_router(AGENT_CONFIG)
+# Conversation state is checkpointed per thread_id (session), so each turn
+# only sends the new message and resumes from the stored state
+graph = build_graph(use_async=True, checkpointer=get_checkpointer())
+streaming_graph = build_graph(streaming=True, checkpointer=get_checkpointer())
+
+
+async def stream_response(initial_state, config):
+    # AgentCore sends each yielded dict to the caller as a Server-Sent Event
+    async for event in stream_graph(streaming_graph, initial_state, config=config):
+        if event[0] == "token":
+            yield {"token": event[1]}
+        else:
+            _, result, ttft_ms = event
+            yield {"response": result.get("response"), "ttft_ms": ttft_ms}
+
 
 @app.entrypoint
 async def handle_request(payload):
     # AgentCore automatically provides session context
     user_input = payload.get("prompt")
-    session_id = payload.get("session_id") # Provided by the Bedrock Runtime
+    session_id = payload.get("session_id") or str(uuid.uuid4()) # Provided by the Bedrock Runtime
     
     # Pass session_id to LangGraph's config for state persistence
     config = {"configurable": {"thread_id": session_id}}
     initial_state = {
         "messages": [HumanMessage(content=user_input)],
-        "config": {
-            "goal": "Process retail banking inquiry", # You can make this dynamic
-            "tools": ["check_balance", "validate_customer"]
-        }
+        "config": AGENT_CONFIG
     }
+
+    # {"prompt": ..., "stream": true} returns tokens as they are generated
+    if payload.get("stream"):
+        return stream_response(initial_state, config)
+
     # Invoke your existing agent logic
     result = await graph.ainvoke(
         initial_state, 
@@ -30,4 +58,4 @@ async def handle_request(payload):
     return {"response": result.get("response")}
 
 if __name__ == "__main__":
-    app.run() # Starts the AgentCore-compatible server
\ No newline at end of file
+    app.run() # Starts the AgentCore-compatible server
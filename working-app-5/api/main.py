@@ -1,14 +1,43 @@
+import json
+
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from langchain_core.messages import HumanMessage
 # IMPORTANT: this line registers tools
 import tools.banking_tools
 
+from core import metrics
+from core.intent_router import router_stats, warm_intent_routers
 from core.graph_engine import build_graph
-from core.config_loader import load_agent_config
+from core.config_loader import get_config_registry, load_agent_config
 from core.memory import InMemoryStore
+from core.streaming import stream_graph
+from llm.cache import get_cache
+from llm.registry import awarm_up, registry_stats
+from tools.registry import tool_stats
 
 app = FastAPI()
 
+# Load and validate every agent config once, and train their intent
+# routers, before the first request
+warm_intent_routers(get_config_registry().configs())
+
 graph = build_graph()
+streaming_graph = build_graph(streaming=True)
+
+
+@app.on_event("startup")
+async def warm_llm_pools():
+    await awarm_up()
+
+
+def build_state(agent_id, session_id, message):
+    return {
+        "messages": [HumanMessage(content=message)],
+        "config": load_agent_config(agent_id),
+        "history": InMemoryStore.get(session_id)
+    }
+
 
 @app.post("/agent/{agent_id}/chat")
 def chat(agent_id: str, payload: dict):
@@ -16,13 +45,7 @@ def chat(agent_id: str, payload: dict):
     session_id = payload.get("session_id")
     message = payload.get("message")
 
-    config = load_agent_config(agent_id)
-
-    state = {
-        "input": message,
-        "config": config,
-        "history": InMemoryStore.get(session_id)
-    }
+    state = build_state(agent_id, session_id, message)
 
     result = graph.invoke(state)
 
@@ -32,3 +55,36 @@ def chat(agent_id: str, payload: dict):
         "reply": result.get("response"),
         "agent": agent_id
     }
+
+
+@app.post("/agent/{agent_id}/chat/stream")
+async def chat_stream(agent_id: str, payload: dict):
+
+    session_id = payload.get("session_id")
+    message = payload.get("message")
+
+    state = build_state(agent_id, session_id, message)
+
+    async def events():
+        async for event in stream_graph(streaming_graph, state):
+            if event[0] == "token":
+                yield f"data: {json.dumps({'token': event[1]})}\n\n"
+            else:
+                _, result, ttft_ms = event
+                InMemoryStore.update(session_id, message)
+                done = {"reply": result.get("response"), "agent": agent_id, "ttft_ms": ttft_ms}
+                yield f"event: done\ndata: {json.dumps(done)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/metrics")
+def get_metrics():
+    return {
+        "latency": metrics.snapshot(),
+        "llm_cache": get_cache().stats(),
+        "sessions": InMemoryStore.stats(),
+        "llm_clients": registry_stats(),
+        "tools": tool_stats(),
+        "intent_routes": router_stats()
+    }
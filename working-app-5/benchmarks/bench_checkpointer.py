@@ -0,0 +1,78 @@
+"""
+Checkpoint latency and on-disk growth per conversation turn for
+SQLiteDeltaSaver, compared with the bytes a whole-state snapshot per
+checkpoint would write.
+
+    python -m benchmarks.bench_checkpointer --turns 200
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import StateGraph
+from langgraph.graph.message import add_messages
+
+from core.checkpoint import SQLiteDeltaSaver
+
+
+class BenchState(TypedDict):
+    messages: Annotated[list, add_messages]
+    config: dict
+    tool_results: list
+    response: str
+
+
+def respond(state):
+    reply = f"Your balance is £1,250.00 (turn {len(state['messages'])})"
+    return {"messages": [AIMessage(content=reply)], "response": reply, "tool_results": [{"balance": "£1,250.00"}]}
+
+
+def db_size(path):
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--keep-last", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_checkpoints.sqlite3")
+    saver = SQLiteDeltaSaver(path, keep_last=args.keep_last)
+
+    graph = StateGraph(BenchState)
+    graph.add_node("respond", respond)
+    graph.set_entry_point("respond")
+    app = graph.compile(checkpointer=saver)
+
+    config = {"configurable": {"thread_id": "bench"}}
+    agent_config = {"goal": "Process retail banking inquiry", "tools": ["check_balance"] * 20}
+
+    latencies = []
+    snapshot_bytes = 0
+    for turn in range(args.turns):
+        state = {"messages": [HumanMessage(content=f"what is my balance? ({turn})")]}
+        if turn == 0:
+            state["config"] = agent_config
+
+        start = time.perf_counter()
+        result = app.invoke(state, config=config)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        # What a full snapshot of every channel would cost for this turn
+        snapshot_bytes += sum(len(saver.serde.dumps_typed(v)[1]) for v in result.values())
+
+    latencies.sort()
+    print(f"turns:               {args.turns}")
+    print(f"turn latency p50:    {statistics.median(latencies):.2f} ms")
+    print(f"turn latency p95:    {latencies[int(len(latencies) * 0.95) - 1]:.2f} ms")
+    print(f"db size on disk:     {db_size(path) / 1024:.1f} KiB ({db_size(path) / args.turns:.0f} B/turn)")
+    print(f"full-snapshot bytes: {snapshot_bytes / 1024:.1f} KiB ({snapshot_bytes / args.turns:.0f} B/turn)")
+
+
+if __name__ == "__main__":
+    main()
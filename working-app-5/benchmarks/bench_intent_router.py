@@ -0,0 +1,87 @@
+"""
+Intent router accuracy and latency on the labelled utterance file, with
+k-fold cross-validation (each fold is routed by a router trained on the
+others). Reports, per confidence threshold, how many messages are answered
+locally (keyword / classifier), how accurate those answers are and how many
+would still go to the LLM, next to the old substring rules.
+
+    python -m benchmarks.bench_intent_router --folds 5 --thresholds 0.5 0.6 0.7 0.8 0.9
+"""
+import argparse
+import random
+import time
+
+from core.intent_router import INTENTS, OTHER, IntentRouter, load_utterances
+
+TOOLS = sorted({spec["tool"] for spec in INTENTS.values()})
+
+
+def substring_rules(text):
+    # What executor_node did before the router
+    text = text.lower()
+    if "balance" in text:
+        return "balance"
+    if "customer" in text:
+        return "customer"
+    if "statement" in text:
+        return "statements"
+    if "pay" in text:
+        return "payment"
+    return OTHER
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.5, 0.6, 0.7, 0.8, 0.9])
+    parser.add_argument("--repeat", type=int, default=20, help="timing passes over each fold")
+    args = parser.parse_args()
+
+    samples = load_utterances()
+    random.Random(5).shuffle(samples)
+    folds = [samples[i::args.folds] for i in range(args.folds)]
+    intents = list(INTENTS)
+
+    # The old rules never told statements from transactions; count those as the same tool
+    tool_of = lambda intent: INTENTS[intent]["tool"] if intent in INTENTS else OTHER
+    correct = sum(tool_of(substring_rules(text)) == tool_of(label) for label, text in samples)
+    print(f"{len(samples)} utterances, {len(intents) + 1} labels, {args.folds}-fold cross-validation")
+    print(f"substring rules: tool accuracy {correct / len(samples):6.1%}\n")
+
+    print(f"{'threshold':>9} {'keyword':>8} {'classif.':>8} {'to LLM':>7} {'local acc':>9} {'tool acc':>8}"
+          f" {'p50 us':>7} {'p99 us':>7}")
+    for threshold in args.thresholds:
+        counts = {"keyword": 0, "classifier": 0, "none": 0}
+        local_right = tool_right = 0
+        timings = []
+
+        for k, held_out in enumerate(folds):
+            train = [s for i, fold in enumerate(folds) if i != k for s in fold]
+            router = IntentRouter(intents, TOOLS, samples=train, threshold=threshold, llm_fallback=False)
+            for label, text in held_out:
+                route = router.route(text)
+                counts[route.source] += 1
+                if route.source != "none":
+                    local_right += route.intent == label
+                    tool_right += tool_of(route.intent) == tool_of(label)
+
+            for _ in range(args.repeat):
+                for _, text in held_out:
+                    start = time.perf_counter()
+                    router.route(text)
+                    timings.append((time.perf_counter() - start) * 1e6)
+
+        n = len(samples)
+        local = counts["keyword"] + counts["classifier"]
+        print(f"{threshold:>9.2f} {counts['keyword'] / n:>8.1%} {counts['classifier'] / n:>8.1%}"
+              f" {counts['none'] / n:>7.1%} {local_right / max(local, 1):>9.1%} {tool_right / max(local, 1):>8.1%}"
+              f" {percentile(timings, 0.5):>7.1f} {percentile(timings, 0.99):>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
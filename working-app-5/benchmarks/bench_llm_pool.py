@@ -0,0 +1,65 @@
+"""
+Compare TLS handshakes and latency for a fresh HTTP client per call versus
+the shared pooled client from llm.registry, under concurrent load.
+
+    python -m benchmarks.bench_llm_pool --url https://api.openai.com/v1/models --requests 200 --concurrency 16
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from llm.registry import get_http_client
+
+
+class HandshakeCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, event_name, info):
+        if event_name == "connection.start_tls.started":
+            self.count += 1
+
+
+def timed_head(client, url, counter):
+    start = time.perf_counter()
+    try:
+        client.head(url, extensions={"trace": counter})
+    except httpx.HTTPError:
+        pass
+    return (time.perf_counter() - start) * 1000
+
+
+def run(label, make_call, n, concurrency):
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(lambda _: make_call(), range(n)))
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:>10}: p50={statistics.median(latencies):7.1f} ms  p95={p95:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="https://api.openai.com/v1/models")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    fresh = HandshakeCounter()
+
+    def fresh_call():
+        with httpx.Client() as client:
+            return timed_head(client, args.url, fresh)
+
+    run("per-call", fresh_call, args.requests, args.concurrency)
+    print(f"{'':>10}  TLS handshakes: {fresh.count}")
+
+    pooled = HandshakeCounter()
+    shared = get_http_client()
+    run("pooled", lambda: timed_head(shared, args.url, pooled), args.requests, args.concurrency)
+    print(f"{'':>10}  TLS handshakes: {pooled.count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    channel_versions TEXT NOT NULL,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS channel_blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+class SQLiteDeltaSaver(BaseCheckpointSaver):
+    """
+    LangGraph checkpointer on a SQLite file in WAL mode, safe to share
+    between worker processes.
+
+    Checkpoints hold only channel *versions*; channel values live in
+    channel_blobs keyed by (channel, version). Each superstep therefore
+    writes just the channels in `new_versions` instead of a full state
+    snapshot. Every `compact_every` checkpoints a thread is compacted down
+    to its last `keep_last` checkpoints and the blobs they still reference.
+    """
+
+    def __init__(self, path, keep_last=5, compact_every=20, serde=None):
+        super().__init__(serde=serde)
+        self.path = path
+        self.keep_last = keep_last
+        self.compact_every = compact_every
+        self._local = threading.local()
+
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --------------------
+    # Reads
+    # --------------------
+    def _load_tuple(self, conn, thread_id, checkpoint_ns, row):
+        checkpoint_id, parent_id, type_, blob, versions_json, metadata_type, metadata = row
+
+        checkpoint = self.serde.loads_typed((type_, blob))
+        channel_versions = json.loads(versions_json)
+
+        # One round trip for every channel this checkpoint references
+        channel_values = {}
+        if channel_versions:
+            pairs = ", ".join("(?, ?)" for _ in channel_versions)
+            params = [thread_id, checkpoint_ns]
+            for channel, version in channel_versions.items():
+                params += [channel, str(version)]
+            for channel, value_type, value in conn.execute(
+                "SELECT channel, type, value FROM channel_blobs"
+                " WHERE thread_id = ? AND checkpoint_ns = ?"
+                f" AND (channel, version) IN (VALUES {pairs})",
+                params,
+            ):
+                if value_type != "empty":
+                    channel_values[channel] = self.serde.loads_typed((value_type, value))
+        checkpoint["channel_values"] = channel_values
+
+        pending_writes = [
+            (task_id, channel, self.serde.loads_typed((wtype, wvalue)))
+            for task_id, channel, wtype, wvalue in conn.execute(
+                "SELECT task_id, channel, type, value FROM writes"
+                " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?"
+                " ORDER BY task_id, idx",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            )
+        ]
+
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+            }},
+            checkpoint=checkpoint,
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config={"configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": parent_id,
+            }} if parent_id else None,
+            pending_writes=pending_writes,
+        )
+
+    def get_tuple(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        columns = ("SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, channel_versions,"
+                   " metadata_type, metadata FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?")
+        conn = self._conn()
+        if checkpoint_id:
+            row = conn.execute(columns + " AND checkpoint_id = ?",
+                               (thread_id, checkpoint_ns, checkpoint_id)).fetchone()
+        else:
+            row = conn.execute(columns + " ORDER BY checkpoint_id DESC LIMIT 1",
+                               (thread_id, checkpoint_ns)).fetchone()
+
+        if row is None:
+            return None
+        return self._load_tuple(conn, thread_id, checkpoint_ns, row)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        query = ("SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint,"
+                 " channel_versions, metadata_type, metadata FROM checkpoints WHERE 1 = 1")
+        params = []
+
+        if config:
+            query += " AND thread_id = ?"
+            params.append(config["configurable"]["thread_id"])
+            if "checkpoint_ns" in config["configurable"]:
+                query += " AND checkpoint_ns = ?"
+                params.append(config["configurable"]["checkpoint_ns"])
+            if get_checkpoint_id(config):
+                query += " AND checkpoint_id = ?"
+                params.append(get_checkpoint_id(config))
+        if before:
+            query += " AND checkpoint_id < ?"
+            params.append(get_checkpoint_id(before))
+        query += " ORDER BY checkpoint_id DESC"
+
+        conn = self._conn()
+        returned = 0
+        for thread_id, checkpoint_ns, *row in conn.execute(query, params).fetchall():
+            result = self._load_tuple(conn, thread_id, checkpoint_ns, row)
+            if filter and any(result.metadata.get(k) != v for k, v in filter.items()):
+                continue
+            yield result
+            returned += 1
+            if limit is not None and returned >= limit:
+                break
+
+    # --------------------
+    # Writes
+    # --------------------
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_id = config["configurable"].get("checkpoint_id")
+
+        stored = dict(checkpoint)
+        values = stored.pop("channel_values", {})
+        type_, blob = self.serde.dumps_typed(stored)
+        metadata_type, metadata_blob = self.serde.dumps_typed(dict(metadata))
+
+        # Only channels that changed in this superstep are written
+        blobs = []
+        for channel, version in new_versions.items():
+            if channel in values:
+                value_type, value = self.serde.dumps_typed(values[channel])
+            else:
+                value_type, value = "empty", None
+            blobs.append((thread_id, checkpoint_ns, channel, str(version), value_type, value))
+
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO channel_blobs"
+                " (thread_id, checkpoint_ns, channel, version, type, value) VALUES (?, ?, ?, ?, ?, ?)",
+                blobs,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id,"
+                " parent_checkpoint_id, type, checkpoint, channel_versions, metadata_type, metadata)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, checkpoint_ns, checkpoint["id"], parent_id, type_, blob,
+                 json.dumps({k: str(v) for k, v in checkpoint["channel_versions"].items()}),
+                 metadata_type, metadata_blob),
+            )
+
+        count = conn.execute(
+            "SELECT COUNT(*) FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+            (thread_id, checkpoint_ns),
+        ).fetchone()[0]
+        if count >= self.keep_last + self.compact_every:
+            self.compact(thread_id, checkpoint_ns)
+
+        return {"configurable": {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+        }}
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        # Special writes (errors, interrupts) replace; regular writes are idempotent
+        verb = "REPLACE" if all(w[0] in WRITES_IDX_MAP for w in writes) else "IGNORE"
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            value_type, blob = self.serde.dumps_typed(value)
+            rows.append((thread_id, checkpoint_ns, checkpoint_id, task_id,
+                         WRITES_IDX_MAP.get(channel, idx), channel, value_type, blob, task_path))
+
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                f"INSERT OR {verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx,"
+                " channel, type, value, task_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def delete_thread(self, thread_id):
+        conn = self._conn()
+        with conn:
+            for table in ("checkpoints", "channel_blobs", "writes"):
+                conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    def compact(self, thread_id, checkpoint_ns=""):
+        """Drop all but the last `keep_last` checkpoints and any blobs they no longer reference."""
+        conn = self._conn()
+        with conn:
+            kept = conn.execute(
+                "SELECT checkpoint_id, channel_versions FROM checkpoints"
+                " WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT ?",
+                (thread_id, checkpoint_ns, self.keep_last),
+            ).fetchall()
+            if not kept:
+                return
+
+            oldest_kept = kept[-1][0]
+            for table in ("checkpoints", "writes"):
+                conn.execute(
+                    f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                    (thread_id, checkpoint_ns, oldest_kept),
+                )
+            conn.execute(
+                "UPDATE checkpoints SET parent_checkpoint_id = NULL"
+                " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, oldest_kept),
+            )
+
+            referenced = {
+                (channel, version)
+                for _, versions in kept
+                for channel, version in json.loads(versions).items()
+            }
+            stale = [
+                (thread_id, checkpoint_ns, channel, version)
+                for channel, version in conn.execute(
+                    "SELECT channel, version FROM channel_blobs WHERE thread_id = ? AND checkpoint_ns = ?",
+                    (thread_id, checkpoint_ns),
+                )
+                if (channel, version) not in referenced
+            ]
+            conn.executemany(
+                "DELETE FROM channel_blobs"
+                " WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                stale,
+            )
+
+    def get_next_version(self, current, channel):
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # --------------------
+    # Async API (SQLite calls are short; run them off the event loop)
+    # --------------------
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        results = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for result in results:
+            yield result
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+_SAVER = None
+_SAVER_LOCK = threading.Lock()
+
+
+def get_checkpointer():
+    global _SAVER
+
+    with _SAVER_LOCK:
+        if _SAVER is None:
+            _SAVER = SQLiteDeltaSaver(
+                os.getenv("CHECKPOINT_DB_PATH", os.path.join(tempfile.gettempdir(), "agent_checkpoints.sqlite3")),
+                keep_last=int(os.getenv("CHECKPOINT_KEEP_LAST", "5")),
+                compact_every=int(os.getenv("CHECKPOINT_COMPACT_EVERY", "20")),
+            )
+        return _SAVER
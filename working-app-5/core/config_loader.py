@@ -1,7 +1,117 @@
+import os
+import threading
+from pathlib import Path
+from types import MappingProxyType
+
 import yaml
 
+AGENTS_DIR = Path(__file__).resolve().parent.parent / "agents"
+
+
 def load_agent_config(agent_id):
-    path = f"agents/{agent_id}.yaml"
+    # Pre-validated, immutable and cached; changed files are picked up by the watcher
+    return get_config_registry().get(agent_id)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _load_file(path):
     with open(path) as f:
-        return yaml.safe_load(f)
+        config = yaml.safe_load(f)
+
+    if not isinstance(config, dict) or "agent_id" not in config:
+        raise ValueError(f"{path.name}: agent config must define agent_id")
+
+    return _freeze(config)
+
+
+class AgentConfigRegistry:
+    """
+    All agents/*.yaml loaded and validated once, looked up by file name.
+    Reloads build a fresh mapping and swap it in atomically.
+    """
+
+    def __init__(self, agents_dir=AGENTS_DIR):
+        self.agents_dir = Path(agents_dir)
+        self._configs = {}
+        self._mtimes = {}
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        self.reload(strict=True)
+
+    def reload(self, strict=False):
+        with self._lock:
+            mtimes = {p.stem: p.stat().st_mtime_ns for p in self.agents_dir.glob("*.yaml")}
+            if mtimes == self._mtimes:
+                return False
+
+            configs = {}
+            for agent_id, mtime in mtimes.items():
+                # A file that failed to load has an mtime but no config
+                if self._mtimes.get(agent_id) == mtime and agent_id in self._configs:
+                    configs[agent_id] = self._configs[agent_id]
+                    continue
+                try:
+                    configs[agent_id] = _load_file(self.agents_dir / f"{agent_id}.yaml")
+                except (ValueError, yaml.YAMLError) as e:
+                    if strict:
+                        raise
+                    print(f"[AgentConfigRegistry] keeping previous config for {agent_id}: {e}")
+                    if agent_id in self._configs:
+                        configs[agent_id] = self._configs[agent_id]
+
+            self._configs = configs
+            self._mtimes = mtimes
+            return True
+
+    def get(self, agent_id):
+        config = self._configs.get(agent_id)
+        if config is None:
+            raise FileNotFoundError(f"agents/{agent_id}.yaml")
+        return config
+
+    def configs(self):
+        return list(self._configs.values())
+
+    def start_watching(self, interval=2.0):
+        if self._watcher:
+            return
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                if self.reload():
+                    print(f"[AgentConfigRegistry] reloaded: {sorted(self._configs)}")
+
+        self._watcher = threading.Thread(target=watch, name="agent-config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self, timeout=None):
+        """Stop the watcher and wait for it to exit; start_watching() can run it again."""
+        watcher, self._watcher = self._watcher, None
+        self._stop.set()
+        if watcher:
+            watcher.join(timeout)
+
+
+_REGISTRY = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_config_registry():
+    global _REGISTRY
 
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = AgentConfigRegistry()
+            interval = float(os.getenv("AGENT_CONFIG_WATCH_SECONDS", "2"))
+            if interval > 0:
+                _REGISTRY.start_watching(interval)
+        return _REGISTRY
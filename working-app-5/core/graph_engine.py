@@ -1,32 +1,104 @@
+from dataclasses import dataclass
+from typing import Annotated, Callable, Optional, Tuple, TypedDict
+
 from langgraph.graph import StateGraph
-from core.nodes.planner import planner_node
+from langgraph.graph.message import add_messages
+from core.nodes.planner import planner_node, aplanner_node
 from core.nodes.executor import executor_node
 from core.nodes.monitor import monitor_node
-from core.nodes.responder import responder_node
-
-from typing import TypedDict
+from core.nodes.responder import responder_node, aresponder_node, astream_responder_node
 
 class AgentState(TypedDict):
-    messages: str
+    # Appended per turn, so a checkpointed thread only needs the new message
+    messages: Annotated[list, add_messages]
     config: dict
     history: list
     plan: str
     tool_results: list
     response: str
 
-def build_graph():
+
+@dataclass(frozen=True)
+class NodeSpec:
+    name: str
+    func: Callable
+    async_func: Callable
+    reads: Tuple[str, ...]
+    writes: Tuple[str, ...]
+    streaming_func: Optional[Callable] = None
+
+
+# Fixed pipeline, in execution order. `reads`/`writes` declare which state
+# fields each node consumes and produces, so unused outputs can be found.
+NODES = (
+    NodeSpec("planner", planner_node, aplanner_node,
+             reads=("messages", "config"), writes=("plan",)),
+    NodeSpec("executor", executor_node, executor_node,
+             reads=("messages", "config"), writes=("tool_results",)),
+    NodeSpec("monitor", monitor_node, monitor_node,
+             reads=("tool_results",), writes=("status",)),
+    NodeSpec("responder", responder_node, aresponder_node,
+             reads=("messages", "tool_results"), writes=("response",),
+             streaming_func=astream_responder_node),
+)
+
+# Fields the API layer reads from the final state
+OUTPUTS = ("response",)
+
+
+def find_dead_outputs(nodes=NODES, outputs=OUTPUTS) -> dict:
+    """
+    Walk the pipeline backwards and return {node_name: [unread fields]}
+    for every node whose outputs are never read downstream or returned.
+    """
+    live = set(outputs)
+    dead = {}
+
+    for node in reversed(nodes):
+        unread = [field for field in node.writes if field not in live]
+        if unread:
+            dead[node.name] = unread
+
+        # A node with no live output is never run, so its reads don't count
+        if len(unread) < len(node.writes):
+            live = (live - set(node.writes)) | set(node.reads)
+
+    return dead
+
+
+def build_graph(use_async=False, streaming=False, outputs=OUTPUTS, prune=True, checkpointer=None):
 
     graph = StateGraph(AgentState)
 
-    graph.add_node("planner", planner_node)
-    graph.add_node("executor", executor_node)
-    graph.add_node("monitor", monitor_node)
-    graph.add_node("responder", responder_node)
+    # Async nodes await the LLM instead of blocking the event loop,
+    # so graph.ainvoke can serve many sessions concurrently.
+    # Streaming graphs are always async and emit responder tokens
+    # through graph.astream(stream_mode="custom").
+    use_async = use_async or streaming
+
+    # Fields are only computed when something reads them: a node whose
+    # outputs are all dead (e.g. the planner's "plan") is left out of the
+    # graph. Pass outputs=(..., "plan") to materialise it.
+    dead = find_dead_outputs(NODES, outputs)
+    nodes = []
+    for node in NODES:
+        if prune and len(dead.get(node.name, ())) == len(node.writes):
+            print(f"[graph_engine] skipping {node.name}: outputs never read {dead[node.name]}")
+            continue
+        nodes.append(node)
+
+    for node in nodes:
+        if streaming and node.streaming_func:
+            func = node.streaming_func
+        elif use_async:
+            func = node.async_func
+        else:
+            func = node.func
+        graph.add_node(node.name, func)
 
-    graph.set_entry_point("planner")
+    graph.set_entry_point(nodes[0].name)
 
-    graph.add_edge("planner", "executor")
-    graph.add_edge("executor", "monitor")
-    graph.add_edge("monitor", "responder")
+    for prev, node in zip(nodes, nodes[1:]):
+        graph.add_edge(prev.name, node.name)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
@@ -0,0 +1,301 @@
+"""
+Intent routing for the executor.
+
+Each agent gets a router over the intents it can serve: its allowed_intents
+plus the intents implied by its tools. A message is routed by, in order:
+
+  1. keywords: one compiled regex over every intent's phrases; a message
+     naming exactly one read-only intent is answered straight away
+  2. a local linear classifier over hashed word / bigram / character
+     trigram features, trained from data/intent_utterances.tsv; used when
+     its top probability reaches INTENT_CONFIDENCE_THRESHOLD
+  3. the LLM, for whatever is left (INTENT_LLM_FALLBACK)
+
+Stages 1 and 2 take microseconds, so only genuinely unclear messages pay
+for an LLM call.
+
+Intents that move money (WRITE_INTENTS) are never decided by keywords:
+the classifier or the LLM has to pick them, and never for a message that
+is a question, a negation or a cancellation ("how much did I pay...",
+"cancel the transfer..."). Those go to the best read-only intent instead.
+"""
+import math
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from core import metrics
+
+load_dotenv()
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "data" / "intent_utterances.tsv"
+
+CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.7"))
+LLM_FALLBACK = os.getenv("INTENT_LLM_FALLBACK", "true") == "true"
+
+OTHER = "other"
+
+# Intent -> the tool that serves it and phrases that name it outright
+INTENTS = {
+    "balance": {
+        "tool": "check_balance",
+        "keywords": ["balance", "how much money", "how much do i have", "available funds", "funds available"],
+    },
+    "statements": {
+        "tool": "get_statement",
+        "keywords": ["statement", "statements", "bank statement"],
+    },
+    "transactions": {
+        "tool": "get_statement",
+        "keywords": ["transactions", "transaction history", "recent payments", "what did i spend",
+                     "payment history", "transfer history"],
+    },
+    "payment": {
+        "tool": "make_payment",
+        "keywords": ["pay", "send money", "transfer", "make a payment"],
+    },
+    "customer": {
+        "tool": "validate_customer",
+        "keywords": ["customer", "verify my identity", "customer id"],
+    },
+}
+
+# Intents whose tool moves money
+WRITE_INTENTS = {"payment"}
+
+# Questions, negations and cancellations: never an instruction to move money
+_NOT_AN_INSTRUCTION = re.compile(
+    r"\?|\b(?:cancel|stop|undo|reverse|refund|don'?t|do not|never|not|how|what|when|which|why|who"
+    r"|did|have i|has|history)\b",
+    re.IGNORECASE,
+)
+
+_WORDS = re.compile(r"[a-z0-9£$€]+")
+
+
+def agent_intents(config) -> list:
+    """Known intents an agent can serve: its allowed_intents plus those its tools imply."""
+    tools = set(config.get("tools", []) or [])
+    allowed = set(config.get("allowed_intents", []) or [])
+    return [name for name, spec in INTENTS.items() if name in allowed or spec["tool"] in tools]
+
+
+def features(text: str, buckets: int) -> dict:
+    """Hashed word, word-bigram and character-trigram counts, scaled to unit length."""
+    words = _WORDS.findall(text.lower())
+    grams = [f"w:{w}" for w in words]
+    grams += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f"<{w}>"
+        grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+
+    counts = {}
+    for gram in grams:
+        bucket = zlib.crc32(gram.encode("utf-8")) % buckets
+        counts[bucket] = counts.get(bucket, 0) + 1
+    norm = math.sqrt(sum(c * c for c in counts.values())) or 1.0
+    return {bucket: c / norm for bucket, c in counts.items()}
+
+
+def load_utterances(path=DATA_FILE) -> list:
+    """(label, utterance) pairs from a TSV file; blank lines and # comments are skipped."""
+    samples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            label, text = line.split("\t", 1)
+            samples.append((label.strip(), text.strip()))
+    return samples
+
+
+class LinearIntentClassifier:
+    """Multinomial logistic regression over hashed features, trained with SGD."""
+
+    def __init__(self, labels, buckets=1 << 18):
+        self.labels = list(labels)
+        self.buckets = buckets
+        self.weights = {}  # bucket -> per-label weights (sparse: only seen buckets)
+        self.bias = [0.0] * len(self.labels)
+
+    def _scores(self, feats):
+        scores = self.bias[:]
+        for bucket, value in feats.items():
+            row = self.weights.get(bucket)
+            if row is not None:
+                for i, w in enumerate(row):
+                    scores[i] += w * value
+        return scores
+
+    @staticmethod
+    def _softmax(scores):
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        total = sum(exps)
+        return [e / total for e in exps]
+
+    def train(self, samples, epochs=60, learning_rate=1.0, l2=1e-4, seed=13):
+        index = {label: i for i, label in enumerate(self.labels)}
+        data = [(features(text, self.buckets), index[label]) for label, text in samples]
+        rng = random.Random(seed)
+        n = len(self.labels)
+
+        for epoch in range(epochs):
+            rng.shuffle(data)
+            rate = learning_rate / (1 + epoch * 0.1)
+            for feats, target in data:
+                probs = self._softmax(self._scores(feats))
+                for i in range(n):
+                    grad = probs[i] - (1.0 if i == target else 0.0)
+                    self.bias[i] -= rate * grad
+                    if not grad:
+                        continue
+                    for bucket, value in feats.items():
+                        row = self.weights.get(bucket)
+                        if row is None:
+                            row = self.weights[bucket] = [0.0] * n
+                        row[i] -= rate * (grad * value + l2 * row[i])
+        return self
+
+    def predict(self, text, exclude=()):
+        """(label, probability) of the most likely label not in `exclude`."""
+        probs = self._softmax(self._scores(features(text, self.buckets)))
+        candidates = [i for i, label in enumerate(self.labels) if label not in exclude]
+        best = max(candidates, key=probs.__getitem__)
+        return self.labels[best], probs[best]
+
+
+class Route:
+    __slots__ = ("intent", "tool", "confidence", "source", "latency_ms")
+
+    def __init__(self, intent, tool, confidence, source, latency_ms=0.0):
+        self.intent = intent
+        self.tool = tool
+        self.confidence = confidence
+        self.source = source  # keyword | classifier | llm | none
+        self.latency_ms = latency_ms
+
+    def to_dict(self):
+        return {"intent": self.intent, "tool": self.tool, "confidence": round(self.confidence, 3),
+                "source": self.source, "latency_ms": round(self.latency_ms, 3)}
+
+    def __repr__(self):
+        return f"Route({self.intent!r}, source={self.source}, confidence={self.confidence:.2f})"
+
+
+class IntentRouter:
+
+    def __init__(self, intents, tools=None, samples=None, threshold=CONFIDENCE_THRESHOLD,
+                 llm_fallback=LLM_FALLBACK, llm=None):
+        self.intents = list(intents)
+        self.tools = set(tools) if tools is not None else {INTENTS[i]["tool"] for i in self.intents}
+        self.threshold = threshold
+        self.llm_fallback = llm_fallback
+        self._llm = llm
+        self.stats = {"keyword": 0, "classifier": 0, "llm": 0, "none": 0}
+
+        # One alternation, longest phrases first; the group name is the intent
+        alternatives = []
+        for intent in self.intents:
+            phrases = sorted(set(INTENTS[intent]["keywords"] + [intent]), key=len, reverse=True)
+            alternatives.append(f"(?P<{intent}>\\b(?:{'|'.join(re.escape(p) for p in phrases)})\\b)")
+        self._keywords = re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+
+        # Utterances of intents this agent does not serve teach the classifier what "other" looks like
+        if samples is None:
+            samples = load_utterances() if DATA_FILE.exists() else []
+        samples = [(label if label in self.intents else OTHER, text) for label, text in samples]
+        self.classifier = LinearIntentClassifier(self.intents + [OTHER]).train(samples) if samples else None
+
+    def _tool(self, intent):
+        tool = INTENTS.get(intent, {}).get("tool")
+        return tool if tool in self.tools else None
+
+    def keyword_intents(self, text) -> set:
+        if self._keywords is None:
+            return set()
+        return {m.lastgroup for m in self._keywords.finditer(text)}
+
+    def _ask_llm(self, text):
+        if self._llm is None:
+            from llm.provider import get_llm
+            self._llm = get_llm()
+
+        labels = self.intents + [OTHER]
+        reply = self._llm.generate(
+            "Classify the customer's banking request as exactly one of: "
+            f"{', '.join(labels)}.\nReply with the label only.\n\nRequest: {text}"
+        )
+        words = _WORDS.findall(str(reply).lower())
+        return next((w for w in words if w in labels), OTHER)
+
+    def route(self, text: str) -> Route:
+        started = time.perf_counter()
+        route = self._route(text)
+        route.latency_ms = (time.perf_counter() - started) * 1000
+
+        self.stats[route.source] += 1
+        metrics.record(f"intent_route_{route.source}_ms", route.latency_ms)
+        return route
+
+    def _route(self, text):
+        # Write intents are off the table unless the message reads as an instruction
+        excluded = WRITE_INTENTS if _NOT_AN_INSTRUCTION.search(text) else set()
+
+        found = self.keyword_intents(text)
+        reads = found - WRITE_INTENTS
+        # Keywords alone never pick a write intent, nor override one that is still possible
+        if len(reads) == 1 and not (found & WRITE_INTENTS - excluded):
+            intent = reads.pop()
+            return Route(intent, self._tool(intent), 1.0, "keyword")
+
+        if self.classifier is not None:
+            intent, confidence = self.classifier.predict(text, exclude=excluded)
+            if confidence >= self.threshold:
+                return Route(intent, self._tool(intent), confidence, "classifier")
+
+        if self.llm_fallback:
+            intent = self._ask_llm(text)
+            if intent in excluded:
+                intent = OTHER
+            return Route(intent, self._tool(intent), 0.0, "llm")
+
+        return Route(OTHER, None, 0.0, "none")
+
+
+_ROUTERS = {}
+_ROUTERS_LOCK = threading.Lock()
+
+
+def get_intent_router(config) -> IntentRouter:
+    """One trained router per distinct (intents, tools) combination, shared by every session."""
+    key = (tuple(agent_intents(config)), tuple(sorted(config.get("tools", []) or [])))
+
+    with _ROUTERS_LOCK:
+        router = _ROUTERS.get(key)
+    if router is not None:
+        return router
+
+    # Trained outside the lock so other agents' lookups never wait on it
+    router = IntentRouter(*key)
+    with _ROUTERS_LOCK:
+        return _ROUTERS.setdefault(key, router)
+
+
+def warm_intent_routers(configs):
+    """Train the routers for these agent configs up front, at startup rather than on the first request."""
+    for config in configs:
+        get_intent_router(config)
+
+
+def router_stats() -> dict:
+    with _ROUTERS_LOCK:
+        routers = list(_ROUTERS.values())
+    return {",".join(r.intents): dict(r.stats) for r in routers}
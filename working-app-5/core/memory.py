@@ -1,14 +1,232 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+
+
+class SessionBackend(ABC):
+    """Where evicted sessions go instead of being dropped."""
+
+    @abstractmethod
+    def load(self, session_id):
+        pass
+
+    @abstractmethod
+    def save(self, session_id, messages):
+        pass
+
+    @abstractmethod
+    def delete(self, session_id):
+        pass
+
+
+class SQLiteSessionBackend(SessionBackend):
+
+    def __init__(self, path, retention_seconds=7 * 24 * 3600):
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self._local = threading.local()
+        self._writes = 0
+        self._connect()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " session_id TEXT PRIMARY KEY,"
+                " messages TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def load(self, session_id):
+        row = self._connect().execute(
+            "SELECT messages FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, session_id, messages):
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (session_id, messages, updated_at) VALUES (?, ?, ?)",
+            (session_id, json.dumps(messages, default=str), now),
+        )
+        self._writes += 1
+        if self._writes % 256 == 0:
+            conn.execute("DELETE FROM sessions WHERE updated_at < ?", (now - self.retention_seconds,))
+        conn.commit()
+
+    def delete(self, session_id):
+        conn = self._connect()
+        conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        conn.commit()
+
+
+class _Session:
+    __slots__ = ("messages", "bytes", "last_access")
+
+    def __init__(self, max_messages):
+        self.messages = deque(maxlen=max_messages)
+        self.bytes = 0
+        self.last_access = time.monotonic()
+
+
+def _size(message):
+    return len(str(message).encode("utf-8"))
+
+
+class SessionStore:
+    """
+    Bounded session history.
+
+    Sessions are kept in LRU order and evicted when idle for longer than
+    `idle_ttl_seconds` or when more than `max_sessions` are live. Each
+    session is a ring buffer capped at `max_messages` and `max_bytes`.
+    Evicted sessions are spilled to `backend` (if any) and loaded back on
+    the next access.
+    """
+
+    def __init__(self, max_sessions=10000, idle_ttl_seconds=1800, max_messages=50,
+                 max_bytes=64 * 1024, backend: SessionBackend = None):
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.backend = backend
+
+        self._sessions = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.evictions = 0
+        self.spills = 0
+        self.restores = 0
+        self.trimmed_messages = 0
+
+    def _append(self, session, message):
+        if len(session.messages) == session.messages.maxlen:
+            oldest = _size(session.messages[0])
+            session.bytes -= oldest
+            self._bytes -= oldest
+            self.trimmed_messages += 1
+
+        size = _size(message)
+        session.messages.append(message)
+        session.bytes += size
+        self._bytes += size
+
+        while session.bytes > self.max_bytes and len(session.messages) > 1:
+            dropped = _size(session.messages.popleft())
+            session.bytes -= dropped
+            self._bytes -= dropped
+            self.trimmed_messages += 1
+
+    def _evict(self, now):
+        # Oldest-accessed sessions sit at the front of the OrderedDict
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            idle = now - session.last_access > self.idle_ttl_seconds
+            if not idle and len(self._sessions) <= self.max_sessions:
+                break
+
+            del self._sessions[session_id]
+            self._bytes -= session.bytes
+            self.evictions += 1
+
+            if self.backend:
+                self.backend.save(session_id, list(session.messages))
+                self.spills += 1
+
+    def _session(self, session_id, create):
+        session = self._sessions.get(session_id)
+        if session is None:
+            stored = self.backend.load(session_id) if self.backend else None
+            if stored is None and not create:
+                return None
+
+            session = _Session(self.max_messages)
+            self._sessions[session_id] = session
+            if stored:
+                self.restores += 1
+                for message in stored:
+                    self._append(session, message)
+
+        session.last_access = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def get(self, session_id):
+        with self._lock:
+            session = self._session(session_id, create=False)
+            history = list(session.messages) if session else []
+            self._evict(time.monotonic())
+            return history
+
+    def update(self, session_id, message):
+        with self._lock:
+            session = self._session(session_id, create=True)
+            self._append(session, message)
+            self._evict(time.monotonic())
+
+    def delete(self, session_id):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session:
+                self._bytes -= session.bytes
+        if self.backend:
+            self.backend.delete(session_id)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "messages": sum(len(s.messages) for s in self._sessions.values()),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "spills": self.spills,
+                "restores": self.restores,
+                "trimmed_messages": self.trimmed_messages,
+            }
+
+
+def _build_store():
+    backend = None
+    if os.getenv("SESSION_BACKEND", "sqlite") == "sqlite":
+        backend = SQLiteSessionBackend(
+            os.getenv("SESSION_DB_PATH", os.path.join(tempfile.gettempdir(), "agent_sessions.sqlite3"))
+        )
+
+    return SessionStore(
+        max_sessions=int(os.getenv("SESSION_MAX_SESSIONS", "10000")),
+        idle_ttl_seconds=float(os.getenv("SESSION_IDLE_TTL_SECONDS", "1800")),
+        max_messages=int(os.getenv("SESSION_MAX_MESSAGES", "50")),
+        max_bytes=int(os.getenv("SESSION_MAX_BYTES", str(64 * 1024))),
+        backend=backend,
+    )
+
+
 class InMemoryStore:
 
-    STORE = {}
+    STORE = _build_store()
 
     @classmethod
     def get(cls, session_id):
-        return cls.STORE.get(session_id, [])
+        return cls.STORE.get(session_id)
 
     @classmethod
     def update(cls, session_id, message):
-        if session_id not in cls.STORE:
-            cls.STORE[session_id] = []
-        cls.STORE[session_id].append(message)
+        cls.STORE.update(session_id, message)
 
+    @classmethod
+    def stats(cls):
+        return cls.STORE.stats()
@@ -0,0 +1,39 @@
+import threading
+from collections import defaultdict, deque
+
+# Keep the most recent samples per metric; enough for stable percentiles
+MAX_SAMPLES = 1000
+
+_SAMPLES = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+_LOCK = threading.Lock()
+
+
+def record(name: str, value: float):
+    with _LOCK:
+        _SAMPLES[name].append(value)
+
+
+def _percentile(values, pct):
+    index = max(0, int(round(pct / 100 * len(values))) - 1)
+    return values[index]
+
+
+def summary(name: str) -> dict:
+    with _LOCK:
+        values = sorted(_SAMPLES.get(name, ()))
+
+    if not values:
+        return {"count": 0}
+
+    return {
+        "count": len(values),
+        "p50": _percentile(values, 50),
+        "p95": _percentile(values, 95),
+        "max": values[-1],
+    }
+
+
+def snapshot() -> dict:
+    with _LOCK:
+        names = list(_SAMPLES)
+    return {name: summary(name) for name in names}
@@ -1,3 +1,4 @@
+from core.intent_router import get_intent_router
 from tools.registry import get_tool
 
 def executor_node(state):
@@ -12,8 +13,11 @@ def executor_node(state):
 
     results = []
 
-    # very simple intent-to-tool mapping
-    if "balance" in user_input and "check_balance" in tools:
+    # Keywords / local classifier first; the LLM only for unclear messages
+    route = get_intent_router(config).route(last_message.content)
+    tool_name = route.tool if route.tool in tools else None
+
+    if tool_name == "check_balance":
         tool = get_tool("check_balance")
 
         if tool:
@@ -22,9 +26,13 @@ def executor_node(state):
             results.append({"error": "Tool not found: check_balance"})
 
 
-    elif "customer" in user_input and "validate_customer" in tools:
+    elif tool_name == "validate_customer":
         tool = get_tool("validate_customer")
         results.append(tool({"customer_id": "CUST001"}))
 
+    elif tool_name == "get_statement":
+        tool = get_tool("get_statement")
+        results.append(tool({"account": "12345678", "months": 1}))
+
     state["tool_results"] = results
     return state
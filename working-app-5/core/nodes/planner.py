@@ -2,13 +2,21 @@ from llm.provider import get_llm
 llm = get_llm()
 
 
-def planner_node(state):
-    prompt = f"""
+def _planner_prompt(state):
+    return f"""
     User Query: {state['messages']}
     Goal: {state['config']['goal']}
     Create simple plan.
     """
 
-    plan = llm.generate(prompt)
+
+def planner_node(state):
+    plan = llm.generate(_planner_prompt(state))
+
+    return {"plan": plan}
+
+
+async def aplanner_node(state):
+    plan = await llm.agenerate(_planner_prompt(state))
 
     return {"plan": plan}
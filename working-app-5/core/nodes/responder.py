@@ -1,10 +1,12 @@
-from llm.provider import get_llm
-llm = get_llm()
+from langgraph.types import StreamWriter
 
+from llm.provider import get_llm
+# Tool results are live data, so responses must never be served from the LLM cache
+llm = get_llm(cache=False)
 
-def responder_node(state):
 
-    prompt = f"""
+def _responder_prompt(state):
+    return f"""
     You are a UK retail banking assistant.
 
     USER QUESTION:
@@ -22,7 +24,30 @@ def responder_node(state):
     Provide a clear answer.
     """
 
-    reply = llm.generate(prompt)
+
+def responder_node(state):
+
+    reply = llm.generate(_responder_prompt(state))
 
     state["response"] = reply
     return state
+
+
+async def aresponder_node(state):
+
+    reply = await llm.agenerate(_responder_prompt(state))
+
+    state["response"] = reply
+    return state
+
+
+async def astream_responder_node(state, writer: StreamWriter):
+
+    # Forward each token to graph.astream(stream_mode="custom") as it arrives
+    tokens = []
+    async for token in llm.astream(_responder_prompt(state)):
+        tokens.append(token)
+        writer({"token": token})
+
+    state["response"] = "".join(tokens)
+    return state
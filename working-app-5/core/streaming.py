@@ -0,0 +1,25 @@
+import time
+
+from core import metrics
+
+
+async def stream_graph(graph, state, config=None):
+    """
+    Run a streaming graph and yield ("token", text) as the responder
+    produces them, then ("done", final_state, ttft_ms) once the run ends.
+    """
+    started = time.perf_counter()
+    ttft_ms = None
+    final_state = {}
+
+    async for mode, chunk in graph.astream(state, config=config, stream_mode=["custom", "values"]):
+        if mode == "custom" and "token" in chunk:
+            if ttft_ms is None:
+                ttft_ms = (time.perf_counter() - started) * 1000
+                metrics.record("time_to_first_token_ms", ttft_ms)
+            yield "token", chunk["token"]
+        elif mode == "values":
+            final_state = chunk
+
+    metrics.record("stream_total_ms", (time.perf_counter() - started) * 1000)
+    yield "done", final_state, ttft_ms
@@ -0,0 +1,140 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+
+class BatchScheduler:
+    """
+    Micro-batching front end for local model backends.
+
+    Prompts submitted within `window_ms` of the first queued prompt (up to
+    `max_batch_size`) are handed to the backend together through its
+    generate_batch(prompts), falling back to generate() per prompt on the
+    scheduler thread. Each caller gets its own Future; if the backend
+    returns fewer results than prompts, the unanswered callers get an
+    exception.
+    """
+
+    def __init__(self, backend, max_batch_size=8, window_ms=10.0, name="batch-scheduler"):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.window_ms = window_ms
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+        self.batches = 0
+        self.requests = 0
+        self._batch_sizes = deque(maxlen=1000)
+        self._queue_wait_ms = deque(maxlen=1000)
+        self._latency_ms = deque(maxlen=1000)
+
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, prompt: str) -> Future:
+        future = Future()
+        self._queue.put((prompt, future, time.monotonic()))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            started = time.monotonic()
+            prompts = [prompt for prompt, _, _ in batch]
+
+            try:
+                if hasattr(self.backend, "generate_batch"):
+                    results = self.backend.generate_batch(prompts)
+                else:
+                    results = [self.backend.generate(prompt) for prompt in prompts]
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                results = None
+
+            finished = time.monotonic()
+            if results is not None:
+                results = list(results)
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+                # A backend that returns fewer results than prompts must not
+                # leave the remaining callers waiting forever
+                for _, future, _ in batch[len(results):]:
+                    future.set_exception(RuntimeError(
+                        f"{type(self.backend).__name__}.generate_batch returned "
+                        f"{len(results)} results for {len(batch)} prompts"
+                    ))
+
+            with self._lock:
+                self.batches += 1
+                self.requests += len(batch)
+                self._batch_sizes.append(len(batch))
+                for _, _, enqueued in batch:
+                    self._queue_wait_ms.append((started - enqueued) * 1000)
+                    self._latency_ms.append((finished - enqueued) * 1000)
+
+    def stats(self) -> dict:
+        def pct(values, p):
+            return values[max(0, int(round(p / 100 * len(values))) - 1)] if values else 0.0
+
+        with self._lock:
+            sizes = list(self._batch_sizes)
+            waits = sorted(self._queue_wait_ms)
+            latencies = sorted(self._latency_ms)
+            elapsed = time.monotonic() - self._started
+
+            return {
+                "window_ms": self.window_ms,
+                "max_batch_size": self.max_batch_size,
+                "batches": self.batches,
+                "requests": self.requests,
+                "queue_depth": self._queue.qsize(),
+                "mean_batch_size": sum(sizes) / len(sizes) if sizes else 0.0,
+                "throughput_per_s": self.requests / elapsed if elapsed else 0.0,
+                "queue_wait_p50_ms": pct(waits, 50),
+                "queue_wait_p95_ms": pct(waits, 95),
+                "latency_p50_ms": pct(latencies, 50),
+                "latency_p95_ms": pct(latencies, 95),
+            }
+
+
+class BatchedLLM:
+    """Routes generate/agenerate for a local backend through a BatchScheduler."""
+
+    def __init__(self, llm, max_batch_size=8, window_ms=10.0):
+        self.llm = llm
+        self.scheduler = BatchScheduler(
+            llm,
+            max_batch_size=max_batch_size,
+            window_ms=window_ms,
+            name=f"batch-{getattr(llm, 'provider', 'llm')}",
+        )
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def generate(self, prompt: str) -> str:
+        return self.scheduler.submit(prompt).result()
+
+    async def agenerate(self, prompt: str) -> str:
+        return await asyncio.wrap_future(self.scheduler.submit(prompt))
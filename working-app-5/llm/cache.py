@@ -0,0 +1,263 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def make_cache_key(provider, model, temperature, prompt: str) -> str:
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return f"{provider}:{model}:{temperature}:{digest}"
+
+
+class LLMCache:
+    """
+    Two-tier response cache.
+
+    Tier 1 is an in-process LRU bounded by entry count, total bytes and TTL.
+    Tier 2 is a SQLite file that survives restarts and is shared by every
+    worker process on the host (WAL mode, one connection per thread).
+    """
+
+    def __init__(self, path=None, ttl_seconds=3600, max_entries=1024, max_bytes=8 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()  # key -> (expires_at, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.path:
+            self._connect()
+
+    # --------------------
+    # SQLite tier
+    # --------------------
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def _disk_get(self, key, now):
+        try:
+            row = self._connect().execute(
+                "SELECT response, expires_at FROM llm_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] disk read failed: {e}")
+            return None
+        return row
+
+    def _disk_put(self, key, value, expires_at):
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            self._writes += 1
+            # Expired rows are purged opportunistically rather than on every write
+            if self._writes % 256 == 0:
+                conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] disk write failed: {e}")
+
+    # --------------------
+    # Memory tier
+    # --------------------
+    def _remember(self, key, value, expires_at):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._bytes -= old[2]
+
+            self._entries[key] = (expires_at, value, size)
+            self._bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def _memory_get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                expires_at, value, size = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self._bytes -= size
+        return None
+
+    def _disk_lookup(self, key, now):
+        row = self._disk_get(key, now)
+        if not row:
+            return None
+        value, expires_at = row
+        self._remember(key, value, expires_at)
+        with self._lock:
+            self.hits += 1
+            self.disk_hits += 1
+        return value
+
+    def _miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def get(self, key):
+        now = time.time()
+        value = self._memory_get(key, now)
+        if value is None and self.path:
+            value = self._disk_lookup(key, now)
+        if value is None:
+            self._miss()
+        return value
+
+    def put(self, key, value: str):
+        if not isinstance(value, str):
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, value, expires_at)
+
+        if self.path:
+            self._disk_put(key, value, expires_at)
+
+    # SQLite calls can wait on the busy timeout and commit on every put, so
+    # the async variants run the disk tier in a worker thread
+    async def aget(self, key):
+        now = time.time()
+        value = self._memory_get(key, now)
+        if value is None and self.path:
+            value = await asyncio.to_thread(self._disk_lookup, key, now)
+        if value is None:
+            self._miss()
+        return value
+
+    async def aput(self, key, value: str):
+        if not isinstance(value, str):
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, value, expires_at)
+
+        if self.path:
+            await asyncio.to_thread(self._disk_put, key, value, expires_at)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.path:
+            conn = self._connect()
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.hits - self.disk_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+class CachedLLM:
+    """Wraps any provider client and serves repeated prompts from LLMCache."""
+
+    def __init__(self, llm, cache: LLMCache):
+        self.llm = llm
+        self.cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def _key(self, prompt):
+        return make_cache_key(
+            getattr(self.llm, "provider", type(self.llm).__name__),
+            getattr(self.llm, "model_name", getattr(self.llm, "model", None)),
+            getattr(self.llm, "temperature", None),
+            prompt,
+        )
+
+    def generate(self, prompt: str) -> str:
+        key = self._key(prompt)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self.llm.generate(prompt)
+        self.cache.put(key, response)
+        return response
+
+    async def agenerate(self, prompt: str) -> str:
+        key = self._key(prompt)
+
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            return cached
+
+        response = await self.llm.agenerate(prompt)
+        await self.cache.aput(key, response)
+        return response
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache() -> LLMCache:
+    global _CACHE
+
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = LLMCache(
+                path=os.getenv("LLM_CACHE_PATH", os.path.join(tempfile.gettempdir(), "llm_cache.sqlite3")),
+                ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600")),
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+                max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(8 * 1024 * 1024))),
+            )
+        return _CACHE
@@ -1,9 +1,53 @@
+import asyncio
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
 from gpt4all import GPT4All
 
 class GPT4AllLLM:
-    def __init__(self):
-        self.model = GPT4All("orca-mini-3b-gguf2-q4_0.gguf")
+    provider = "gptlocal"
+    temperature = None
+
+    def __init__(self, model="orca-mini-3b-gguf2-q4_0.gguf"):
+        self.model_name = model
+        self.model = GPT4All(model)
+        # The local model is not thread-safe, so async callers share one worker
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gpt4all")
 
     def generate(self, prompt):
-        return self.model.generate(prompt)
+        return self.worker.submit(self.model.generate, prompt).result()
+
+    async def agenerate(self, prompt):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.worker, self.model.generate, prompt)
+
+    def stream(self, prompt):
+        # Generate on the worker thread and hand tokens back through a queue
+        tokens = queue.Queue()
+
+        def produce():
+            try:
+                for token in self.model.generate(prompt, streaming=True):
+                    tokens.put(token)
+            finally:
+                tokens.put(None)
+
+        self.worker.submit(produce)
+        while (token := tokens.get()) is not None:
+            yield token
+
+    async def astream(self, prompt):
+        loop = asyncio.get_running_loop()
+        tokens = asyncio.Queue()
+
+        def produce():
+            try:
+                for token in self.model.generate(prompt, streaming=True):
+                    loop.call_soon_threadsafe(tokens.put_nowait, token)
+            finally:
+                loop.call_soon_threadsafe(tokens.put_nowait, None)
+
+        loop.run_in_executor(self.worker, produce)
+        while (token := await tokens.get()) is not None:
+            yield token
 #pip install gpt4all
@@ -1,28 +1,78 @@
 import os
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 
+GROK_BASE_URL = "https://api.x.ai/v1"
+
 class GrokLLM:
 
-    def __init__(self, model="grok-beta"):
+    provider = "grok"
+
+    def __init__(self, model="grok-beta", temperature=0.2, http_client=None, async_http_client=None):
         self.model = model
+        self.temperature = temperature
 
         self.client = OpenAI(
             api_key=os.getenv("GROK_API_KEY"),
-            base_url="https://api.x.ai/v1"
+            base_url=GROK_BASE_URL,
+            http_client=http_client
+        )
+        self.async_client = AsyncOpenAI(
+            api_key=os.getenv("GROK_API_KEY"),
+            base_url=GROK_BASE_URL,
+            http_client=async_http_client
         )
 
+    def _messages(self, prompt):
+        return [
+            {"role": "system", "content": "You are a UK retail banking AI assistant."},
+            {"role": "user", "content": prompt}
+        ]
+
     def generate(self, prompt: str) -> str:
 
         response = self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a UK retail banking AI assistant."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2
+            messages=self._messages(prompt),
+            temperature=self.temperature
+        )
+
+        return response.choices[0].message.content
+
+    async def agenerate(self, prompt: str) -> str:
+
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt),
+            temperature=self.temperature
         )
 
         return response.choices[0].message.content
+
+    def stream(self, prompt: str):
+
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt),
+            temperature=self.temperature,
+            stream=True
+        )
+
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def astream(self, prompt: str):
+
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt),
+            temperature=self.temperature,
+            stream=True
+        )
+
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -1,15 +1,25 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
+from huggingface_hub import AsyncInferenceClient, InferenceClient
 
 load_dotenv()
 
 class HuggingFaceLLM:
 
-    def __init__(self, model="facebook/opt-1.3b"):
+    provider = "huggingface"
+
+    def __init__(self, model="facebook/opt-1.3b", temperature=0.7):
         self.api_key = os.getenv("HUGGINGFACE_API_KEY")
         self.client = InferenceClient(token=self.api_key)
+        self.async_client = AsyncInferenceClient(token=self.api_key)
         self.model = model
+        self.temperature = temperature
+        # Kept for the life of the client so a batch does not spin up new threads
+        self.batch_pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv("LLM_BATCH_MAX_SIZE", "8")),
+            thread_name_prefix="huggingface-batch",
+        )
 
     def generate(self, prompt: str) -> str:
 
@@ -17,7 +27,46 @@ class HuggingFaceLLM:
             prompt,
             model=self.model,
             max_new_tokens=150,
-            temperature=0.7
+            temperature=self.temperature
+        )
+
+        return result
+
+    def generate_batch(self, prompts):
+        # The hosted text-generation endpoint takes one prompt per request,
+        # so a batch is sent as concurrent requests over the shared client
+        return list(self.batch_pool.map(self.generate, prompts))
+
+    async def agenerate(self, prompt: str) -> str:
+
+        result = await self.async_client.text_generation(
+            prompt,
+            model=self.model,
+            max_new_tokens=150,
+            temperature=self.temperature
         )
 
         return result
+
+    def stream(self, prompt: str):
+
+        yield from self.client.text_generation(
+            prompt,
+            model=self.model,
+            max_new_tokens=150,
+            temperature=self.temperature,
+            stream=True
+        )
+
+    async def astream(self, prompt: str):
+
+        tokens = await self.async_client.text_generation(
+            prompt,
+            model=self.model,
+            max_new_tokens=150,
+            temperature=self.temperature,
+            stream=True
+        )
+
+        async for token in tokens:
+            yield token
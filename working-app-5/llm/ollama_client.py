@@ -2,8 +2,12 @@ import ollama
 
 class OllamaLLM:
 
+    provider = "ollama"
+    temperature = None
+
     def __init__(self, model="mistral"):
         self.model = model
+        self.async_client = ollama.AsyncClient()
 
     def generate(self, prompt: str) -> str:
         response = ollama.chat(
@@ -11,5 +15,26 @@ class OllamaLLM:
             messages=[{"role": "user", "content": prompt}]
         )
         return response["message"]["content"]
-    
 
+    async def agenerate(self, prompt: str) -> str:
+        response = await self.async_client.chat(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return response["message"]["content"]
+
+    def stream(self, prompt: str):
+        for chunk in ollama.chat(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True
+        ):
+            yield chunk["message"]["content"]
+
+    async def astream(self, prompt: str):
+        async for chunk in await self.async_client.chat(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True
+        ):
+            yield chunk["message"]["content"]
@@ -1,24 +1,67 @@
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 load_dotenv()
 
 class OpenAILLM:
 
-    def __init__(self, model="gpt-3.5-turbo"):
+    provider = "openai"
+
+    def __init__(self, model="gpt-3.5-turbo", temperature=0.2, http_client=None, async_http_client=None):
         self.model = model
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.temperature = temperature
+        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client)
+        self.async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=async_http_client)
+
+    def _messages(self, prompt):
+        return [
+            {"role": "system", "content": "You are a UK retail banking assistant."},
+            {"role": "user", "content": prompt}
+        ]
 
     def generate(self, prompt: str) -> str:
 
         response = self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a UK retail banking assistant."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2
+            messages=self._messages(prompt),
+            temperature=self.temperature
+        )
+
+        return response.choices[0].message.content
+
+    async def agenerate(self, prompt: str) -> str:
+
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt),
+            temperature=self.temperature
         )
 
         return response.choices[0].message.content
+
+    def stream(self, prompt: str):
+
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt),
+            temperature=self.temperature,
+            stream=True
+        )
+
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def astream(self, prompt: str):
+
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt),
+            temperature=self.temperature,
+            stream=True
+        )
+
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -1,25 +1,22 @@
-# import os
-# from llm.grok_client import GrokLLM
-# from llm.ollama_client import OllamaLLM
-# from llm.huggingface_client import HuggingFaceLLM
-# from llm.gpt4all import GPT4AllLLM
-from llm.openai_client import OpenAILLM
+import os
+from llm.cache import CachedLLM, get_cache
+from llm.registry import get_client
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
-def get_llm():
-    # provider = os.getenv("LLM_CLIENT","openai")
-    # print(f"Using LLM provider: {os.getenv("LLM_CLIENT")}")
-    
-    # if provider == "openai":
-    return OpenAILLM()
-    # if provider == "grok":
-    #     return GrokLLM()
-    # if provider == "ollama":
-    #     return OllamaLLM()
-    # if provider == "gptlocal":
-    #     return GPT4AllLLM()
-    # if provider == "huggingface":
-    #     return HuggingFaceLLM(model="gpt-neo-125M")
+def get_llm(provider=None, model=None, cache=None, **params):
+    # Supported providers: openai, grok, ollama, gptlocal, huggingface
+    provider = provider or os.getenv("LLM_CLIENT", "openai")
+
+    # Clients are shared process-wide, keyed by (provider, model, params)
+    llm = get_client(provider, model, **params)
+
+    # Nodes whose prompts carry live data can opt out with get_llm(cache=False)
+    if cache is None:
+        cache = os.getenv("LLM_CACHE_ENABLED", "true") == "true"
+
+    if cache:
+        return CachedLLM(llm, get_cache())
+    return llm
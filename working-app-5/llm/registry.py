@@ -0,0 +1,162 @@
+import asyncio
+import os
+import threading
+
+import httpx
+from dotenv import load_dotenv
+
+from llm.batching import BatchedLLM
+
+load_dotenv()
+
+# One client per (provider, model, params) for the whole process, so every
+# node shares the same keep-alive connection pool instead of building its own.
+_CLIENTS = {}
+_HTTP_CLIENT = None
+_ASYNC_HTTP_CLIENT = None
+_LOCK = threading.RLock()
+
+
+def _pool_settings():
+    return {
+        "limits": httpx.Limits(
+            max_connections=int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(os.getenv("LLM_POOL_KEEPALIVE_SECONDS", "60")),
+        ),
+        "timeout": httpx.Timeout(float(os.getenv("LLM_TIMEOUT_SECONDS", "60")), connect=5.0),
+    }
+
+
+def get_http_client() -> httpx.Client:
+    global _HTTP_CLIENT
+
+    with _LOCK:
+        if _HTTP_CLIENT is None:
+            _HTTP_CLIENT = httpx.Client(**_pool_settings())
+        return _HTTP_CLIENT
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    global _ASYNC_HTTP_CLIENT
+
+    with _LOCK:
+        if _ASYNC_HTTP_CLIENT is None:
+            _ASYNC_HTTP_CLIENT = httpx.AsyncClient(**_pool_settings())
+        return _ASYNC_HTTP_CLIENT
+
+
+def _batched(llm):
+    # Put a micro-batcher in front of backends that can serve a batch at once
+    if os.getenv("LLM_BATCHING_ENABLED", "true") != "true":
+        return llm
+    return BatchedLLM(
+        llm,
+        max_batch_size=int(os.getenv("LLM_BATCH_MAX_SIZE", "8")),
+        window_ms=float(os.getenv("LLM_BATCH_WINDOW_MS", "10")),
+    )
+
+
+def _build(provider, model, params):
+    kwargs = dict(params)
+    if model:
+        kwargs["model"] = model
+
+    if provider == "openai":
+        from llm.openai_client import OpenAILLM
+        return OpenAILLM(http_client=get_http_client(), async_http_client=get_async_http_client(), **kwargs)
+    if provider == "grok":
+        from llm.grok_client import GrokLLM
+        return GrokLLM(http_client=get_http_client(), async_http_client=get_async_http_client(), **kwargs)
+    if provider == "ollama":
+        from llm.ollama_client import OllamaLLM
+        return OllamaLLM(**kwargs)
+    if provider == "gptlocal":
+        from llm.gpt4all import GPT4AllLLM
+        # GPT4All decodes one prompt at a time on a single model thread,
+        # so batching would only add the window to every call
+        return GPT4AllLLM(**kwargs)
+    if provider == "huggingface":
+        from llm.huggingface_client import HuggingFaceLLM
+        kwargs.setdefault("model", "gpt-neo-125M")
+        return _batched(HuggingFaceLLM(**kwargs))
+
+    raise ValueError(f"Unknown LLM_CLIENT: {provider}")
+
+
+def _base_url(client):
+    base_url = getattr(getattr(client, "client", None), "base_url", None)
+    return str(base_url) if base_url else None
+
+
+def warm_up(client):
+    # Open the TCP/TLS connection up front so the first user request
+    # does not pay for the handshake.
+    base_url = _base_url(client)
+    if not base_url:
+        return
+    try:
+        get_http_client().head(base_url, timeout=5.0)
+    except httpx.HTTPError as e:
+        print(f"[LLMRegistry] warm-up failed for {base_url}: {e}")
+
+
+async def awarm_up():
+    """
+    Warm the async pool for every client built so far. The pool is bound to
+    the event loop that uses it, so this runs on the server's loop at startup.
+    """
+    if os.getenv("LLM_POOL_WARMUP", "true") != "true":
+        return
+    with _LOCK:
+        urls = {url for url in map(_base_url, _CLIENTS.values()) if url}
+    client = get_async_http_client()
+
+    async def head(url):
+        try:
+            await client.head(url, timeout=5.0)
+        except httpx.HTTPError as e:
+            print(f"[LLMRegistry] async warm-up failed for {url}: {e}")
+
+    await asyncio.gather(*(head(url) for url in urls))
+
+
+def get_client(provider, model=None, **params):
+    key = (provider, model, tuple(sorted(params.items())))
+
+    with _LOCK:
+        client = _CLIENTS.get(key)
+        if client is not None:
+            return client
+        client = _CLIENTS[key] = _build(provider, model, params)
+
+    # Off the lock and off the caller's thread: nodes build their clients at
+    # import time, and a slow endpoint must not hold up imports or other lookups
+    if os.getenv("LLM_POOL_WARMUP", "true") == "true":
+        threading.Thread(target=warm_up, args=(client,), name="llm-warm-up", daemon=True).start()
+    return client
+
+
+def registry_stats() -> dict:
+    with _LOCK:
+        return {
+            "clients": len(_CLIENTS),
+            "keys": [f"{p}:{m}" for p, m, _ in _CLIENTS],
+            "batching": {
+                f"{p}:{m}": client.scheduler.stats()
+                for (p, m, _), client in _CLIENTS.items()
+                if isinstance(client, BatchedLLM)
+            },
+        }
+
+
+def close_all():
+    global _HTTP_CLIENT, _ASYNC_HTTP_CLIENT
+
+    with _LOCK:
+        _CLIENTS.clear()
+        if _HTTP_CLIENT is not None:
+            _HTTP_CLIENT.close()
+            _HTTP_CLIENT = None
+        # The async pool is bound to its event loop; let it be garbage collected
+        _ASYNC_HTTP_CLIENT = None
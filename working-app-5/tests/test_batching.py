@@ -0,0 +1,83 @@
+# tests/test_batching.py
+import threading
+
+import pytest
+
+from llm.batching import BatchedLLM, BatchScheduler
+
+
+class EchoBackend:
+    provider = "echo"
+
+    def __init__(self, drop=0):
+        self.drop = drop
+        self.batches = []
+
+    def generate_batch(self, prompts):
+        self.batches.append(list(prompts))
+        answers = [f"answer to {p}" for p in prompts]
+        return answers[:len(answers) - self.drop]
+
+
+def submit_together(scheduler, prompts):
+    # The tests use a long window, so these land in one batch
+    return [scheduler.submit(prompt) for prompt in prompts]
+
+
+def test_prompts_in_one_window_share_a_batch_and_keep_their_answers():
+    backend = EchoBackend()
+    scheduler = BatchScheduler(backend, max_batch_size=3, window_ms=200)
+    futures = submit_together(scheduler, ["a", "b", "c", "d"])
+
+    assert [f.result(timeout=2) for f in futures] == ["answer to a", "answer to b", "answer to c", "answer to d"]
+    assert backend.batches == [["a", "b", "c"], ["d"]]
+    assert scheduler.stats()["requests"] == 4
+
+
+def test_short_results_fail_the_unanswered_callers():
+    scheduler = BatchScheduler(EchoBackend(drop=1), max_batch_size=3, window_ms=200)
+    first, second, third = submit_together(scheduler, ["a", "b", "c"])
+
+    assert first.result(timeout=2) == "answer to a"
+    assert second.result(timeout=2) == "answer to b"
+    with pytest.raises(RuntimeError, match="2 results for 3 prompts"):
+        third.result(timeout=2)
+
+
+def test_backend_errors_reach_every_caller():
+    class Broken:
+        def generate_batch(self, prompts):
+            raise ValueError("model unloaded")
+
+    futures = submit_together(BatchScheduler(Broken(), window_ms=200), ["a", "b"])
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result(timeout=2)
+
+
+def test_backends_without_generate_batch_fall_back_to_generate():
+    class Single:
+        provider = "single"
+
+        def generate(self, prompt):
+            return prompt.upper()
+
+    assert BatchedLLM(Single(), window_ms=1).generate("hi") == "HI"
+
+
+def test_huggingface_batches_reuse_one_pool(monkeypatch):
+    pytest.importorskip("huggingface_hub")
+    from llm.huggingface_client import HuggingFaceLLM
+
+    llm = HuggingFaceLLM()
+    threads = set()
+
+    def generate(prompt):
+        threads.add(threading.current_thread().name)
+        return prompt
+
+    monkeypatch.setattr(llm, "generate", generate)
+    for _ in range(3):
+        assert llm.generate_batch(["a", "b"]) == ["a", "b"]
+    assert all(name.startswith("huggingface-batch") for name in threads)
+    assert len(threads) <= llm.batch_pool._max_workers
@@ -0,0 +1,144 @@
+# tests/test_checkpoint.py
+import operator
+from typing import Annotated, List, TypedDict
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from core.checkpoint import SQLiteDeltaSaver
+
+
+class TurnState(TypedDict, total=False):
+    messages: Annotated[List[str], operator.add]
+    turns: int
+
+
+def build_app(saver):
+    def respond(state):
+        return {"messages": [f"reply {len(state['messages'])}"], "turns": state.get("turns", 0) + 1}
+
+    graph = StateGraph(TurnState)
+    graph.add_node("respond", respond)
+    graph.add_edge(START, "respond")
+    graph.add_edge("respond", END)
+    return graph.compile(checkpointer=saver)
+
+
+def blob_count(saver, thread_id):
+    return saver._conn().execute(
+        "SELECT COUNT(*) FROM channel_blobs WHERE thread_id = ?", (thread_id,)
+    ).fetchone()[0]
+
+
+@pytest.fixture
+def saver(tmp_path):
+    return SQLiteDeltaSaver(str(tmp_path / "checkpoints.sqlite3"), keep_last=2, compact_every=3)
+
+
+def test_put_and_get_tuple_round_trip(saver):
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": ["hi"], "turns": 1}
+    checkpoint["channel_versions"] = {"messages": saver.get_next_version(None, None),
+                                      "turns": saver.get_next_version(None, None)}
+    config = {"configurable": {"thread_id": "t1", "checkpoint_ns": ""}}
+
+    saved = saver.put(config, checkpoint, {"source": "input", "step": -1}, checkpoint["channel_versions"])
+    saver.put_writes(saved, [("messages", ["pending"]), ("turns", 2)], task_id="task-1")
+
+    loaded = saver.get_tuple(saved)
+    assert loaded.config == saved
+    assert loaded.parent_config is None
+    assert loaded.checkpoint["id"] == checkpoint["id"]
+    assert loaded.checkpoint["channel_values"] == {"messages": ["hi"], "turns": 1}
+    assert loaded.metadata == {"source": "input", "step": -1}
+    assert loaded.pending_writes == [("task-1", "messages", ["pending"]), ("task-1", "turns", 2)]
+    # Without a checkpoint_id the latest checkpoint comes back
+    assert saver.get_tuple(config).config == saved
+
+
+def test_unchanged_channels_are_not_rewritten(saver):
+    first = empty_checkpoint()
+    first["channel_values"] = {"messages": ["hi"], "turns": 1}
+    first["channel_versions"] = {"messages": "1", "turns": "1"}
+    config = saver.put({"configurable": {"thread_id": "t1"}}, first, {}, first["channel_versions"])
+
+    second = empty_checkpoint()
+    second["channel_values"] = {"messages": ["hi"], "turns": 2}
+    second["channel_versions"] = {"messages": "1", "turns": "2"}
+    saved = saver.put(config, second, {}, {"turns": "2"})
+
+    assert blob_count(saver, "t1") == 3
+    loaded = saver.get_tuple(saved)
+    assert loaded.checkpoint["channel_values"] == {"messages": ["hi"], "turns": 2}
+    assert loaded.parent_config == config
+
+
+def run_turns(saver, messages, thread_id="session-1"):
+    app = build_app(saver)
+    config = {"configurable": {"thread_id": thread_id}}
+    for message in messages:
+        app.invoke({"messages": [message]}, config)
+    return app, config
+
+
+def snapshot(entry):
+    # Task ids and checkpoint ids are generated per run; compare everything else
+    return (
+        entry.metadata["step"],
+        entry.checkpoint["channel_values"],
+        sorted((channel, repr(value)) for _, channel, value in entry.pending_writes),
+    )
+
+
+def test_graph_history_matches_in_memory_saver(tmp_path):
+    saver = SQLiteDeltaSaver(str(tmp_path / "checkpoints.sqlite3"), keep_last=100)
+    app, config = run_turns(saver, ["hello", "again"])
+    reference_saver = InMemorySaver()
+    _, reference_config = run_turns(reference_saver, ["hello", "again"])
+
+    assert app.get_state(config).values == {"messages": ["hello", "reply 1", "again", "reply 3"], "turns": 2}
+
+    history = list(saver.list(config))
+    assert [snapshot(e) for e in history] == [snapshot(e) for e in reference_saver.list(reference_config)]
+    ids = [entry.config["configurable"]["checkpoint_id"] for entry in history]
+    assert ids == sorted(ids, reverse=True)
+    assert [entry.parent_config for entry in history[:-1]] == [entry.config for entry in history[1:]]
+
+    assert len(list(saver.list(config, limit=2))) == 2
+    assert [e.metadata["step"] for e in saver.list(config, before=history[2].config)] == [1, 0, -1]
+    assert [e.metadata["step"] for e in saver.list(config, filter={"source": "input"})] == [2, -1]
+
+
+def test_compaction_keeps_the_latest_checkpoints_and_their_blobs(saver):
+    messages = [f"message {i}" for i in range(5)]
+    app, config = run_turns(saver, messages)
+    reference_saver = InMemorySaver()
+    _, reference_config = run_turns(reference_saver, messages)
+
+    history = list(saver.list(config))
+    assert saver.keep_last <= len(history) < saver.keep_last + saver.compact_every
+    assert history[-1].parent_config is None
+    # Every surviving checkpoint still loads the same state it was saved with
+    reference = {e.metadata["step"]: snapshot(e) for e in reference_saver.list(reference_config)}
+    for entry in history:
+        assert snapshot(entry) == reference[entry.metadata["step"]]
+    assert app.get_state(config).values["turns"] == 5
+
+    saver.compact("session-1")
+    kept = list(saver.list(config))
+    assert len(kept) == saver.keep_last
+    referenced = {(channel, str(version)) for entry in kept
+                  for channel, version in entry.checkpoint["channel_versions"].items()}
+    stored = set(saver._conn().execute(
+        "SELECT channel, version FROM channel_blobs WHERE thread_id = ?", ("session-1",)
+    ).fetchall())
+    assert stored <= referenced
+
+    saver.delete_thread("session-1")
+    assert saver.get_tuple(config) is None
+    assert blob_count(saver, "session-1") == 0
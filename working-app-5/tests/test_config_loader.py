@@ -0,0 +1,34 @@
+# tests/test_config_loader.py
+import time
+
+from core.config_loader import AgentConfigRegistry
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_watcher_reloads_changed_files_and_can_be_stopped_and_restarted(tmp_path):
+    path = tmp_path / "teller.yaml"
+    path.write_text("agent_id: teller\ntools: [check_balance]\n")
+    registry = AgentConfigRegistry(tmp_path)
+
+    registry.start_watching(0.01)
+    path.write_text("agent_id: teller\ntools: [check_balance, get_statement]\n")
+    assert wait_for(lambda: registry.get("teller")["tools"] == ("check_balance", "get_statement"))
+
+    watcher = registry._watcher
+    registry.stop_watching()
+    assert not watcher.is_alive()
+    path.write_text("agent_id: teller\ntools: []\n")
+    time.sleep(0.05)
+    assert registry.get("teller")["tools"] == ("check_balance", "get_statement")
+
+    registry.start_watching(0.01)
+    assert wait_for(lambda: registry.get("teller")["tools"] == ())
+    registry.stop_watching()
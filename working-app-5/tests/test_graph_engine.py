@@ -0,0 +1,66 @@
+# tests/test_graph_engine.py
+from dataclasses import replace
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langchain_core.messages import HumanMessage
+
+
+@pytest.fixture
+def graph_engine(monkeypatch):
+    # The planner and responder build their LLM clients at import time
+    monkeypatch.setenv("LLM_CLIENT", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("LLM_POOL_WARMUP", "false")
+    from core import graph_engine
+    return graph_engine
+
+
+def test_find_dead_outputs_follows_reads_backwards(graph_engine):
+    assert graph_engine.find_dead_outputs() == {"planner": ["plan"], "monitor": ["status"]}
+    # Asking for the plan keeps the planner, and everything it reads stays live
+    assert graph_engine.find_dead_outputs(outputs=("response", "plan")) == {"monitor": ["status"]}
+    assert graph_engine.find_dead_outputs(outputs=()) == {
+        "planner": ["plan"], "executor": ["tool_results"], "monitor": ["status"], "responder": ["response"],
+    }
+
+
+def test_pruned_graph_skips_dead_nodes_and_returns_the_same_response(graph_engine, monkeypatch):
+    ran = []
+
+    def fake(name, update):
+        def node(state):
+            ran.append(name)
+            return update(state)
+        return node
+
+    funcs = {
+        "planner": fake("planner", lambda s: {"plan": "1. look up the balance"}),
+        "executor": fake("executor", lambda s: {"tool_results": [{"balance": 100, "asked": s["messages"][-1].content}]}),
+        "monitor": fake("monitor", lambda s: {}),
+        "responder": fake("responder", lambda s: {"response": f"Your balance is {s['tool_results'][0]['balance']}"}),
+    }
+    monkeypatch.setattr(graph_engine, "NODES", tuple(replace(n, func=funcs[n.name]) for n in graph_engine.NODES))
+
+    def run(**kwargs):
+        ran.clear()
+        graph = graph_engine.build_graph(**kwargs)
+        result = graph.invoke({"messages": [HumanMessage(content="what's my balance?")], "config": {}, "history": []})
+        nodes = [n for n in graph.get_graph().nodes if not n.startswith("__")]
+        return result, nodes, list(ran)
+
+    full, full_nodes, full_ran = run(prune=False)
+    pruned, pruned_nodes, pruned_ran = run()
+
+    assert full_nodes == full_ran == ["planner", "executor", "monitor", "responder"]
+    assert pruned_nodes == pruned_ran == ["executor", "responder"]
+    assert pruned["response"] == full["response"] == "Your balance is 100"
+    assert pruned["tool_results"] == full["tool_results"]
+    assert "plan" not in pruned and full["plan"] == "1. look up the balance"
+
+    # Asking for the plan puts the planner back
+    with_plan, _, ran_with_plan = run(outputs=("response", "plan"))
+    assert ran_with_plan == ["planner", "executor", "responder"]
+    assert with_plan["plan"] == full["plan"]
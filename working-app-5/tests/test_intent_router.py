@@ -0,0 +1,57 @@
+# tests/test_intent_router.py
+import pytest
+
+from core.intent_router import INTENTS, IntentRouter
+
+
+class FakeLLM:
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def generate(self, prompt):
+        self.prompts.append(prompt)
+        return self.reply
+
+
+@pytest.fixture(scope="module")
+def router():
+    return IntentRouter(list(INTENTS), llm_fallback=False)
+
+
+def test_read_intents_are_answered_by_keywords(router):
+    assert router.route("what is my balance").to_dict()["source"] == "keyword"
+    assert router.route("show my transfer history").intent == "transactions"
+    assert router.route("send me my bank statement").tool == "get_statement"
+
+
+@pytest.mark.parametrize("message", [
+    "pay 50 to 87654321",
+    "transfer 200 to account 11223344",
+    "I want to make a payment",
+])
+def test_payment_needs_the_classifier_not_just_a_keyword(router, message):
+    route = router.route(message)
+    assert (route.intent, route.source) == ("payment", "classifier")
+
+
+@pytest.mark.parametrize("message", [
+    "can you cancel the transfer of 20 to 11112222",
+    "how much did I pay to 12345679 for 50 last week?",
+    "don't pay John",
+    "stop the payment to mum",
+    "show my transfer history",
+])
+def test_questions_negations_and_cancellations_never_route_to_payment(router, message):
+    route = router.route(message)
+    assert route.intent != "payment"
+    assert route.tool != "make_payment"
+
+
+def test_llm_fallback_cannot_pick_payment_for_a_question():
+    llm = FakeLLM("payment")
+    router = IntentRouter(list(INTENTS), samples=[], llm=llm)
+
+    assert router.route("did my transfer to mum go through?").intent == "other"
+    assert router.route("move my rent over to the landlord").intent == "payment"
+    assert len(llm.prompts) == 2
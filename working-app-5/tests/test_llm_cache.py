@@ -0,0 +1,55 @@
+# tests/test_llm_cache.py
+import asyncio
+import threading
+
+from llm.cache import CachedLLM, LLMCache
+
+
+class FakeLLM:
+    provider = "fake"
+    model_name = "fake-model"
+    temperature = 0
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt):
+        self.calls += 1
+        return f"answer to {prompt}"
+
+    async def agenerate(self, prompt):
+        return self.generate(prompt)
+
+
+def test_agenerate_runs_the_disk_tier_off_the_event_loop(tmp_path, monkeypatch):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    llm = FakeLLM()
+    assert asyncio.run(CachedLLM(llm, LLMCache(path)).agenerate("hi")) == "answer to hi"
+
+    # A fresh process-local tier: the answer comes back from SQLite
+    cache = LLMCache(path)
+    disk_threads = []
+    disk_get = cache._disk_get
+
+    def recording_disk_get(key, now):
+        disk_threads.append(threading.current_thread())
+        return disk_get(key, now)
+
+    monkeypatch.setattr(cache, "_disk_get", recording_disk_get)
+
+    async def twice():
+        cached = CachedLLM(llm, cache)
+        return await cached.agenerate("hi"), await cached.agenerate("hi"), threading.current_thread()
+
+    first, second, loop_thread = asyncio.run(twice())
+    assert first == second == "answer to hi"
+    assert llm.calls == 1
+    assert len(disk_threads) == 1 and disk_threads[0] is not loop_thread
+    assert cache.stats()["disk_hits"] == 1 and cache.stats()["memory_hits"] == 1
+
+
+def test_sync_and_async_paths_count_misses_once(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm_cache.sqlite3"))
+    assert cache.get("missing") is None
+    assert asyncio.run(cache.aget("missing")) is None
+    assert cache.stats()["misses"] == 2
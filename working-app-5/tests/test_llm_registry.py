@@ -0,0 +1,72 @@
+# tests/test_llm_registry.py
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from llm import registry
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    monkeypatch.setattr(registry, "_CLIENTS", {})
+    monkeypatch.setattr(registry, "_ASYNC_HTTP_CLIENT", None)
+    monkeypatch.setenv("LLM_POOL_WARMUP", "true")
+
+    def build(provider, model, params):
+        return SimpleNamespace(client=SimpleNamespace(base_url=f"https://{provider}.example/v1"))
+
+    monkeypatch.setattr(registry, "_build", build)
+
+
+def test_get_client_warms_up_in_the_background_without_the_lock(clients, monkeypatch):
+    release = threading.Event()
+    warming = []
+
+    def slow_warm_up(client):
+        warming.append(threading.current_thread())
+        release.wait(5)
+
+    monkeypatch.setattr(registry, "warm_up", slow_warm_up)
+
+    first = registry.get_client("openai")
+    # The endpoint is still "slow", yet lookups and new clients do not wait for it
+    assert registry.get_client("openai") is first
+    registry.get_client("grok")
+
+    lock_free = []
+
+    def take_lock():
+        lock_free.append(registry._LOCK.acquire(timeout=1))
+        if lock_free[-1]:
+            registry._LOCK.release()
+
+    other = threading.Thread(target=take_lock)
+    other.start()
+    other.join()
+    release.set()
+
+    assert lock_free == [True]
+    assert len(warming) == 2 and threading.current_thread() not in warming
+
+
+def test_awarm_up_opens_the_async_pool_for_each_endpoint(clients, monkeypatch):
+    monkeypatch.setattr(registry, "warm_up", lambda client: None)
+    registry.get_client("openai")
+    registry.get_client("openai", "gpt-4o-mini")
+    registry.get_client("grok")
+
+    seen = []
+
+    def handler(request):
+        seen.append((request.method, str(request.url)))
+        return httpx.Response(200)
+
+    async def main():
+        registry._ASYNC_HTTP_CLIENT = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await registry.awarm_up()
+
+    asyncio.run(main())
+    assert sorted(seen) == [("HEAD", "https://grok.example/v1"), ("HEAD", "https://openai.example/v1")]
@@ -0,0 +1,92 @@
+# tests/test_tool_registry.py
+import pytest
+
+from tools import registry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(registry, "time", clock)
+    monkeypatch.setattr(registry, "CACHE", registry.ToolResultCache())
+    monkeypatch.setattr(registry, "TOOLS", {})
+    monkeypatch.setattr(registry, "TOOL_SPECS", {})
+    return clock
+
+
+@pytest.fixture
+def tools(clock):
+    calls = []
+    balances = {"11112222": 100, "33334444": 500}
+
+    @registry.register_tool("balance", read_only=True, ttl=30)
+    def balance(data):
+        calls.append(("balance", data["account"]))
+        return {"account_number": data["account"], "balance": balances[data["account"]]}
+
+    @registry.register_tool("transfer")
+    def transfer(data):
+        calls.append(("transfer", data["from_account"]))
+        balances[data["from_account"]] -= data["amount"]
+        balances[data["to_account"]] += data["amount"]
+        return {"status": "success"}
+
+    return calls
+
+
+def test_read_only_results_are_memoized_until_the_ttl_expires(clock, tools):
+    balance = registry.get_tool("balance")
+
+    assert balance({"account": "11112222"}) == {"account_number": "11112222", "balance": 100}
+    # Whitespace and key order do not change the cache key
+    assert balance({"account": " 11112222 "})["balance"] == 100
+    clock.now += 29
+    balance({"account": "11112222"})
+    assert tools == [("balance", "11112222")]
+
+    clock.now += 2
+    balance({"account": "11112222"})
+    assert tools == [("balance", "11112222")] * 2
+
+    stats = registry.tool_stats()["balance"]
+    assert (stats["calls"], stats["hits"], stats["misses"]) == (4, 2, 2)
+
+
+def test_cached_results_are_copies(clock, tools):
+    balance = registry.get_tool("balance")
+    balance({"account": "11112222"})["balance"] = -1
+    assert balance({"account": "11112222"})["balance"] == 100
+
+
+def test_invalidate_drops_only_the_given_accounts(clock, tools):
+    balance = registry.get_tool("balance")
+    balance({"account": "11112222"})
+    balance({"account": "33334444"})
+
+    registry.CACHE.invalidate({"11112222"})
+    balance({"account": "11112222"})
+    balance({"account": "33334444"})
+
+    assert tools == [("balance", "11112222"), ("balance", "33334444"), ("balance", "11112222")]
+    assert registry.tool_stats()["balance"]["invalidations"] == 1
+
+
+def test_a_write_invalidates_cached_reads_for_the_accounts_it_touches(clock, tools):
+    balance, transfer = registry.get_tool("balance"), registry.get_tool("transfer")
+    assert registry.TOOL_SPECS["transfer"] == {"read_only": False, "ttl": None}
+
+    assert balance({"account": "11112222"})["balance"] == 100
+    assert balance({"account": "33334444"})["balance"] == 500
+    transfer({"from_account": "11112222", "to_account": "33334444", "amount": 40})
+
+    assert balance({"account": "11112222"})["balance"] == 60
+    assert balance({"account": "33334444"})["balance"] == 540
+    assert registry.CACHE.entries("balance") == 2
@@ -1,6 +1,6 @@
 from tools.registry import register_tool
 
-@register_tool("check_balance")
+@register_tool("check_balance", read_only=True)
 def check_balance(data):
     return {
         "account_number": "12345678",
@@ -8,9 +8,20 @@ def check_balance(data):
         "currency": "GBP"
     }
 
-@register_tool("validate_customer")
+@register_tool("validate_customer", read_only=True, ttl=300)
 def validate_customer(data):
     return {
         "customer_id": data.get("customer_id"),
         "status": "VALID"
     }
+
+@register_tool("get_statement", read_only=True, ttl=300)
+def get_statement(data):
+    return {
+        "account_number": data.get("account", "12345678"),
+        "period_months": data.get("months", 1),
+        "transactions": [
+            {"id": "1", "amount": -12.50, "desc": "Coffee"},
+            {"id": "2", "amount": -120.00, "desc": "Grocery"}
+        ]
+    }
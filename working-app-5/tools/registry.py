@@ -1,10 +1,174 @@
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
 TOOLS = {}
+TOOL_SPECS = {}
+
+# Argument / result fields that identify the account a tool reads or changes
+ACCOUNT_FIELDS = ("account", "account_number", "account_id", "from_account", "to_account")
+
+
+def _normalize(value):
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in sorted(value.items()) if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def _accounts(value, found=None):
+    found = set() if found is None else found
+    if isinstance(value, dict):
+        for k, v in value.items():
+            if k in ACCOUNT_FIELDS and isinstance(v, (str, int)):
+                found.add(str(v).strip())
+            else:
+                _accounts(v, found)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _accounts(v, found)
+    return found
+
+
+class ToolResultCache:
+    """
+    TTL memo for read-only tool results keyed by (tool, normalized args),
+    with an index from account to cache keys so write tools can drop every
+    cached read for the accounts they touch.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, accounts, result)
+        self._by_account = {}          # account -> set(key)
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def _tool_stats(self, tool):
+        return self.stats.setdefault(tool, {"calls": 0, "hits": 0, "misses": 0, "invalidations": 0})
+
+    def _drop(self, key):
+        _, accounts, _ = self._entries.pop(key)
+        for account in accounts:
+            keys = self._by_account.get(account)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._by_account[account]
+
+    def get(self, tool, key):
+        with self._lock:
+            stats = self._tool_stats(tool)
+            stats["calls"] += 1
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                stats["hits"] += 1
+                return True, entry[2]
+            if entry:
+                self._drop(key)
+            stats["misses"] += 1
+            return False, None
+
+    def record_call(self, tool):
+        with self._lock:
+            self._tool_stats(tool)["calls"] += 1
 
-def register_tool(name):
+    def put(self, key, result, accounts, ttl):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, accounts, result)
+            for account in accounts:
+                self._by_account.setdefault(account, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, accounts):
+        with self._lock:
+            for account in accounts:
+                for key in list(self._by_account.get(account, ())):
+                    self._tool_stats(key[0])["invalidations"] += 1
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_account.clear()
+
+    def entries(self, tool):
+        with self._lock:
+            return sum(1 for key in self._entries if key[0] == tool)
+
+
+CACHE = ToolResultCache(max_entries=int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "4096")))
+DEFAULT_TTL = float(os.getenv("TOOL_CACHE_TTL_SECONDS", "30"))
+
+
+def _memoized(name, func, ttl):
+    def call(data):
+        key = (name, json.dumps(_normalize(data or {}), sort_keys=True, default=str))
+        hit, result = CACHE.get(name, key)
+        if hit:
+            # Callers may mutate results; never hand out the cached object
+            return copy.deepcopy(result)
+
+        result = func(data)
+        if ttl > 0 and not (isinstance(result, dict) and "error" in result):
+            CACHE.put(key, copy.deepcopy(result), _accounts(data) | _accounts(result), ttl)
+        return result
+    return call
+
+
+def _invalidating(name, func):
+    def call(data):
+        CACHE.record_call(name)
+        try:
+            return func(data)
+        finally:
+            # Invalidate even on failure: the write may have partly applied
+            accounts = _accounts(data)
+            if accounts:
+                CACHE.invalidate(accounts)
+    return call
+
+
+def register_tool(name, read_only=False, ttl=None):
+    """
+    read_only tools are memoized per normalized args for `ttl` seconds
+    (TOOL_CACHE_TTL_SECONDS by default). Other tools are treated as writes
+    and invalidate cached reads for every account in their arguments.
+    """
     def wrapper(func):
-        TOOLS[name] = func
+        if read_only:
+            ttl_seconds = DEFAULT_TTL if ttl is None else ttl
+            TOOLS[name] = _memoized(name, func, ttl_seconds)
+        else:
+            ttl_seconds = None
+            TOOLS[name] = _invalidating(name, func)
+        TOOL_SPECS[name] = {"read_only": read_only, "ttl": ttl_seconds}
         return func
     return wrapper
 
+
 def get_tool(name):
     return TOOLS.get(name)
+
+
+def tool_stats():
+    stats = {}
+    for name, spec in TOOL_SPECS.items():
+        counts = dict(CACHE.stats.get(name, {"calls": 0, "hits": 0, "misses": 0, "invalidations": 0}))
+        counts["hit_rate"] = counts["hits"] / counts["calls"] if counts["calls"] else 0.0
+        stats[name] = {**spec, **counts, "entries": CACHE.entries(name)}
+    return stats